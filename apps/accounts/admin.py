@@ -103,7 +103,7 @@ class TenantProfileAdmin(admin.ModelAdmin):
             'fields': ('tenant_id', 'company_name', 'unit_number', 'floor_number', 'building_name')
         }),
         (_('معلومات العقد'), {
-            'fields': ('contract_number', 'contract_start_date', 'contract_end_date')
+            'fields': ('contract_number', 'contract_start_date', 'contract_end_date', 'monthly_rent')
         }),
         (_('معلومات الاتصال للطوارئ'), {
             'fields': ('emergency_contact_name', 'emergency_contact_phone')
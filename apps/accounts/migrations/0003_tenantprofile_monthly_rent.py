@@ -0,0 +1,20 @@
+# Generated by Django 5.0.14 on 2026-10-18 17:59
+
+import django.core.validators
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_departmentpermission'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tenantprofile',
+            name='monthly_rent',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0.00'), help_text='USD', max_digits=10, validators=[django.core.validators.MinValueValidator(Decimal('0.00'))], verbose_name='الإيجار الشهري'),
+        ),
+    ]
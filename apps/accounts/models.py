@@ -1,7 +1,8 @@
 from django.db import models
 from django.contrib.auth.models import AbstractUser
 from django.utils.translation import gettext_lazy as _
-from django.core.validators import RegexValidator
+from django.core.validators import MinValueValidator, RegexValidator
+from decimal import Decimal
 
 
 class Department(models.Model):
@@ -240,6 +241,16 @@ class TenantProfile(models.Model):
         verbose_name=_('تاريخ نهاية العقد')
     )
 
+    # الإيجار الشهري - Monthly rent billed by finance.billing (0 = not billed)
+    monthly_rent = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        default=Decimal('0.00'),
+        validators=[MinValueValidator(Decimal('0.00'))],
+        verbose_name=_('الإيجار الشهري'),
+        help_text='USD'
+    )
+
     # معلومات الاتصال - Contact Information
     emergency_contact_name = models.CharField(
         max_length=100,
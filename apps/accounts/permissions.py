@@ -0,0 +1,86 @@
+"""
+Module Permissions - صلاحيات المديولات
+Cached per-user map of DepartmentPermission rows
+"""
+from django.db import transaction
+
+from apps.core.cache import bump_version, versioned_get
+
+# صلاحيات المدير العام - Superuser has access to everything
+SUPERUSER_PERMISSIONS = {
+    'permits': ['view', 'add', 'change', 'delete', 'export', 'approve'],
+    'maintenance': ['view', 'add', 'change', 'delete', 'export'],
+    'complaints': ['view', 'add', 'change', 'delete', 'export'],
+    'marketing': ['view', 'add', 'change', 'delete', 'export'],
+    'hr': ['view', 'add', 'change', 'delete', 'export'],
+    'finance': ['view', 'add', 'change', 'delete', 'export'],
+}
+
+
+def _namespace(user_id):
+    return f'module_perms:{user_id}'
+
+
+def get_module_permissions(user):
+    """
+    خريطة صلاحيات المستخدم - Module -> permissions map for a user
+
+    Cached per user and invalidated by DepartmentPermission save/delete, so
+    only the first request after a change touches the database.
+
+    Returns:
+        dict: {'permits': ['view', 'add'], ...}
+    """
+    if not user.is_authenticated:
+        return {}
+
+    if user.is_superuser:
+        return SUPERUSER_PERMISSIONS
+
+    def loader():
+        from .models import DepartmentPermission
+        rows = DepartmentPermission.objects.filter(
+            user_id=user.pk,
+            is_active=True
+        ).values_list('module', 'permissions')
+        return {module: list(permissions) for module, permissions in rows}
+
+    return versioned_get(_namespace(user.pk), 'map', loader)
+
+
+def invalidate_module_permissions(user_id):
+    """إبطال كاش صلاحيات مستخدم - Drop a user's cached permission map once the write commits"""
+    transaction.on_commit(lambda: bump_version(_namespace(user_id)))
+
+
+class ModulePermissions:
+    """
+    صلاحيات المستخدم الحالي - request.module_perms
+    Loaded on first access, then reused for the rest of the request.
+
+    Example:
+        >>> request.module_perms.has('finance', 'export')
+        True
+    """
+    def __init__(self, user):
+        self.user = user
+        self._map = None
+
+    @property
+    def map(self):
+        if self._map is None:
+            self._map = get_module_permissions(self.user)
+        return self._map
+
+    @property
+    def modules(self):
+        return list(self.map)
+
+    def has(self, module, permission_type='view'):
+        return permission_type in self.map.get(module, ())
+
+    def __contains__(self, module):
+        return module in self.map
+
+    def __iter__(self):
+        return iter(self.map)
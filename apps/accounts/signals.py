@@ -0,0 +1,16 @@
+"""
+Signals for Accounts App
+إشارات تطبيق الحسابات
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import DepartmentPermission
+from .permissions import invalidate_module_permissions
+
+
+@receiver(post_save, sender=DepartmentPermission, dispatch_uid='module_perms_save')
+@receiver(post_delete, sender=DepartmentPermission, dispatch_uid='module_perms_delete')
+def invalidate_permissions_cache(sender, instance, **kwargs):
+    """إبطال كاش الصلاحيات عند التعديل - Invalidate the user's cached permission map"""
+    invalidate_module_permissions(instance.user_id)
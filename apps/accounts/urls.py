@@ -32,5 +32,6 @@ urlpatterns = [
     path('invoices/', views.tenant_invoices, name='tenant_invoices'),
     path('invoices/<int:pk>/', views.tenant_invoice_detail, name='tenant_invoice_detail'),
     path('invoices/<int:pk>/print/', views.tenant_invoice_print, name='tenant_invoice_print'),
+    path('statement/', views.tenant_statement, name='tenant_statement'),
 ]
 
@@ -7,18 +7,20 @@ from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.utils.translation import gettext as _
 from django.db.models import Count, Q
-from datetime import datetime, timedelta
+from datetime import datetime
 
 from .models import TenantProfile
-from apps.permits.models import Permit, ApprovalWorkflow, PendingApproval
+from apps.permits.models import Permit
+from apps.permits.routing import route_permit
 from apps.permits.forms import PermitForm
 from apps.maintenance.models import Ticket
 from apps.maintenance.forms import TicketForm
 from apps.complaints.models import Case
 from apps.complaints.forms import CaseForm
+from apps.finance.ledger import closing_balance, ledger_page
 from apps.finance.models import Invoice
-from datetime import timedelta
-from django.utils import timezone
+from apps.core.pagination import paginate
+from apps.core.stats import aggregate_stats
 
 
 @login_required
@@ -39,24 +41,25 @@ def tenant_dashboard(request):
     cases = Case.objects.filter(created_by=request.user).order_by('-created_at')[:5]
     invoices = Invoice.objects.filter(tenant=request.user).order_by('-created_at')[:5]
 
-    # Statistics
+    # Statistics (one aggregate query per model)
     stats = {
-        'total_permits': Permit.objects.filter(tenant=request.user).count(),
-        'pending_permits': Permit.objects.filter(tenant=request.user, status='pending').count(),
-        'approved_permits': Permit.objects.filter(tenant=request.user, status='approved').count(),
-        'total_tickets': Ticket.objects.filter(created_by=request.user).count(),
-        'open_tickets': Ticket.objects.filter(created_by=request.user, status='open').count(),
-        'total_invoices': Invoice.objects.filter(tenant=request.user).count(),
-        'paid_invoices': Invoice.objects.filter(
-            tenant=request.user,
-            status='paid'
-        ).count(),
-        'unpaid_invoices': Invoice.objects.filter(
-            tenant=request.user
-        ).exclude(
-            status__in=['paid', 'cancelled']
-        ).count(),
-        'total_cases': Case.objects.filter(created_by=request.user).count(),
+        **aggregate_stats(Permit.objects.filter(tenant=request.user), counts={
+            'total_permits': None,
+            'pending_permits': Q(status='pending'),
+            'approved_permits': Q(status='approved'),
+        }),
+        **aggregate_stats(Ticket.objects.filter(created_by=request.user), counts={
+            'total_tickets': None,
+            'open_tickets': Q(status='open'),
+        }),
+        **aggregate_stats(Invoice.objects.filter(tenant=request.user), counts={
+            'total_invoices': None,
+            'paid_invoices': Q(status='paid'),
+            'unpaid_invoices': ~Q(status__in=['paid', 'cancelled']),
+        }),
+        **aggregate_stats(Case.objects.filter(created_by=request.user), counts={
+            'total_cases': None,
+        }),
     }
 
     context = {
@@ -112,9 +115,12 @@ def tenant_permits(request):
     if permit_type:
         permits = permits.filter(permit_type=permit_type)
 
+    page_obj = paginate(request, permits)
+
     context = {
         'tenant_profile': tenant_profile,
-        'permits': permits,
+        'permits': page_obj,
+        'page_obj': page_obj,
     }
 
     return render(request, 'tenants/tenant_permits.html', context)
@@ -139,22 +145,51 @@ def tenant_invoices(request):
     if status:
         invoices = invoices.filter(status=status)
 
-    # Calculate totals
-    total_amount = sum(inv.total_amount for inv in invoices)
-    paid_amount = sum(inv.paid_amount for inv in invoices)
-    balance_due = total_amount - paid_amount
+    # Calculate totals (single aggregate query over all filtered invoices, not just this page)
+    totals = aggregate_stats(invoices, counts={'invoice_count': None}, sums={
+        'total_amount': ('total_amount', None),
+        'paid_amount': ('paid_amount', None),
+    })
+
+    page_obj = paginate(request, invoices)
 
     context = {
         'tenant_profile': tenant_profile,
-        'invoices': invoices,
-        'total_amount': total_amount,
-        'paid_amount': paid_amount,
-        'balance_due': balance_due,
+        'invoices': page_obj,
+        'page_obj': page_obj,
+        'invoice_count': totals['invoice_count'],
+        'total_amount': totals['total_amount'],
+        'paid_amount': totals['paid_amount'],
+        'balance_due': totals['total_amount'] - totals['paid_amount'],
     }
 
     return render(request, 'tenants/tenant_invoices.html', context)
 
 
+@login_required
+def tenant_statement(request):
+    """
+    كشف حساب المستأجر - Tenant Statement
+    (invoices and payments with a running balance)
+    """
+    try:
+        tenant_profile = request.user.tenant_profile
+    except:
+        messages.error(request, _('ليس لديك صلاحية الوصول لهذه الصفحة'))
+        return redirect('core:dashboard')
+
+    page_obj = ledger_page(request.user.pk, after=request.GET.get('after'), before=request.GET.get('before'))
+
+    context = {
+        'tenant_profile': tenant_profile,
+        'entries': page_obj,
+        'page_obj': page_obj,
+        'closing_balance': closing_balance(request.user.pk),
+    }
+
+    return render(request, 'tenants/tenant_statement.html', context)
+
+
 @login_required
 def tenant_invoice_detail(request, pk):
     """
@@ -232,30 +267,8 @@ def tenant_permit_create(request):
                 permit.requested_date = date.today()
             permit.save()
 
-            # Create PendingApproval automatically
-            # Find the appropriate workflow for this permit type
-            workflow = ApprovalWorkflow.objects.filter(
-                permit_type=permit.permit_type,
-                is_active=True
-            ).first()
-
-            if not workflow:
-                # If no specific workflow, get a default one
-                workflow = ApprovalWorkflow.objects.filter(
-                    permit_type__isnull=True,
-                    is_active=True
-                ).first()
-
-            if workflow:
-                # Create pending approval
-                deadline = timezone.now() + timedelta(hours=workflow.deadline_hours)
-                PendingApproval.objects.create(
-                    permit=permit,
-                    workflow=workflow,
-                    assigned_to=workflow.approver,
-                    deadline=deadline,
-                    completed=False
-                )
+            # Create PendingApproval automatically (cached routing table, one active-approver check)
+            if route_permit(permit):
                 messages.success(request, _('تم إنشاء التصريح بنجاح وإرساله للموافقة'))
             else:
                 # No workflow found - notify admin
@@ -353,9 +366,12 @@ def tenant_tickets(request):
     if priority:
         tickets = tickets.filter(priority=priority)
 
+    page_obj = paginate(request, tickets)
+
     context = {
         'tenant_profile': tenant_profile,
-        'tickets': tickets,
+        'tickets': page_obj,
+        'page_obj': page_obj,
     }
 
     return render(request, 'tenants/tenant_tickets.html', context)
@@ -439,9 +455,12 @@ def tenant_cases(request):
     if priority:
         cases = cases.filter(priority=priority)
 
+    page_obj = paginate(request, cases)
+
     context = {
         'tenant_profile': tenant_profile,
-        'cases': cases,
+        'cases': page_obj,
+        'page_obj': page_obj,
     }
 
     return render(request, 'tenants/tenant_cases.html', context)
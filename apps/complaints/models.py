@@ -57,6 +57,11 @@ class Case(models.Model):
         verbose_name_plural = _('الحالات')
         db_table = 'complaints_case'
         ordering = ['-created_at']
+        indexes = [
+            # التقسيم بالمؤشر - keyset pagination of the staff and tenant lists
+            models.Index(fields=['created_at', 'id'], name='case_created_id_idx'),
+            models.Index(fields=['created_by', 'created_at', 'id'], name='case_creator_created_idx'),
+        ]
 
     def __str__(self):
         return f"{self.case_number} - {self.title}"
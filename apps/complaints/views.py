@@ -5,15 +5,16 @@ Views for Complaints App
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.core.paginator import Paginator
 from django.db.models import Q, Count
-from django.http import HttpResponse
 from django.utils.translation import gettext as _
 
 from .models import Case, CaseAttachment, CaseComment
 from .forms import CaseForm, CaseAttachmentForm, CaseCommentForm
-from .resources import CaseResource
 from apps.core.decorators import staff_required
+from apps.core.exports import export_or_enqueue
+from apps.core.pagination import paginate
+from apps.core.search import filter_queryset
+from apps.core.stats import aggregate_stats
 
 
 @login_required
@@ -26,10 +27,12 @@ def case_list(request):
         'created_by', 'assigned_to'
     ).order_by('-created_at')
 
-    # Statistics
-    in_review_count = cases.filter(status='in_review').count()
-    resolved_count = cases.filter(status='resolved').count()
-    total_count = cases.count()
+    # Statistics (single aggregate query)
+    stats = aggregate_stats(cases, counts={
+        'in_review_count': Q(status='in_review'),
+        'resolved_count': Q(status='resolved'),
+        'total_count': None,
+    }, cache_key='complaints:case_list:stats')
 
     # Filters
     case_type = request.GET.get('case_type')
@@ -44,24 +47,15 @@ def case_list(request):
     if status:
         cases = cases.filter(status=status)
     if search:
-        cases = cases.filter(
-            Q(case_number__icontains=search) |
-            Q(title__icontains=search) |
-            Q(description__icontains=search)
-        )
+        cases = filter_queryset(cases, 'case', search)
 
-    # Pagination
-    paginator = Paginator(cases, 20)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    # Pagination (keyset - no COUNT/OFFSET)
+    page_obj = paginate(request, cases)
 
     context = {
         'cases': page_obj,
         'page_obj': page_obj,
-        'is_paginated': page_obj.has_other_pages(),
-        'in_review_count': in_review_count,
-        'resolved_count': resolved_count,
-        'total_count': total_count,
+        **stats,
     }
 
     return render(request, 'complaints/case_list.html', context)
@@ -176,25 +170,21 @@ def case_delete(request, pk):
     return render(request, 'complaints/case_confirm_delete.html', context)
 
 
-@login_required
-@staff_required
-def case_export(request):
+def case_export_queryset(params):
     """
-    تصدير الشكاوى إلى Excel - Export Cases to Excel
+    سجلات التصدير بعد تطبيق الفلاتر - Filtered queryset for case_export
+    (also rebuilt from ExportJob.params by the background worker)
     """
-    queryset = Case.objects.select_related('created_by', 'assigned_to').all()
+    queryset = Case.objects.order_by('-created_at')
 
     # Apply filters
-    search = request.GET.get('search', '')
-    status = request.GET.get('status', '')
-    case_type = request.GET.get('case_type', '')
-    priority = request.GET.get('priority', '')
+    search = params.get('search', '')
+    status = params.get('status', '')
+    case_type = params.get('case_type', '')
+    priority = params.get('priority', '')
 
     if search:
-        queryset = queryset.filter(
-            Q(case_number__icontains=search) |
-            Q(title__icontains=search)
-        )
+        queryset = filter_queryset(queryset, 'case', search)
 
     if status:
         queryset = queryset.filter(status=status)
@@ -205,11 +195,13 @@ def case_export(request):
     if priority:
         queryset = queryset.filter(priority=priority)
 
-    # Export to Excel
-    resource = CaseResource()
-    dataset = resource.export(queryset)
+    return queryset
 
-    response = HttpResponse(dataset.xlsx, content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
-    response['Content-Disposition'] = 'attachment; filename="cases_export.xlsx"'
 
-    return response
+@login_required
+@staff_required
+def case_export(request):
+    """
+    تصدير الشكاوى إلى Excel - Export Cases to Excel
+    """
+    return export_or_enqueue(request, 'cases')
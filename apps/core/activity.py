@@ -0,0 +1,138 @@
+"""
+Activity Feed - سجل النشاطات
+Writes ActivityEvent rows on create/status change and reads them back by keyset
+"""
+import threading
+from collections import namedtuple
+
+from django.apps import apps
+from django.urls import NoReverseMatch, reverse
+
+from .models import ActivityEvent
+from .pagination import KeysetPaginator
+
+_local = threading.local()
+
+# model: النموذج / object_type: نوع السجل / number_field: حقل الرقم /
+# actor_field: المستخدم المنشئ / url_name: صفحة التفاصيل
+ActivitySource = namedtuple('ActivitySource', ['model', 'object_type', 'number_field', 'actor_field', 'url_name'])
+
+SOURCES = [
+    ActivitySource('permits.Permit', 'permit', 'permit_number', 'created_by', 'permits:permit_detail'),
+    ActivitySource('maintenance.Ticket', 'ticket', 'ticket_number', 'created_by', 'maintenance:ticket_detail'),
+    ActivitySource('complaints.Case', 'case', 'case_number', 'created_by', 'complaints:case_detail'),
+    ActivitySource('finance.Invoice', 'invoice', 'invoice_number', 'created_by', 'finance:invoice_detail'),
+    ActivitySource('finance.Payment', 'payment', 'payment_number', 'created_by', None),
+    ActivitySource('hr.LeaveRequest', 'leave', 'request_number', 'employee', 'hr:leave_request_detail'),
+]
+
+SOURCES_BY_MODEL = {source.model: source for source in SOURCES}
+SOURCES_BY_TYPE = {source.object_type: source for source in SOURCES}
+
+
+def set_current_request(request):
+    """ربط الطلب الحالي لتحديد المستخدم - Bind the request used to resolve the actor"""
+    _local.request = request
+
+
+def get_current_actor():
+    """المستخدم الحالي إن وجد - Authenticated user of the current request, if any"""
+    request = getattr(_local, 'request', None)
+    user = getattr(request, 'user', None)
+    return user if user is not None and user.is_authenticated else None
+
+
+def record(instance, verb, previous_status=''):
+    """
+    تسجيل نشاط - Append an ActivityEvent for a tracked instance
+    """
+    source = SOURCES_BY_MODEL[instance._meta.label]
+    actor = get_current_actor()
+    if actor is None:
+        actor_id = getattr(instance, f'{source.actor_field}_id', None)
+    else:
+        actor_id = actor.pk
+
+    return ActivityEvent.objects.create(
+        actor_id=actor_id,
+        verb=verb,
+        object_type=source.object_type,
+        object_id=instance.pk,
+        title=getattr(instance, source.number_field) or '',
+        status=getattr(instance, 'status', '') or '',
+        previous_status=previous_status or '',
+    )
+
+
+def record_status_changes(changes, actor_id=None):
+    """
+    تسجيل تغييرات الحالة دفعة واحدة - One INSERT for rows changed with QuerySet.update()
+    (set-based updates bypass the post_save signal that normally records them)
+
+    Args:
+        changes: [(instance بالحالة الجديدة, الحالة السابقة), ...]
+    """
+    events = []
+    for instance, previous_status in changes:
+        source = SOURCES_BY_MODEL[instance._meta.label]
+        events.append(ActivityEvent(
+            actor_id=actor_id or getattr(instance, f'{source.actor_field}_id', None),
+            verb='status_changed',
+            object_type=source.object_type,
+            object_id=instance.pk,
+            title=getattr(instance, source.number_field) or '',
+            status=instance.status or '',
+            previous_status=previous_status or '',
+        ))
+    return ActivityEvent.objects.bulk_create(events)
+
+
+def record_created(instances, actor_id=None):
+    """
+    تسجيل إنشاء سجلات مجمعة - One INSERT of "created" events for bulk_create()d rows
+    """
+    events = []
+    for instance in instances:
+        source = SOURCES_BY_MODEL[instance._meta.label]
+        events.append(ActivityEvent(
+            actor_id=actor_id or getattr(instance, f'{source.actor_field}_id', None),
+            verb='created',
+            object_type=source.object_type,
+            object_id=instance.pk,
+            title=getattr(instance, source.number_field) or '',
+            status=getattr(instance, 'status', '') or '',
+        ))
+    return ActivityEvent.objects.bulk_create(events)
+
+
+def status_display(object_type, status):
+    """اسم الحالة - Status label from the source model's STATUS_CHOICES"""
+    source = SOURCES_BY_TYPE.get(object_type)
+    if source is None or not status:
+        return status
+    choices = getattr(apps.get_model(source.model), 'STATUS_CHOICES', ())
+    return dict(choices).get(status, status)
+
+
+def object_url(event):
+    """رابط السجل المصدر - URL of the source record"""
+    source = SOURCES_BY_TYPE.get(event.object_type)
+    try:
+        if source and source.url_name:
+            return reverse(source.url_name, kwargs={'pk': event.object_id})
+        if event.object_type == 'payment':
+            return f"{reverse('finance:payment_list')}?search={event.title}"
+    except NoReverseMatch:
+        pass
+    return '#'
+
+
+def activity_page(actor=None, after=None, before=None, per_page=25):
+    """
+    صفحة من سجل النشاطات - One keyset page of the activity stream
+    Served by the (created_at, id) or (actor, created_at, id) index.
+    """
+    queryset = ActivityEvent.objects.select_related('actor')
+    if actor is not None:
+        queryset = queryset.filter(actor=actor)
+    return KeysetPaginator(queryset, per_page).get_page(after=after, before=before)
@@ -1,7 +1,7 @@
 from django.contrib import admin
 from django.utils.html import format_html
 from django.utils.translation import gettext_lazy as _
-from .models import SystemSettings
+from .models import SystemSettings, NumberSequence, ExportJob
 
 
 @admin.register(SystemSettings)
@@ -93,3 +93,26 @@ class SystemSettingsAdmin(admin.ModelAdmin):
             'all': ('admin/css/custom_admin.css',)
         }
         js = ('admin/js/custom_admin.js',)
+
+
+@admin.register(NumberSequence)
+class NumberSequenceAdmin(admin.ModelAdmin):
+    """
+    تسلسلات الترقيم
+    Document Number Sequences
+    """
+    list_display = ('prefix', 'last_value', 'updated_at')
+    search_fields = ('prefix',)
+    readonly_fields = ('updated_at',)
+
+
+@admin.register(ExportJob)
+class ExportJobAdmin(admin.ModelAdmin):
+    """
+    مهام التصدير
+    Export Jobs
+    """
+    list_display = ('id', 'user', 'export_type', 'file_format', 'status', 'processed_rows', 'total_rows', 'created_at')
+    list_filter = ('status', 'export_type', 'file_format')
+    search_fields = ('user__username',)
+    readonly_fields = ('created_at', 'started_at', 'finished_at')
@@ -0,0 +1,54 @@
+"""
+Background Jobs - المهام الخلفية
+Dispatch Celery tasks, or run them in an in-process thread pool when Celery is disabled
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.BACKGROUND_THREAD_WORKERS,
+                    thread_name_prefix='crm-background',
+                )
+    return _executor
+
+
+def _run_in_thread(task, args):
+    close_old_connections()
+    try:
+        task(*args)
+    except Exception:
+        logger.exception('Background task %s failed', getattr(task, 'name', task))
+    finally:
+        close_old_connections()
+
+
+def enqueue(task, *args):
+    """
+    جدولة مهمة بعد حفظ المعاملة - Run a shared_task after the current transaction commits
+
+    Args:
+        task: دالة معرفة بـ @shared_task
+        *args: معاملات قابلة للتحويل إلى JSON (مثل معرف السجل)
+
+    Example:
+        >>> enqueue(run_export_job_task, job.pk)
+    """
+    if settings.CELERY_ENABLED:
+        transaction.on_commit(lambda: task.delay(*args))
+    else:
+        transaction.on_commit(lambda: _get_executor().submit(_run_in_thread, task, args))
@@ -0,0 +1,116 @@
+"""
+Core Caching - طبقة التخزين المؤقت
+Shared-cache helpers with per-request memoization and version-key invalidation
+"""
+import threading
+
+from django.core.cache import cache
+from django.db import transaction
+
+# مدة التخزين في الكاش المشترك - Shared cache timeout (seconds)
+DEFAULT_TIMEOUT = 60 * 60 * 24
+
+_local = threading.local()
+
+
+def get_request_memo():
+    """
+    ذاكرة الطلب الحالي - Memo dict for the current request
+    Returns None outside a request (e.g. management commands) so that
+    long-running processes always go through the versioned shared cache.
+    """
+    return getattr(_local, 'memo', None)
+
+
+def start_request_memo():
+    """بدء ذاكرة طلب جديدة - Start a fresh per-request memo"""
+    _local.memo = {}
+
+
+def clear_request_memo():
+    """مسح ذاكرة الطلب - Drop the per-request memo"""
+    _local.memo = None
+
+
+def _version_key(namespace):
+    return f'{namespace}:version'
+
+
+def get_version(namespace):
+    """
+    الإصدار الحالي لمساحة الكاش - Current version of a cache namespace
+    """
+    key = _version_key(namespace)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, 1, None)
+        version = cache.get(key) or 1
+    return version
+
+
+def bump_version(namespace):
+    """
+    زيادة الإصدار لإبطال الكاش - Bump namespace version (invalidates all entries)
+    """
+    key = _version_key(namespace)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 2, None)
+
+    memo = get_request_memo()
+    if memo is not None:
+        for memo_key in [k for k in memo if k[0] == namespace]:
+            del memo[memo_key]
+
+
+def versioned_get(namespace, name, loader, timeout=DEFAULT_TIMEOUT):
+    """
+    قراءة قيمة مع التخزين المؤقت - Read a value through memo -> shared cache -> loader
+
+    Args:
+        namespace: مساحة الكاش (تبطل بالكامل عند bump_version)
+        name: اسم العنصر داخل المساحة
+        loader: دالة بدون معاملات لتحميل القيمة من قاعدة البيانات
+        timeout: مدة التخزين في الكاش المشترك
+
+    Returns:
+        القيمة المخزنة أو المحملة
+    """
+    memo = get_request_memo()
+    memo_key = (namespace, name)
+    if memo is not None and memo_key in memo:
+        return memo[memo_key]
+
+    key = f'{namespace}:{get_version(namespace)}:{name}'
+    value = cache.get(key)
+    if value is None:
+        value = loader()
+        cache.set(key, value, timeout)
+
+    if memo is not None:
+        memo[memo_key] = value
+    return value
+
+
+def load_singleton(model_class, timeout=DEFAULT_TIMEOUT):
+    """
+    تحميل نموذج Singleton من الكاش - Load a pk=1 singleton model through the cache
+
+    Example:
+        >>> load_singleton(SystemSettings)
+        <SystemSettings: إعدادات النظام - System Settings>
+    """
+    def loader():
+        obj, created = model_class.objects.get_or_create(pk=1)
+        return obj
+
+    return versioned_get(model_class._meta.label_lower, 'singleton', loader, timeout)
+
+
+def invalidate_singleton(model_class):
+    """
+    إبطال كاش نموذج Singleton - Invalidate a singleton model's cache once the
+    save commits, so a concurrent request cannot cache the old row under the new version
+    """
+    transaction.on_commit(lambda: bump_version(model_class._meta.label_lower))
@@ -3,7 +3,8 @@ Context Processors for Core App
 معالجات السياق لتطبيق Core
 """
 from django.contrib.auth import get_user_model
-from .models import SystemSettings, Notification
+from .models import SystemSettings
+from .notifications import get_recent, get_unread_count
 
 User = get_user_model()
 
@@ -28,14 +29,9 @@ def notifications(request):
     Add notifications to all templates
     """
     if request.user.is_authenticated:
-        unread_count = Notification.get_unread_count(request.user)
-        recent_notifications = Notification.objects.filter(
-            user=request.user
-        ).order_by('-created_at')[:5]
-
         return {
-            'unread_notifications_count': unread_count,
-            'recent_notifications': recent_notifications,
+            'unread_notifications_count': get_unread_count(request.user),
+            'recent_notifications': get_recent(request.user),
         }
 
     return {
@@ -0,0 +1,132 @@
+"""
+Dashboard Counters - عدادات لوحة التحكم
+O(1) dashboard statistics, updated incrementally on save/delete
+"""
+from collections import namedtuple
+
+from django.apps import apps
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .cache import bump_version, versioned_get
+from .models import DashboardCounter
+from .stats import aggregate_stats
+
+CACHE_NAMESPACE = 'core.dashboard_counters'
+
+# يُعاد التحميل من الجدول بعد انتهاء المدة - cached mirror self-reconciles after this
+CACHE_TIMEOUT = 60 * 60
+
+# key: اسم العداد / model: النموذج / condition: شرط SQL لإعادة البناء /
+# matches: نفس الشرط في Python للتحديث التزايدي / fields: الحقول المستخدمة
+CounterSpec = namedtuple('CounterSpec', ['key', 'model', 'condition', 'matches', 'fields'])
+
+COUNTERS = [
+    CounterSpec('permits_count', 'permits.Permit', None,
+                lambda obj: True, ()),
+    CounterSpec('permits_pending', 'permits.Permit', Q(status='pending'),
+                lambda obj: obj.status == 'pending', ('status',)),
+    CounterSpec('tickets_count', 'maintenance.Ticket', None,
+                lambda obj: True, ()),
+    CounterSpec('tickets_urgent', 'maintenance.Ticket', Q(priority='urgent', status__in=['open', 'in_progress']),
+                lambda obj: obj.priority == 'urgent' and obj.status in ('open', 'in_progress'),
+                ('priority', 'status')),
+    CounterSpec('cases_count', 'complaints.Case', None,
+                lambda obj: True, ()),
+    CounterSpec('cases_review', 'complaints.Case', Q(status='in_review'),
+                lambda obj: obj.status == 'in_review', ('status',)),
+    CounterSpec('events_count', 'marketing.Event', None,
+                lambda obj: True, ()),
+    CounterSpec('events_active', 'marketing.Event', Q(status='active'),
+                lambda obj: obj.status == 'active', ('status',)),
+]
+
+COUNTED_MODELS = {spec.model for spec in COUNTERS}
+
+
+def counters_for(model_label):
+    """العدادات الخاصة بنموذج - Counter specs for a model label"""
+    return [spec for spec in COUNTERS if spec.model == model_label]
+
+
+def matching_keys(model_label, obj):
+    """العدادات التي ينتمي إليها السجل - Counter keys an instance belongs to"""
+    return frozenset(spec.key for spec in counters_for(model_label) if spec.matches(obj))
+
+
+def apply_deltas(deltas):
+    """
+    تطبيق التغييرات على العدادات - Apply {key: delta} with F() updates
+    Runs inside the caller's transaction; the cache version is bumped on commit.
+    """
+    deltas = {key: delta for key, delta in deltas.items() if delta}
+    if not deltas:
+        return
+
+    now = timezone.now()
+    for key, delta in deltas.items():
+        updated = DashboardCounter.objects.filter(key=key).update(
+            value=F('value') + delta,
+            updated_at=now
+        )
+        if not updated:
+            # First use of this counter - materialize it from the table
+            rebuild(keys=[key])
+
+    transaction.on_commit(invalidate_counters)
+
+
+def get_dashboard_counters():
+    """
+    قراءة العدادات - Read all counters (versioned cache, then one small query)
+
+    A read that races a write caches the old values under the old version,
+    which the write's bump_version() makes unreachable once it commits.
+
+    Returns:
+        dict: {key: value} for every counter in COUNTERS
+    """
+    return versioned_get(CACHE_NAMESPACE, 'values', _load_counters, CACHE_TIMEOUT)
+
+
+def _load_counters():
+    stored = dict(DashboardCounter.objects.values_list('key', 'value'))
+    missing = [spec.key for spec in COUNTERS if spec.key not in stored]
+    if missing:
+        stored.update(rebuild(keys=missing))
+    return stored
+
+
+def invalidate_counters():
+    """إبطال العدادات المخزنة - Bump the cache version (call after commit)"""
+    bump_version(CACHE_NAMESPACE)
+
+
+def rebuild(keys=None):
+    """
+    إعادة بناء العدادات من الجداول - Recompute counters from scratch
+    One aggregate query per model.
+
+    Args:
+        keys: قائمة العدادات المطلوبة (None = الكل)
+
+    Returns:
+        dict: القيم الجديدة
+    """
+    specs = [spec for spec in COUNTERS if keys is None or spec.key in keys]
+    values = {}
+
+    for model_label in dict.fromkeys(spec.model for spec in specs):
+        model_specs = [spec for spec in specs if spec.model == model_label]
+        values.update(aggregate_stats(
+            apps.get_model(model_label).objects.all(),
+            counts={spec.key: spec.condition for spec in model_specs},
+        ))
+
+    with transaction.atomic():
+        for key, value in values.items():
+            DashboardCounter.objects.update_or_create(key=key, defaults={'value': value})
+
+    transaction.on_commit(invalidate_counters)
+    return values
@@ -45,3 +45,34 @@ def tenant_or_staff_required(view_func):
     
     return wrapper
 
+
+
+def module_permission_required(module, permission_type='view'):
+    """
+    Decorator to require a department module permission
+    يتحقق من صلاحية المستخدم على المديول باستخدام request.module_perms (بدون استعلامات بعد أول طلب)
+
+    Usage:
+        @module_permission_required('finance', 'export')
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            # Check if user is authenticated
+            if not request.user.is_authenticated:
+                return redirect('account_login')
+
+            module_perms = getattr(request, 'module_perms', None)
+            if module_perms is None:
+                from apps.accounts.permissions import ModulePermissions
+                module_perms = request.module_perms = ModulePermissions(request.user)
+
+            if not module_perms.has(module, permission_type):
+                messages.error(request, _('ليس لديك صلاحية الوصول لهذه الصفحة'))
+                return redirect('core:dashboard')
+
+            return view_func(request, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,292 @@
+"""
+Streaming Exports - التصدير المتدفق
+CSV and xlsx exports in constant memory, driven by the apps' import-export Resources.
+Exports above EXPORT_SYNC_MAX_ROWS run as background ExportJobs.
+"""
+import csv
+import logging
+import tempfile
+from collections import namedtuple
+
+from django.conf import settings
+from django.contrib import messages
+from django.core.files import File
+from django.http import FileResponse, StreamingHttpResponse
+from django.shortcuts import redirect
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from django.utils.translation import gettext as _
+
+logger = logging.getLogger(__name__)
+
+# عدد الصفوف في كل دفعة من قاعدة البيانات - Rows fetched per database round trip
+EXPORT_CHUNK_SIZE = 2000
+
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+# queryset: دالة (params) -> QuerySet / resource: فئة Resource / filename: اسم الملف
+ExportType = namedtuple('ExportType', ['queryset', 'resource', 'filename'])
+
+EXPORT_TYPES = {
+    'permits': ExportType('apps.permits.views.permit_export_queryset',
+                          'apps.permits.resources.PermitResource', 'permits_export'),
+    'tickets': ExportType('apps.maintenance.views.ticket_export_queryset',
+                          'apps.maintenance.resources.TicketResource', 'tickets_export'),
+    'cases': ExportType('apps.complaints.views.case_export_queryset',
+                        'apps.complaints.resources.CaseResource', 'cases_export'),
+    'events': ExportType('apps.marketing.views.event_export_queryset',
+                         'apps.marketing.resources.EventResource', 'events_export'),
+    'leave_requests': ExportType('apps.hr.views.leave_request_export_queryset',
+                                 'apps.hr.resources.LeaveRequestResource', 'leave_requests_export'),
+}
+
+
+def resource_columns(resource_class):
+    """
+    أعمدة التصدير من تعريف Resource - (header, ORM lookup) pairs in export order
+
+    Foreign keys declared with ForeignKeyWidget(User, 'username') become
+    'created_by__username' so the value comes from a JOIN, not a query per row.
+
+    Example:
+        >>> resource_columns(PermitResource)[:2]
+        [('id', 'id'), ('permit_number', 'permit_number')]
+    """
+    columns = []
+    for field in resource_class().get_export_fields():
+        lookup = field.attribute
+        widget_field = getattr(field.widget, 'field', None)
+        if widget_field and widget_field != 'pk':
+            lookup = f'{lookup}__{widget_field}'
+        columns.append((field.column_name, lookup))
+    return columns
+
+
+def iter_rows(queryset, columns, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    صفوف التصدير - Stream tuples via values_list().iterator() (server-side cursor where supported)
+    """
+    lookups = [lookup for header, lookup in columns]
+    return queryset.values_list(*lookups).iterator(chunk_size=chunk_size)
+
+
+def _csv_value(value):
+    if value is None:
+        return ''
+    if hasattr(value, 'tzinfo') and value.tzinfo is not None:
+        return timezone.localtime(value).strftime('%Y-%m-%d %H:%M:%S')
+    return value
+
+
+class _Echo:
+    """كائن يعيد ما يُكتب إليه - File-like object for csv.writer that returns each line"""
+    def write(self, value):
+        return value
+
+
+def csv_lines(queryset, columns, chunk_size=EXPORT_CHUNK_SIZE, progress=None):
+    """
+    أسطر CSV - Yield the header and one CSV line per row
+
+    Args:
+        progress: دالة اختيارية تُستدعى بعدد الصفوف بعد كل دفعة
+    """
+    writer = csv.writer(_Echo())
+
+    # BOM ليعرض Excel النص العربي بشكل صحيح - lets Excel detect UTF-8
+    yield '\ufeff' + writer.writerow([header for header, lookup in columns])
+    for count, row in enumerate(iter_rows(queryset, columns, chunk_size), start=1):
+        yield writer.writerow([_csv_value(value) for value in row])
+        if progress and count % chunk_size == 0:
+            progress(count)
+
+
+def rows_csv_response(rows, filename):
+    """
+    تصدير صفوف محسوبة - Stream already computed rows (e.g. a report) as CSV
+    The first row is the header.
+    """
+    writer = csv.writer(_Echo())
+
+    def lines():
+        for number, row in enumerate(rows):
+            line = writer.writerow([_csv_value(value) for value in row])
+            yield '\ufeff' + line if number == 0 else line
+
+    response = StreamingHttpResponse(lines(), content_type='text/csv; charset=utf-8')
+    response['Content-Disposition'] = f'attachment; filename="{filename}.csv"'
+    return response
+
+
+def write_xlsx(output, queryset, columns, chunk_size=EXPORT_CHUNK_SIZE, progress=None):
+    """
+    كتابة Excel بذاكرة ثابتة - Write rows with xlsxwriter constant_memory
+
+    Returns:
+        int: عدد الصفوف المكتوبة
+    """
+    import xlsxwriter
+
+    workbook = xlsxwriter.Workbook(output, {
+        'constant_memory': True,
+        'remove_timezone': True,
+        'default_date_format': 'yyyy-mm-dd hh:mm',
+    })
+    worksheet = workbook.add_worksheet()
+
+    header_format = workbook.add_format({'bold': True})
+    worksheet.write_row(0, 0, [header for header, lookup in columns], header_format)
+
+    count = 0
+    for count, row in enumerate(iter_rows(queryset, columns, chunk_size), start=1):
+        worksheet.write_row(count, 0, [
+            timezone.localtime(value) if getattr(value, 'tzinfo', None) is not None else value
+            for value in row
+        ])
+        if progress and count % chunk_size == 0:
+            progress(count)
+
+    workbook.close()
+    return count
+
+
+def csv_response(queryset, resource_class, filename, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    تصدير CSV متدفق - StreamingHttpResponse yielding one line per row
+    """
+    columns = resource_columns(resource_class)
+    response = StreamingHttpResponse(
+        csv_lines(queryset, columns, chunk_size),
+        content_type='text/csv; charset=utf-8'
+    )
+    response['Content-Disposition'] = f'attachment; filename="{filename}.csv"'
+    return response
+
+
+def xlsx_response(queryset, resource_class, filename, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    تصدير Excel بذاكرة ثابتة - xlsx written row by row with xlsxwriter constant_memory
+
+    Rows are flushed to a temporary file as they are written; the finished
+    workbook is streamed back from disk and removed when the response closes.
+    """
+    output = tempfile.NamedTemporaryFile(suffix='.xlsx')
+    write_xlsx(output, queryset, resource_columns(resource_class), chunk_size)
+    output.seek(0)
+
+    return FileResponse(
+        output,
+        as_attachment=True,
+        filename=f'{filename}.xlsx',
+        content_type=XLSX_CONTENT_TYPE,
+    )
+
+
+def export_response(queryset, resource_class, filename, file_format='xlsx', chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    الاستجابة المناسبة للصيغة المطلوبة - Streaming export in the requested format
+
+    Args:
+        queryset: السجلات بعد تطبيق الفلاتر
+        resource_class: فئة Resource التي تحدد الأعمدة وترتيبها
+        filename: اسم الملف بدون الامتداد
+        file_format: 'xlsx' (افتراضي) أو 'csv'
+    """
+    if file_format == 'csv':
+        return csv_response(queryset, resource_class, filename, chunk_size)
+    return xlsx_response(queryset, resource_class, filename, chunk_size)
+
+
+def export_or_enqueue(request, export_type):
+    """
+    تصدير مباشر أو كمهمة خلفية - Stream small exports, queue large ones as ExportJobs
+
+    Query params: the list filters, plus ?format=csv and ?background=1 (always queue).
+    """
+    from .background import enqueue
+    from .models import ExportJob
+    from .tasks import run_export_job_task
+
+    spec = EXPORT_TYPES[export_type]
+    params = request.GET.dict()
+    file_format = 'csv' if params.pop('format', 'xlsx') == 'csv' else 'xlsx'
+    background = params.pop('background', '')
+
+    queryset = import_string(spec.queryset)(params)
+    if not background and queryset.count() <= settings.EXPORT_SYNC_MAX_ROWS:
+        return export_response(queryset, import_string(spec.resource), spec.filename, file_format)
+
+    job = ExportJob.objects.create(
+        user=request.user,
+        export_type=export_type,
+        file_format=file_format,
+        params=params,
+    )
+    enqueue(run_export_job_task, job.pk)
+
+    messages.info(request, _('جاري تجهيز ملف التصدير، سيصلك إشعار عند الانتهاء'))
+    return redirect('core:export_job_list')
+
+
+def run_export_job(job_id):
+    """
+    تنفيذ مهمة تصدير - Write an ExportJob's file to EXPORT_FILES_ROOT and notify its owner
+    Progress is saved after every chunk so the status endpoint can report it.
+    """
+    from .models import ExportJob
+    from .notifications import notify
+
+    claimed = ExportJob.objects.filter(pk=job_id, status='pending').update(
+        status='running',
+        started_at=timezone.now()
+    )
+    if not claimed:
+        return
+
+    job = ExportJob.objects.get(pk=job_id)
+    jobs = ExportJob.objects.filter(pk=job_id)
+
+    try:
+        spec = EXPORT_TYPES[job.export_type]
+        queryset = import_string(spec.queryset)(job.params)
+        columns = resource_columns(import_string(spec.resource))
+        jobs.update(total_rows=queryset.count())
+
+        def progress(count):
+            jobs.update(processed_rows=count)
+
+        with tempfile.NamedTemporaryFile(suffix=f'.{job.file_format}') as output:
+            if job.file_format == 'csv':
+                # السطر 0 هو العناوين - line 0 is the header, so the last index is the row count
+                for count, line in enumerate(csv_lines(queryset, columns, progress=progress)):
+                    output.write(line.encode('utf-8'))
+            else:
+                count = write_xlsx(output, queryset, columns, progress=progress)
+
+            output.seek(0)
+            job.file.save(f'{spec.filename}_{job.pk}.{job.file_format}', File(output), save=False)
+
+        jobs.update(
+            status='completed',
+            file=job.file.name,
+            processed_rows=count,
+            finished_at=timezone.now()
+        )
+        notify(
+            job.user_id,
+            title=_('ملف التصدير جاهز'),
+            message=_('تم تجهيز ملف التصدير (%(count)s صف)') % {'count': count},
+            notification_type='success',
+            link=reverse('core:export_job_download', args=[job.pk])
+        )
+    except Exception as exc:
+        logger.exception('Export job %s failed', job_id)
+        jobs.update(status='failed', error=str(exc), finished_at=timezone.now())
+        notify(
+            job.user_id,
+            title=_('فشل التصدير'),
+            message=_('تعذر تجهيز ملف التصدير'),
+            notification_type='error',
+            link=reverse('core:export_job_list')
+        )
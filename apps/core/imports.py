@@ -0,0 +1,377 @@
+"""
+Bulk Imports - الاستيراد المجمع
+Chunked Excel/CSV import for the apps' import-export Resources:
+foreign keys resolved with one IN query per chunk (cached across chunks),
+rows validated per chunk and written with bulk_create / bulk_update inside
+one transaction per chunk.
+"""
+import csv
+from collections import namedtuple
+
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from django.utils.translation import gettext as _
+from import_export.widgets import ForeignKeyWidget
+
+from .activity import SOURCES_BY_MODEL as ACTIVITY_SOURCES, record_created
+from .search import SOURCES_BY_MODEL, reindex
+from .sequences import reserve_codes
+
+# عدد الصفوف في كل دفعة - Rows validated and written per transaction
+IMPORT_CHUNK_SIZE = 1000
+
+# عدد القيم في كل استعلام IN - Values per IN (...) lookup
+LOOKUP_BATCH_SIZE = 1000
+
+# حقول الترقيم التلقائي (نفس منطق save() في النماذج) - Auto-numbered fields, as in Model.save()
+NUMBERED_FIELDS = {
+    'permits.permit': ('permit_number', 'PRM'),
+    'maintenance.ticket': ('ticket_number', 'TKT'),
+    'complaints.case': ('case_number', 'CSE'),
+    'marketing.event': ('event_number', 'EVT'),
+    'hr.leaverequest': ('request_number', 'LVE'),
+}
+
+# خطوات بعد إنشاء السجلات (مثل save() في النماذج) - Called with the created objects of each chunk
+POST_CREATE_HOOKS = {
+    'permits.permit': 'apps.permits.routing.route_permits',
+}
+
+# row: رقم الصف في الملف (الصف 1 = العناوين) / errors: {العمود: الرسالة}
+RowError = namedtuple('RowError', ['row', 'errors'])
+
+
+class ImportResult:
+    """
+    نتيجة الاستيراد - Import totals and per-row errors
+    """
+    def __init__(self):
+        self.total = 0
+        self.created = 0
+        self.updated = 0
+        self.errors = []
+
+    @property
+    def has_errors(self):
+        return bool(self.errors)
+
+    def __str__(self):
+        return (
+            f'{self.total} rows: {self.created} created, '
+            f'{self.updated} updated, {len(self.errors)} errors'
+        )
+
+
+def read_rows(path):
+    """
+    قراءة صفوف الملف - Yield {header: value} dicts from an .xlsx or .csv file
+    xlsx is read in openpyxl read-only mode so memory does not grow with the file.
+    """
+    if str(path).lower().endswith('.csv'):
+        with open(path, newline='', encoding='utf-8-sig') as handle:
+            yield from csv.DictReader(handle)
+        return
+
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        headers = [str(header) if header is not None else '' for header in next(rows, ())]
+        for values in rows:
+            if any(value not in (None, '') for value in values):
+                yield dict(zip(headers, values))
+    finally:
+        workbook.close()
+
+
+def _chunks(rows, size):
+    chunk = []
+    for row_number, row in enumerate(rows, start=2):
+        chunk.append((row_number, row))
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _key(value):
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+
+class BulkImporter:
+    """
+    مستورد مجمع - Bulk importer driven by an import-export Resource
+
+    Example:
+        >>> result = BulkImporter(LeaveRequestResource).import_file('leaves.xlsx')
+        >>> print(result)
+        100000 rows: 100000 created, 0 updated, 0 errors
+    """
+    def __init__(self, resource_class, chunk_size=IMPORT_CHUNK_SIZE, dry_run=False, actor_id=None):
+        resource = resource_class()
+        self.model = resource._meta.model
+        self.chunk_size = chunk_size
+        self.dry_run = dry_run
+        # منفذ الاستيراد في سجل النشاط (الافتراضي created_by للسجل) - activity actor, else the row's own
+        self.actor_id = actor_id
+
+        model_fields = {field.name: field for field in self.model._meta.concrete_fields}
+        import_fields = [
+            field for field in resource.get_import_fields()
+            if not field.readonly and field.attribute in model_fields
+        ]
+
+        id_names = list(resource._meta.import_id_fields or ['id'])
+        if len(id_names) != 1:
+            raise ValueError('BulkImporter supports a single import_id_field')
+        self.id_field = next(
+            (field for field in import_fields if field.column_name == id_names[0] or field.attribute == id_names[0]),
+            None
+        )
+
+        pk_name = self.model._meta.pk.name
+        self.fk_fields = [field for field in import_fields if isinstance(field.widget, ForeignKeyWidget)]
+        self.value_fields = [
+            field for field in import_fields
+            if field not in self.fk_fields
+            and not getattr(model_fields[field.attribute], 'auto_now', False)
+            and not getattr(model_fields[field.attribute], 'auto_now_add', False)
+            and (field.attribute != pk_name or field is self.id_field)
+        ]
+        self.auto_now_fields = [
+            name for name, field in model_fields.items() if getattr(field, 'auto_now', False)
+        ]
+        self.update_fields = (
+            [field.attribute for field in self.value_fields if field.attribute != pk_name]
+            + [model_fields[field.attribute].attname for field in self.fk_fields]
+            + self.auto_now_fields
+        )
+        self.numbered = NUMBERED_FIELDS.get(self.model._meta.label_lower)
+        hook = POST_CREATE_HOOKS.get(self.model._meta.label_lower)
+        self.post_create = import_string(hook) if hook else None
+        # bulk_create / bulk_update لا ترسل إشارات الحفظ - bulk writes skip the search-index signals
+        self.searchable = self.model._meta.label in SOURCES_BY_MODEL
+        self.tracked = self.model._meta.label in ACTIVITY_SOURCES
+        self.lookups = {}
+
+    # ------------------------------------------------------------------
+    # Foreign keys
+    # ------------------------------------------------------------------
+
+    def resolve_foreign_keys(self, rows):
+        """
+        حل المفاتيح الأجنبية مسبقاً - One IN (...) query per referenced model
+        Adds the rows' new values to {column: {value: pk}}, e.g. username -> user id.
+        Values already looked up (found or not) are never queried again.
+        """
+        for field in self.fk_fields:
+            widget = field.widget
+            lookup = self.lookups.setdefault(field.column_name, {})
+            values = sorted({_key(row.get(field.column_name)) for row in rows} - {''} - lookup.keys())
+            for start in range(0, len(values), LOOKUP_BATCH_SIZE):
+                batch = values[start:start + LOOKUP_BATCH_SIZE]
+                lookup.update(dict.fromkeys(batch))
+                lookup.update(
+                    (_key(value), pk)
+                    for value, pk in widget.model.objects.filter(
+                        **{f'{widget.field}__in': batch}
+                    ).values_list(widget.field, 'pk')
+                )
+
+    # ------------------------------------------------------------------
+    # Import
+    # ------------------------------------------------------------------
+
+    def import_file(self, path):
+        """استيراد ملف - Import an .xlsx / .csv file in a single streaming pass"""
+        return self.import_rows(read_rows(path))
+
+    def import_rows(self, rows):
+        """استيراد صفوف - Import an iterable of {header: value} dicts"""
+        result = ImportResult()
+        for chunk in _chunks(rows, self.chunk_size):
+            result.total += len(chunk)
+            # المستخدمون المتكررون يُحلون مرة واحدة فقط - repeated usernames cost nothing after the first chunk
+            self.resolve_foreign_keys([row for row_number, row in chunk])
+            self._import_chunk(chunk, result)
+
+        if not self.dry_run and (result.created or result.updated):
+            self._rebuild_counters()
+        return result
+
+    def _import_chunk(self, chunk, result):
+        existing = self._existing(chunk)
+        seen = {}
+        queued = set()
+        creates = []
+        updates = []
+
+        for row_number, row in chunk:
+            instance, errors = self._build(row, existing, seen)
+            if errors:
+                result.errors.append(RowError(row_number, errors))
+                continue
+
+            # نفس المعرف مكرر داخل الدفعة - a repeated id updates the already queued object
+            if id(instance) in queued:
+                continue
+            queued.add(id(instance))
+            if instance.pk is None:
+                creates.append((row_number, instance))
+            else:
+                updates.append((row_number, instance))
+
+        if self.dry_run:
+            result.created += len(creates)
+            result.updated += len(updates)
+            return
+
+        now = timezone.now()
+        for row_number, instance in updates:
+            for name in self.auto_now_fields:
+                setattr(instance, name, now)
+
+        numbered = []
+        # بدون مفتاح قبل الإدخال - pks bulk_create will set, cleared again if the chunk rolls back
+        unsaved = [instance for row_number, instance in creates if instance.pk is None]
+        try:
+            with transaction.atomic():
+                # الحجز داخل نفس المعاملة - reserved numbers roll back with a failed insert (no gaps)
+                numbered = self._number([instance for row_number, instance in creates])
+                created = self.model.objects.bulk_create([instance for row_number, instance in creates])
+                if created and self.post_create:
+                    self.post_create(created)
+                if created and self.tracked:
+                    record_created(created, actor_id=self.actor_id)
+                if updates:
+                    self.model.objects.bulk_update(
+                        [instance for row_number, instance in updates],
+                        self.update_fields
+                    )
+                if self.searchable:
+                    written = created + [instance for row_number, instance in updates]
+                    reindex(self.model, [instance.pk for instance in written])
+            result.created += len(creates)
+            result.updated += len(updates)
+        except IntegrityError:
+            # إعادة المحاولة صفاً بصف لتحديد الصفوف المخالفة - isolate the offending rows
+            # (as new rows again: the rollback undid their numbers and inserts)
+            for instance in numbered:
+                setattr(instance, self.numbered[0], '')
+            for instance in unsaved:
+                instance.pk = None
+            for row_number, instance in creates:
+                instance._state.adding = True
+            self._save_one_by_one(creates, updates, result)
+
+    def _number(self, instances):
+        """ترقيم السجلات الجديدة - Assign reserved codes to unnumbered instances, returns them"""
+        if not self.numbered:
+            return []
+        field_name, prefix = self.numbered
+        unnumbered = [instance for instance in instances if not getattr(instance, field_name)]
+        if unnumbered:
+            codes = reserve_codes(prefix, len(unnumbered), self.model, field_name)
+            for instance, code in zip(unnumbered, codes):
+                setattr(instance, field_name, code)
+        return unnumbered
+
+    def _save_one_by_one(self, creates, updates, result):
+        for row_number, instance in creates + updates:
+            is_new = instance._state.adding
+            try:
+                with transaction.atomic():
+                    if is_new:
+                        self._number([instance])
+                        self.model.objects.bulk_create([instance])
+                        if self.post_create:
+                            self.post_create([instance])
+                        if self.tracked:
+                            record_created([instance], actor_id=self.actor_id)
+                        if self.searchable:
+                            reindex(self.model, [instance.pk])
+                    else:
+                        instance.save(update_fields=self.update_fields)
+            except IntegrityError as exc:
+                result.errors.append(RowError(row_number, {'__all__': str(exc)}))
+                continue
+            if is_new:
+                result.created += 1
+            else:
+                result.updated += 1
+
+    def _existing(self, chunk):
+        """السجلات الموجودة لهذه الدفعة - One query for the chunk's import ids"""
+        if self.id_field is None:
+            return {}
+        keys = {_key(row.get(self.id_field.column_name)) for row_number, row in chunk} - {''}
+        if not keys:
+            return {}
+        existing = self.model.objects.in_bulk(list(keys), field_name=self.id_field.attribute)
+        return {_key(key): instance for key, instance in existing.items()}
+
+    def _build(self, row, existing, seen):
+        errors = {}
+        key = _key(row.get(self.id_field.column_name)) if self.id_field else ''
+
+        instance = (existing.get(key) or seen.get(key)) if key else None
+        if instance is None:
+            instance = self.model()
+        if key:
+            seen[key] = instance
+
+        for field in self.value_fields:
+            if field.column_name not in row:
+                continue
+            if field is self.id_field and field.attribute == self.model._meta.pk.name:
+                continue
+            try:
+                setattr(instance, field.attribute, field.clean(row))
+            except (ValueError, TypeError, ArithmeticError, ValidationError) as exc:
+                errors[field.column_name] = str(exc)
+
+        exclude = []
+        for field in self.fk_fields:
+            model_field = self.model._meta.get_field(field.attribute)
+            exclude.append(field.attribute)
+            if field.column_name not in row:
+                continue
+            value = _key(row.get(field.column_name))
+            if not value:
+                setattr(instance, model_field.attname, None)
+                if not model_field.null:
+                    errors[field.column_name] = _('هذا الحقل مطلوب')
+                continue
+            pk = self.lookups.get(field.column_name, {}).get(value)
+            if pk is None:
+                errors[field.column_name] = _('القيمة غير موجودة: %(value)s') % {'value': value}
+            else:
+                setattr(instance, model_field.attname, pk)
+
+        if self.numbered and instance.pk is None and not getattr(instance, self.numbered[0]):
+            exclude.append(self.numbered[0])
+
+        if not errors:
+            try:
+                # بدون فحص التفرد والمفاتيح الأجنبية (تم حلها مسبقاً) - no per-row queries
+                instance.full_clean(exclude=exclude, validate_unique=False, validate_constraints=False)
+            except ValidationError as exc:
+                errors.update({name: ' '.join(messages) for name, messages in exc.message_dict.items()})
+
+        return instance, errors
+
+    def _rebuild_counters(self):
+        """تحديث عدادات لوحة التحكم - bulk writes skip signals, so recount affected counters"""
+        from .counters import counters_for, rebuild
+
+        keys = [spec.key for spec in counters_for(self.model._meta.label)]
+        if keys:
+            rebuild(keys=keys)
@@ -0,0 +1,187 @@
+"""
+Number Lookup - البحث برقم المستند
+Document numbers (PRM-042, INV-1234, PAY-007, ...) are matched with a range
+scan on their unique index instead of an icontains table scan: an exact
+number resolves straight to its detail page, otherwise the numbers starting
+with the query are listed in index order. Digit-only queries ('42') are tried
+against every prefix. On PostgreSQL with pg_trgm, fragments that are not a
+number prefix use the trigram GIN indexes (migration 0011).
+"""
+import re
+from collections import namedtuple
+
+from django.apps import apps
+from django.db import connection
+from django.db.models import Q
+from django.urls import NoReverseMatch, reverse
+from django.utils.translation import gettext_lazy as _
+
+# حد نتائج المطابقة الجزئية - Prefix matches returned per lookup
+LOOKUP_LIMIT = 20
+
+# model: النموذج / prefix: بادئة الترقيم / field: حقل الرقم (فريد) /
+# url_name + url_field: صفحة التفاصيل ومعرفها (الدفعة تفتح فاتورتها)
+NumberSource = namedtuple('NumberSource', ['model', 'prefix', 'field', 'url_name', 'url_field', 'label'])
+
+NUMBER_SOURCES = [
+    NumberSource('permits.Permit', 'PRM', 'permit_number', 'permits:permit_detail', 'pk', _('تصريح')),
+    NumberSource('maintenance.Ticket', 'TKT', 'ticket_number', 'maintenance:ticket_detail', 'pk', _('تذكرة صيانة')),
+    NumberSource('complaints.Case', 'CSE', 'case_number', 'complaints:case_detail', 'pk', _('قضية')),
+    NumberSource('finance.Invoice', 'INV', 'invoice_number', 'finance:invoice_detail', 'pk', _('فاتورة')),
+    NumberSource('finance.Payment', 'PAY', 'payment_number', 'finance:invoice_detail', 'invoice_id', _('دفعة')),
+    NumberSource('marketing.Event', 'EVT', 'event_number', 'marketing:event_detail', 'pk', _('فعالية')),
+    NumberSource('hr.LeaveRequest', 'LVE', 'request_number', 'hr:leave_request_detail', 'pk', _('طلب إجازة')),
+]
+
+# number / label / url
+NumberHit = namedtuple('NumberHit', ['number', 'label', 'url'])
+
+_PREFIXED = re.compile(r'^([A-Z]+)-?(\d*)$')
+_DIGITS = re.compile(r'^\d+$')
+
+
+def clean_number(query):
+    """
+    تنسيق الاستعلام - Upper-case and drop whitespace ('prm 042' -> 'PRM042')
+    """
+    return ''.join((query or '').split()).upper()
+
+
+def parse_number(query, sources=None):
+    """
+    تحليل رقم المستند - Which sources and number prefix a query can match
+
+    Args:
+        sources: مصادر الأرقام (None = NUMBER_SOURCES)
+
+    Returns:
+        list: [(NumberSource, prefix), ...] - فارغة إذا لم يكن الاستعلام رقماً
+
+    Example:
+        >>> parse_number('prm42')
+        [(NumberSource(... 'PRM' ...), 'PRM-42')]
+    """
+    sources = NUMBER_SOURCES if sources is None else sources
+    query = clean_number(query)
+    if _DIGITS.match(query):
+        return [(source, f'{source.prefix}-{query}') for source in sources]
+
+    match = _PREFIXED.match(query)
+    if match:
+        letters, digits = match.groups()
+        return [(source, f'{letters}-{digits}') for source in sources if source.prefix == letters]
+    return []
+
+
+def _candidates(prefix):
+    """الصيغ الكاملة المحتملة - 'PRM-42' may be stored as 'PRM-042' (3-digit padding)"""
+    letters, _sep, digits = prefix.partition('-')
+    if not digits:
+        return []
+    return list(dict.fromkeys([prefix, f'{letters}-{digits.zfill(3)}']))
+
+
+def prefix_range(field, prefix):
+    """
+    شرط البادئة كنطاق - `field` starts with `prefix`, as an index range
+
+    field >= 'PRM-04' AND field < 'PRM-05' is a B-tree range scan on every
+    backend; the startswith check only filters rows inside that range.
+    """
+    upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+    return Q(**{f'{field}__gte': prefix, f'{field}__lt': upper, f'{field}__startswith': prefix})
+
+
+def number_filter(field, query):
+    """
+    فلتر رقم لقائمة - Q for a list search on a number field, or None
+
+    None means the query is not shaped like a number of this field's prefix
+    (bare digits may be a reference number), and the view should fall back
+    to its regular search.
+    """
+    if _DIGITS.match(clean_number(query)):
+        return None
+    parsed = [prefix for source, prefix in parse_number(query) if source.field == field.rsplit('__', 1)[-1]]
+    if not parsed:
+        return None
+    return prefix_range(field, parsed[0])
+
+
+def trigram_enabled():
+    """pg_trgm مثبت - Whether trigram indexes can serve substring lookups"""
+    if connection.vendor != 'postgresql':
+        return False
+    flag = getattr(connection, '_lookup_trgm', None)
+    if flag is None:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+            flag = cursor.fetchone() is not None
+        connection._lookup_trgm = flag
+    return flag
+
+
+def _hit(source, number, object_id):
+    try:
+        url = reverse(source.url_name, kwargs={'pk': object_id})
+    except NoReverseMatch:
+        url = '#'
+    return NumberHit(number, source.label, url)
+
+
+def _values(source, condition, limit):
+    model = apps.get_model(source.model)
+    rows = model.objects.filter(condition).order_by(source.field).values_list(source.field, source.url_field)[:limit]
+    return [_hit(source, number, object_id) for number, object_id in rows]
+
+
+def find_exact(query, sources=None):
+    """
+    مطابقة تامة - The document whose number is exactly `query`, or None
+    One unique-index lookup per candidate source (sources: None = NUMBER_SOURCES).
+    """
+    for source, prefix in parse_number(query, sources):
+        candidates = _candidates(prefix)
+        if candidates:
+            hits = _values(source, Q(**{f'{source.field}__in': candidates}), 1)
+            if hits:
+                return hits[0]
+    return None
+
+
+def find_prefix(query, limit=LOOKUP_LIMIT, sources=None):
+    """
+    مطابقة البادئة - Documents whose number starts with `query`, in number order
+
+    Queries that are not a number prefix ('042', '-04') use pg_trgm when
+    installed and match nothing otherwise (the full-text search covers them).
+    """
+    hits = []
+    for source, prefix in parse_number(query, sources):
+        if len(hits) >= limit:
+            break
+        hits.extend(_values(source, prefix_range(source.field, prefix), limit - len(hits)))
+
+    fragment = clean_number(query)
+    if not hits and len(fragment) >= 3 and trigram_enabled():
+        # contains (LIKE) لا icontains (UPPER ... LIKE) ليستخدم فهرس gin_trgm_ops
+        for source in sources or NUMBER_SOURCES:
+            if len(hits) >= limit:
+                break
+            hits.extend(_values(source, Q(**{f'{source.field}__contains': fragment}), limit - len(hits)))
+    return hits
+
+
+def lookup(query, limit=LOOKUP_LIMIT, sources=None):
+    """
+    البحث برقم المستند - (exact hit or None, prefix hits)
+
+    Example:
+        >>> exact, hits = lookup('prm 42')
+        >>> exact.number
+        'PRM-042'
+    """
+    exact = find_exact(query, sources)
+    if exact is not None:
+        return exact, [exact]
+    return None, find_prefix(query, limit, sources)
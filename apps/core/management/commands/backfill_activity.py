@@ -0,0 +1,59 @@
+"""
+Management command to backfill the activity feed from existing records
+ينشئ نشاطات "إنشاء" للسجلات الموجودة قبل تفعيل سجل النشاطات
+"""
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from apps.core.activity import SOURCES
+from apps.core.models import ActivityEvent
+
+
+class Command(BaseCommand):
+    help = 'Create "created" activity events for records that have none'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000, help='Rows per bulk insert')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        self.stdout.write(self.style.SUCCESS('🔄 Backfilling activity feed...'))
+
+        total = 0
+        for source in SOURCES:
+            model = apps.get_model(source.model)
+            logged = ActivityEvent.objects.filter(
+                object_type=source.object_type, verb='created'
+            ).values('object_id')
+
+            fields = ['pk', 'created_at', source.number_field, f'{source.actor_field}_id']
+            has_status = any(field.name == 'status' for field in model._meta.fields)
+            if has_status:
+                fields.append('status')
+
+            rows = model.objects.exclude(pk__in=logged).values_list(*fields)
+
+            batch = []
+            created = 0
+            for row in rows.iterator(chunk_size=batch_size):
+                batch.append(ActivityEvent(
+                    actor_id=row[3],
+                    verb='created',
+                    object_type=source.object_type,
+                    object_id=row[0],
+                    title=row[2] or '',
+                    status=row[4] if has_status else '',
+                    created_at=row[1],
+                ))
+                if len(batch) >= batch_size:
+                    ActivityEvent.objects.bulk_create(batch)
+                    created += len(batch)
+                    batch = []
+            if batch:
+                ActivityEvent.objects.bulk_create(batch)
+                created += len(batch)
+
+            total += created
+            self.stdout.write(f'   {source.object_type}: {created}')
+
+        self.stdout.write(self.style.SUCCESS(f'\n✅ Created {total} activity events'))
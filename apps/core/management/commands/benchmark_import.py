@@ -0,0 +1,107 @@
+"""
+Management command to benchmark the bulk import pipeline
+قياس أداء الاستيراد المجمع على ملف مولد (الافتراضي 100 ألف صف)
+"""
+import os
+import tempfile
+import time
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from apps.core.imports import IMPORT_CHUNK_SIZE, BulkImporter
+from apps.core.models import ActivityEvent
+from apps.hr.models import LeaveRequest
+from apps.hr.resources import LeaveRequestResource
+
+User = get_user_model()
+
+HEADERS = ['request_number', 'employee', 'leave_type', 'start_date', 'end_date', 'days_count', 'reason', 'status']
+
+
+class Command(BaseCommand):
+    help = 'Time BulkImporter against import-export import_data on generated leave requests'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100000, help='Rows in the generated file')
+        parser.add_argument('--compare-rows', type=int, default=1000,
+                            help='Rows imported with resource.import_data for comparison (0 = skip)')
+        parser.add_argument('--chunk-size', type=int, default=IMPORT_CHUNK_SIZE)
+        parser.add_argument('--keep', action='store_true', help='Keep the imported rows')
+
+    def _write_file(self, path, rows, usernames, prefix):
+        import xlsxwriter
+
+        workbook = xlsxwriter.Workbook(path, {'constant_memory': True})
+        worksheet = workbook.add_worksheet()
+        worksheet.write_row(0, 0, HEADERS)
+        start = date(2020, 1, 1)
+        for number in range(1, rows + 1):
+            day = start + timedelta(days=number % 1500)
+            worksheet.write_row(number, 0, [
+                f'{prefix}-{number:07d}',
+                usernames[number % len(usernames)],
+                'annual',
+                day.isoformat(),
+                (day + timedelta(days=2)).isoformat(),
+                3,
+                'Benchmark',
+                'pending',
+            ])
+        workbook.close()
+
+    def handle(self, *args, **options):
+        usernames = list(User.objects.values_list('username', flat=True)[:50])
+        if not usernames:
+            raise CommandError('At least one user is required')
+
+        rows = options['rows']
+        path = os.path.join(tempfile.gettempdir(), f'benchmark_import_{rows}.xlsx')
+
+        self.stdout.write(self.style.SUCCESS(f'📝 Generating {rows} rows -> {path}'))
+        started = time.perf_counter()
+        self._write_file(path, rows, usernames, 'BENCH')
+        self.stdout.write(f'   {time.perf_counter() - started:.1f}s')
+
+        try:
+            self.stdout.write(self.style.SUCCESS('\n⚡ BulkImporter'))
+            started = time.perf_counter()
+            result = BulkImporter(LeaveRequestResource, chunk_size=options['chunk_size']).import_file(path)
+            elapsed = time.perf_counter() - started
+            self.stdout.write(f'   {result}')
+            self.stdout.write(f'   {elapsed:.1f}s ({result.total / elapsed:,.0f} rows/s)')
+
+            compare_rows = options['compare_rows']
+            if compare_rows:
+                self._compare(compare_rows, usernames, rows / elapsed if elapsed else 0)
+        finally:
+            os.remove(path)
+            if not options['keep']:
+                LeaveRequest.objects.filter(request_number__startswith='BENCH').delete()
+                ActivityEvent.objects.filter(object_type='leave', title__startswith='BENCH').delete()
+
+    def _compare(self, rows, usernames, bulk_rate):
+        import tablib
+
+        self.stdout.write(self.style.SUCCESS(f'\n🐢 import_data ({rows} rows)'))
+        dataset = tablib.Dataset(headers=HEADERS)
+        start = date(2020, 1, 1)
+        for number in range(1, rows + 1):
+            day = start + timedelta(days=number % 1500)
+            dataset.append([
+                f'BENCHREF-{number:07d}', usernames[number % len(usernames)], 'annual',
+                day, day + timedelta(days=2), 3, 'Benchmark', 'pending',
+            ])
+
+        started = time.perf_counter()
+        with transaction.atomic():
+            result = LeaveRequestResource().import_data(dataset, raise_errors=False)
+        elapsed = time.perf_counter() - started
+        rate = rows / elapsed if elapsed else 0
+
+        self.stdout.write(f'   errors: {result.has_errors()}')
+        self.stdout.write(f'   {elapsed:.1f}s ({rate:,.0f} rows/s)')
+        if rate:
+            self.stdout.write(self.style.SUCCESS(f'\n📊 Speed-up: {bulk_rate / rate:.1f}x'))
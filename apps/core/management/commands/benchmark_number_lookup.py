@@ -0,0 +1,124 @@
+"""
+Management command to benchmark document number lookups
+قياس البحث برقم المستند (نطاق الفهرس الفريد) مقابل icontains على جدول مولد (الافتراضي مليون تصريح)
+"""
+import random
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from apps.core.lookup import LOOKUP_LIMIT, NumberSource, find_exact, find_prefix, prefix_range
+from apps.permits.models import Permit
+
+User = get_user_model()
+
+# بادئة خاصة بالقياس حتى لا تتأثر تسلسلات PRM - keeps the real PRM sequence untouched
+BENCH_PREFIX = 'BNC'
+BENCH_SOURCE = NumberSource('permits.Permit', BENCH_PREFIX, 'permit_number', 'permits:permit_detail', 'pk', 'Benchmark')
+
+
+class Command(BaseCommand):
+    help = 'Time number lookups (exact / prefix on the unique index) against permit_number__icontains'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000000, help='Permits to generate')
+        parser.add_argument('--samples', type=int, default=50, help='Lookups timed per method')
+        parser.add_argument('--batch-size', type=int, default=10000, help='Rows per bulk insert')
+        parser.add_argument('--keep', action='store_true', help='Keep the generated rows for the next run')
+
+    def handle(self, *args, **options):
+        tenant = User.objects.order_by('pk').first()
+        if tenant is None:
+            raise CommandError('At least one user is required')
+
+        rows = options['rows']
+        try:
+            self._generate(rows, tenant, options['batch_size'])
+            self._benchmark(rows, options['samples'])
+        finally:
+            if not options['keep']:
+                self._cleanup()
+
+    def _number(self, number):
+        return f'{BENCH_PREFIX}-{number:07d}'
+
+    def _generate(self, rows, tenant, batch_size):
+        existing = Permit.objects.filter(prefix_range('permit_number', f'{BENCH_PREFIX}-')).count()
+        if existing >= rows:
+            self.stdout.write(self.style.SUCCESS(f'📦 Reusing {existing} generated permits'))
+            return
+
+        self.stdout.write(self.style.SUCCESS(f'📝 Generating {rows - existing} permits...'))
+        started = time.perf_counter()
+        permit_type = Permit._meta.get_field('permit_type').choices[0][0]
+        direction = Permit._meta.get_field('direction').choices[0][0]
+        today = timezone.now().date()
+
+        # bulk_create بدون إشارات (لا عدادات ولا فهرس بحث) - no signals, no counters or search entries
+        for start in range(existing + 1, rows + 1, batch_size):
+            Permit.objects.bulk_create([
+                Permit(
+                    permit_number=self._number(number),
+                    permit_type=permit_type,
+                    direction=direction,
+                    tenant=tenant,
+                    title='Benchmark',
+                    requested_date=today,
+                    status='approved',
+                )
+                for number in range(start, min(start + batch_size, rows + 1))
+            ])
+        self.stdout.write(f'   {time.perf_counter() - started:.1f}s')
+
+    def _time(self, label, queries, run):
+        timings = []
+        for query in queries:
+            started = time.perf_counter()
+            run(query)
+            timings.append((time.perf_counter() - started) * 1000)
+
+        mean = statistics.mean(timings)
+        p95 = sorted(timings)[int(len(timings) * 0.95) - 1] if len(timings) > 1 else timings[0]
+        self.stdout.write(f'   {label:<28} avg {mean:8.2f} ms   p95 {p95:8.2f} ms')
+        return mean
+
+    def _benchmark(self, rows, samples):
+        numbers = [self._number(random.randint(1, rows)) for _ in range(samples)]
+        # 'BNC-00123' يطابق 100 رقم - a prefix matching ~100 numbers
+        prefixes = [number[:-2] for number in numbers]
+
+        def icontains(query):
+            return list(Permit.objects.filter(permit_number__icontains=query).values_list('pk', flat=True)[:LOOKUP_LIMIT])
+
+        self.stdout.write(self.style.SUCCESS(f'\n🔍 Exact number ({samples} lookups)'))
+        slow = self._time('permit_number__icontains', numbers, icontains)
+        fast = self._time('find_exact', numbers, lambda query: find_exact(query, [BENCH_SOURCE]))
+        self.stdout.write(self.style.SUCCESS(f'   📊 Speed-up: {slow / fast:.0f}x'))
+
+        self.stdout.write(self.style.SUCCESS(f'\n🔍 Number prefix ({samples} lookups)'))
+        slow = self._time('permit_number__icontains', prefixes, icontains)
+        fast = self._time('find_prefix', prefixes, lambda query: find_prefix(query, sources=[BENCH_SOURCE]))
+        self.stdout.write(self.style.SUCCESS(f'   📊 Speed-up: {slow / fast:.0f}x'))
+
+        self.stdout.write(self.style.SUCCESS('\n📋 Query plans'))
+        plans = [
+            ('icontains', Permit.objects.filter(permit_number__icontains=prefixes[0])),
+            ('prefix range', Permit.objects.filter(prefix_range('permit_number', prefixes[0]))),
+        ]
+        for label, queryset in plans:
+            self.stdout.write(f'   {label}:')
+            for line in queryset.order_by('permit_number').values('pk')[:LOOKUP_LIMIT].explain().splitlines():
+                self.stdout.write(f'      {line}')
+
+    def _cleanup(self):
+        # حذف مباشر: delete() يحمل كل صف لإرسال الإشارات - queryset.delete() would load every row for signals
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {Permit._meta.db_table} WHERE permit_number >= %s AND permit_number < %s',
+                [f'{BENCH_PREFIX}-', f'{BENCH_PREFIX}.']
+            )
+            self.stdout.write(self.style.SUCCESS(f'\n🧹 Removed {cursor.rowcount} generated permits'))
@@ -0,0 +1,68 @@
+"""
+Management command to bulk import an Excel/CSV file through a Resource
+استيراد ملف Excel/CSV بالدفعات باستخدام تعريف Resource
+"""
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.module_loading import import_string
+
+from apps.core.imports import IMPORT_CHUNK_SIZE, BulkImporter
+
+
+def load_resource(name):
+    """'hr.LeaveRequestResource' -> apps.hr.resources.LeaveRequestResource"""
+    if name.count('.') == 1:
+        app_label, class_name = name.split('.')
+        name = f'apps.{app_label}.resources.{class_name}'
+    try:
+        return import_string(name)
+    except ImportError as exc:
+        raise CommandError(f'Unknown resource: {name}') from exc
+
+
+class Command(BaseCommand):
+    help = 'Bulk import an .xlsx/.csv file, e.g. bulk_import hr.LeaveRequestResource leaves.xlsx'
+
+    def add_arguments(self, parser):
+        parser.add_argument('resource', help='app.ResourceClass or a dotted path')
+        parser.add_argument('path', help='.xlsx or .csv file')
+        parser.add_argument('--chunk-size', type=int, default=IMPORT_CHUNK_SIZE, help='Rows per transaction')
+        parser.add_argument('--dry-run', action='store_true', help='Validate only, write nothing')
+        parser.add_argument('--max-errors', type=int, default=50, help='Row errors to print')
+        parser.add_argument('--user', help='Username recorded as the actor in the activity feed')
+
+    def handle(self, *args, **options):
+        resource_class = load_resource(options['resource'])
+
+        actor_id = None
+        if options['user']:
+            actor_id = get_user_model().objects.filter(username=options['user']).values_list('pk', flat=True).first()
+            if actor_id is None:
+                raise CommandError(f'Unknown user: {options["user"]}')
+
+        importer = BulkImporter(
+            resource_class,
+            chunk_size=options['chunk_size'],
+            dry_run=options['dry_run'],
+            actor_id=actor_id
+        )
+
+        mode = 'Validating' if options['dry_run'] else 'Importing'
+        self.stdout.write(self.style.SUCCESS(f'📥 {mode} {options["path"]} ({importer.model._meta.label})...'))
+
+        result = importer.import_file(options['path'])
+
+        for error in result.errors[:options['max_errors']]:
+            details = '; '.join(f'{column}: {message}' for column, message in error.errors.items())
+            self.stdout.write(self.style.WARNING(f'⚠️  Row {error.row}: {details}'))
+        if len(result.errors) > options['max_errors']:
+            self.stdout.write(self.style.WARNING(f'   ... {len(result.errors) - options["max_errors"]} more'))
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'\n✅ {result.total} rows processed\n'
+                f'➕ Created: {result.created}\n'
+                f'✏️  Updated: {result.updated}\n'
+                f'❌ Errors: {len(result.errors)}'
+            )
+        )
@@ -0,0 +1,21 @@
+"""
+Management command to rebuild the materialized dashboard counters
+يعيد حساب عدادات لوحة التحكم من الجداول مباشرة
+"""
+from django.core.management.base import BaseCommand
+
+from apps.core import counters
+
+
+class Command(BaseCommand):
+    help = 'Recompute dashboard counters from the Permit, Ticket, Case and Event tables'
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.SUCCESS('🔄 Rebuilding dashboard counters...'))
+
+        values = counters.rebuild()
+
+        for key, value in values.items():
+            self.stdout.write(f'   {key}: {value}')
+
+        self.stdout.write(self.style.SUCCESS(f'\n✅ Rebuilt {len(values)} counters'))
@@ -0,0 +1,40 @@
+"""
+Management command to rebuild the full-text search index
+يعيد بناء فهرس البحث (بعد تعديل الحقول المفهرسة أو قواعد التطبيع)
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.search import SOURCES_BY_TYPE, rebuild
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the search index for permits, tickets, cases and invoices'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--type',
+            action='append',
+            dest='object_types',
+            choices=sorted(SOURCES_BY_TYPE),
+            help='Only rebuild this object type (repeatable)'
+        )
+
+    def handle(self, *args, **options):
+        object_types = options['object_types']
+        self.stdout.write(self.style.SUCCESS('🔄 Rebuilding search index...'))
+
+        started = time.perf_counter()
+        try:
+            counts = rebuild(object_types=object_types)
+        except LookupError as exc:
+            raise CommandError(str(exc))
+
+        for object_type, count in counts.items():
+            self.stdout.write(f'   {object_type}: {count}')
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'\n✅ Indexed {sum(counts.values())} records in {elapsed:.1f}s'
+        ))
@@ -0,0 +1,24 @@
+"""
+Management command to reconcile cached unread notification counters
+يعيد حساب عدادات الإشعارات غير المقروءة من قاعدة البيانات (يُشغّل دورياً عبر cron)
+"""
+from django.core.management.base import BaseCommand
+
+from apps.core.notifications import reconcile_unread_counts
+
+
+class Command(BaseCommand):
+    help = 'Recompute every user\'s unread notification counter'
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.SUCCESS('🔄 Reconciling unread notification counters...'))
+
+        counts = reconcile_unread_counts()
+        unread = sum(counts.values())
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'\n✅ Reconciled {len(counts)} users\n'
+                f'🔔 {unread} unread notifications'
+            )
+        )
@@ -4,6 +4,9 @@ Custom Middleware for CRM System
 from django.utils import translation
 from django.conf import settings
 
+from .activity import set_current_request
+from .cache import start_request_memo, clear_request_memo
+
 
 class LanguageMiddleware:
     """
@@ -63,3 +66,49 @@ class LanguageMiddleware:
 
         return response
 
+
+
+class RequestCacheMiddleware:
+    """
+    Middleware to scope the per-request cache memo (apps.core.cache)
+    ذاكرة مؤقتة خاصة بكل طلب - تُمسح في بداية ونهاية الطلب
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        start_request_memo()
+        try:
+            return self.get_response(request)
+        finally:
+            clear_request_memo()
+
+
+class ActivityMiddleware:
+    """
+    Middleware to expose the current request to the activity feed (apps.core.activity)
+    يحدد المستخدم الذي قام بالإجراء عند تسجيل النشاطات
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        set_current_request(request)
+        try:
+            return self.get_response(request)
+        finally:
+            set_current_request(None)
+
+
+class ModulePermissionMiddleware:
+    """
+    Middleware to attach the cached module permission map as request.module_perms
+    صلاحيات المديولات للمستخدم الحالي - تُحمّل عند أول استخدام فقط
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        from apps.accounts.permissions import ModulePermissions
+        request.module_perms = ModulePermissions(request.user)
+        return self.get_response(request)
@@ -0,0 +1,28 @@
+# Generated by Django 5.0.14 on 2026-10-18 16:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_notification'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NumberSequence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('prefix', models.CharField(max_length=20, unique=True, verbose_name='البادئة')),
+                ('last_value', models.PositiveBigIntegerField(default=0, verbose_name='آخر رقم')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='تاريخ التحديث')),
+            ],
+            options={
+                'verbose_name': 'تسلسل الترقيم',
+                'verbose_name_plural': 'تسلسلات الترقيم',
+                'db_table': 'core_number_sequence',
+                'ordering': ['prefix'],
+            },
+        ),
+    ]
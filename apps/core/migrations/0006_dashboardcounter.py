@@ -0,0 +1,28 @@
+# Generated by Django 5.0.14 on 2026-10-18 16:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_numbersequence'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DashboardCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=100, unique=True, verbose_name='المفتاح')),
+                ('value', models.BigIntegerField(default=0, verbose_name='القيمة')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='تاريخ التحديث')),
+            ],
+            options={
+                'verbose_name': 'عداد لوحة التحكم',
+                'verbose_name_plural': 'عدادات لوحة التحكم',
+                'db_table': 'core_dashboard_counter',
+                'ordering': ['key'],
+            },
+        ),
+    ]
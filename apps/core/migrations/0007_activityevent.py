@@ -0,0 +1,38 @@
+# Generated by Django 5.0.14 on 2026-10-18 16:57
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_dashboardcounter'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ActivityEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('verb', models.CharField(choices=[('created', 'إنشاء'), ('status_changed', 'تغيير الحالة')], max_length=20, verbose_name='الإجراء')),
+                ('object_type', models.CharField(choices=[('permit', 'تصريح'), ('ticket', 'صيانة'), ('case', 'شكوى'), ('invoice', 'فاتورة'), ('payment', 'دفعة'), ('leave', 'إجازة')], max_length=20, verbose_name='نوع السجل')),
+                ('object_id', models.PositiveBigIntegerField(verbose_name='رقم السجل')),
+                ('title', models.CharField(max_length=200, verbose_name='العنوان')),
+                ('status', models.CharField(blank=True, default='', max_length=20, verbose_name='الحالة')),
+                ('previous_status', models.CharField(blank=True, default='', max_length=20, verbose_name='الحالة السابقة')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='تاريخ الإنشاء')),
+                ('actor', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='activity_events', to=settings.AUTH_USER_MODEL, verbose_name='المستخدم')),
+            ],
+            options={
+                'verbose_name': 'نشاط',
+                'verbose_name_plural': 'النشاطات',
+                'db_table': 'core_activity_event',
+                'ordering': ['-created_at', '-id'],
+                'indexes': [models.Index(fields=['-created_at', '-id'], name='activity_created_idx'), models.Index(fields=['actor', '-created_at', '-id'], name='activity_actor_created_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,165 @@
+# Generated by Django 5.0.14 on 2026-10-18 17:20
+
+import re
+
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import migrations, models
+
+# نسخة ثابتة من apps.core.search وقت إنشاء الترحيل - frozen copy of apps.core.search as of this
+# migration, so later changes to the search module do not alter what it does
+FTS_TABLE = 'core_search_fts'
+
+BATCH_SIZE = 2000
+
+# (model, object_type, number_field, fields, select_related)
+SOURCES = [
+    ('permits.Permit', 'permit', 'permit_number',
+     ('permit_number', 'title', 'description', 'company_name', 'contact_person'), ()),
+    ('maintenance.Ticket', 'ticket', 'ticket_number',
+     ('ticket_number', 'title', 'description', 'unit_number', 'building_name'), ()),
+    ('complaints.Case', 'case', 'case_number',
+     ('case_number', 'title', 'description', 'department'), ()),
+    ('finance.Invoice', 'invoice', 'invoice_number',
+     ('invoice_number', 'notes', 'tenant__username', 'tenant__first_name',
+      'tenant__last_name', 'tenant__tenant_profile__company_name'), ('tenant__tenant_profile',)),
+]
+
+DIACRITICS = re.compile('[\u0610-\u061a\u064b-\u065f\u0670\u06d6-\u06ed\u0640]')
+
+LETTERS = str.maketrans({
+    'أ': 'ا', 'إ': 'ا', 'آ': 'ا', 'ٱ': 'ا',
+    'ى': 'ي', 'ئ': 'ي',
+    'ؤ': 'و',
+    'ة': 'ه',
+})
+
+TERM = re.compile(r'\w+')
+
+# جدول FTS5 يتبع core_search_entry عبر المشغلات - external-content FTS5 table kept in sync by triggers
+SQLITE_FTS = [
+    f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+    "document, content='core_search_entry', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+    f"CREATE TRIGGER core_search_fts_ai AFTER INSERT ON core_search_entry BEGIN "
+    f"INSERT INTO {FTS_TABLE}(rowid, document) VALUES (new.id, new.document); END",
+    f"CREATE TRIGGER core_search_fts_ad AFTER DELETE ON core_search_entry BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, document) VALUES ('delete', old.id, old.document); END",
+    f"CREATE TRIGGER core_search_fts_au AFTER UPDATE ON core_search_entry BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, document) VALUES ('delete', old.id, old.document); "
+    f"INSERT INTO {FTS_TABLE}(rowid, document) VALUES (new.id, new.document); END",
+]
+
+SQLITE_FTS_DROP = [
+    'DROP TRIGGER IF EXISTS core_search_fts_ai',
+    'DROP TRIGGER IF EXISTS core_search_fts_ad',
+    'DROP TRIGGER IF EXISTS core_search_fts_au',
+    f'DROP TABLE IF EXISTS {FTS_TABLE}',
+]
+
+POSTGRES_GIN = (
+    "CREATE INDEX core_search_document_gin ON core_search_entry "
+    "USING gin (to_tsvector('simple', document))"
+)
+
+
+def create_text_index(apps, schema_editor):
+    """فهرس النص الكامل حسب قاعدة البيانات - GIN on PostgreSQL, FTS5 on SQLite"""
+    connection = schema_editor.connection
+    if connection.vendor == 'postgresql':
+        schema_editor.execute(POSTGRES_GIN)
+    elif connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+            if not cursor.fetchone()[0]:
+                # بدون FTS5 يستخدم البحث LIKE - search falls back to LIKE
+                return
+        for statement in SQLITE_FTS:
+            schema_editor.execute(statement)
+
+
+def drop_text_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS core_search_document_gin')
+    elif connection.vendor == 'sqlite':
+        for statement in SQLITE_FTS_DROP:
+            schema_editor.execute(statement)
+
+
+def _value(instance, path):
+    value = instance
+    for attr in path.split('__'):
+        try:
+            value = getattr(value, attr)
+        except ObjectDoesNotExist:
+            # علاقة غير موجودة (مثل مستخدم بدون ملف مستأجر) - missing related row
+            return ''
+        if value is None:
+            return ''
+    return value
+
+
+def _document(text):
+    text = ' '.join(DIACRITICS.sub('', str(text)).translate(LETTERS).lower().split())
+    stems = [word[2:] for word in TERM.findall(text) if word.startswith('ال') and len(word) > 4]
+    return ' '.join([text] + stems)
+
+
+def build_index(apps, schema_editor):
+    """فهرسة السجلات الحالية - Index existing permits, tickets, cases and invoices"""
+    SearchEntry = apps.get_model('core', 'SearchEntry')
+
+    for label, object_type, number_field, fields, related in SOURCES:
+        model = apps.get_model(label)
+        batch = []
+        for instance in model.objects.select_related(*related).order_by('pk').iterator(chunk_size=BATCH_SIZE):
+            title = str(getattr(instance, number_field) or '')
+            extra = getattr(instance, 'title', '')
+            if extra:
+                title = f'{title} - {extra}'
+            batch.append(SearchEntry(
+                object_type=object_type,
+                object_id=instance.pk,
+                title=title[:255],
+                document=_document(' '.join(str(_value(instance, path)) for path in fields)),
+            ))
+            if len(batch) >= BATCH_SIZE:
+                SearchEntry.objects.bulk_create(batch)
+                batch = []
+        SearchEntry.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_exportjob'),
+        ('accounts', '0002_departmentpermission'),
+        ('complaints', '0003_keyset_pagination_indexes'),
+        ('finance', '0003_keyset_pagination_indexes'),
+        ('maintenance', '0003_keyset_pagination_indexes'),
+        ('permits', '0007_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_type', models.CharField(max_length=20, verbose_name='نوع السجل')),
+                ('object_id', models.PositiveBigIntegerField(verbose_name='رقم السجل')),
+                ('title', models.CharField(max_length=255, verbose_name='العنوان')),
+                ('document', models.TextField(verbose_name='النص المفهرس')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='تاريخ التحديث')),
+            ],
+            options={
+                'verbose_name': 'مدخل بحث',
+                'verbose_name_plural': 'فهرس البحث',
+                'db_table': 'core_search_entry',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='searchentry',
+            constraint=models.UniqueConstraint(fields=('object_type', 'object_id'), name='search_entry_object_unique'),
+        ),
+        migrations.RunPython(create_text_index, drop_text_index),
+        migrations.RunPython(build_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,67 @@
+from django.db import DatabaseError, migrations, transaction
+
+# أعمدة أرقام المستندات وقت إنشاء الترحيل - (table, column) of the document numbers as of this migration
+NUMBER_COLUMNS = [
+    ('permits_permit', 'permit_number'),
+    ('maintenance_ticket', 'ticket_number'),
+    ('complaints_case', 'case_number'),
+    ('finance_invoice', 'invoice_number'),
+    ('finance_payment', 'payment_number'),
+    ('marketing_event', 'event_number'),
+    ('hr_leaverequest', 'request_number'),
+]
+
+
+def _indexes():
+    for table, column in NUMBER_COLUMNS:
+        yield f'{table}_{column}_trgm', table, column
+
+
+def create_trigram_indexes(apps, schema_editor):
+    """
+    فهارس pg_trgm لأرقام المستندات - GIN trigram indexes (PostgreSQL only)
+    Skipped when pg_trgm is not available or the role may not create extensions;
+    prefix lookups still use the unique B-tree indexes.
+    """
+    connection = schema_editor.connection
+    if connection.vendor != 'postgresql':
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+        if cursor.fetchone() is None:
+            return
+    try:
+        with transaction.atomic(using=connection.alias):
+            schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    except DatabaseError:
+        return
+
+    for name, table, column in _indexes():
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {name} ON {table} USING gin ({column} gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, table, column in _indexes():
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_search_entry'),
+        ('complaints', '0003_keyset_pagination_indexes'),
+        ('finance', '0003_keyset_pagination_indexes'),
+        ('hr', '0003_keyset_pagination_indexes'),
+        ('maintenance', '0003_keyset_pagination_indexes'),
+        ('marketing', '0003_keyset_pagination_indexes'),
+        ('permits', '0007_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
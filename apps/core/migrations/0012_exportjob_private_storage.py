@@ -0,0 +1,43 @@
+# Generated by Django 5.0.14 on 2026-10-18 18:13
+
+import os
+
+import apps.core.models
+from django.conf import settings
+from django.db import migrations, models
+
+
+def _move_files(apps, source_root, target_root):
+    ExportJob = apps.get_model('core', 'ExportJob')
+    for name in ExportJob.objects.exclude(file='').values_list('file', flat=True).iterator():
+        source = os.path.join(source_root, name)
+        if not os.path.isfile(source):
+            continue
+        target = os.path.join(target_root, name)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        os.replace(source, target)
+
+
+def move_to_private(apps, schema_editor):
+    """نقل ملفات التصدير الحالية من MEDIA_ROOT - Move existing export files out of the public tree"""
+    _move_files(apps, str(settings.MEDIA_ROOT), str(settings.EXPORT_FILES_ROOT))
+
+
+def move_to_media(apps, schema_editor):
+    _move_files(apps, str(settings.EXPORT_FILES_ROOT), str(settings.MEDIA_ROOT))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_number_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='exportjob',
+            name='file',
+            field=models.FileField(blank=True, storage=apps.core.models.export_storage, upload_to='exports/%Y/%m/', verbose_name='الملف'),
+        ),
+        migrations.RunPython(move_to_private, move_to_media),
+    ]
@@ -1,7 +1,10 @@
 from django.db import models
 from django.conf import settings
+from django.core.files.storage import FileSystemStorage
 from django.core.validators import FileExtensionValidator
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
+from .cache import load_singleton, invalidate_singleton
 
 
 class SystemSettings(models.Model):
@@ -156,6 +159,7 @@ class SystemSettings(models.Model):
         """Singleton Pattern - سجل واحد فقط"""
         self.pk = 1
         super().save(*args, **kwargs)
+        invalidate_singleton(SystemSettings)
 
     def delete(self, *args, **kwargs):
         """منع الحذف - Prevent deletion"""
@@ -163,9 +167,8 @@ class SystemSettings(models.Model):
 
     @classmethod
     def load(cls):
-        """تحميل الإعدادات - Load settings"""
-        obj, created = cls.objects.get_or_create(pk=1)
-        return obj
+        """تحميل الإعدادات من الكاش - Load settings (cached, invalidated on save)"""
+        return load_singleton(cls)
 
     def __str__(self):
         return 'إعدادات النظام - System Settings'
@@ -236,6 +239,10 @@ class Notification(models.Model):
         verbose_name_plural = _('الإشعارات')
         db_table = 'core_notification'
         ordering = ['-created_at']
+        indexes = [
+            # شارة الهيدر والقائمة - Unread badge and per-user listing
+            models.Index(fields=['user', 'is_read', '-created_at'], name='notif_user_read_created_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.title}"
@@ -245,24 +252,341 @@ class Notification(models.Model):
         """
         إنشاء إشعار جديد - Create new notification
         """
-        return cls.objects.create(
-            user=user,
-            title=title,
-            message=message,
-            notification_type=notification_type,
-            link=link
-        )
+        from .notifications import notify
+        return notify(user, title, message, notification_type, link)[0]
 
     @classmethod
     def get_unread_count(cls, user):
         """
         عدد الإشعارات غير المقروءة - Get unread notifications count
         """
-        return cls.objects.filter(user=user, is_read=False).count()
+        from .notifications import get_unread_count
+        return get_unread_count(user)
 
     @classmethod
     def mark_all_as_read(cls, user):
         """
         تعليم جميع الإشعارات كمقروءة - Mark all notifications as read
         """
-        cls.objects.filter(user=user, is_read=False).update(is_read=True)
+        from .notifications import mark_read
+        return mark_read(user)
+
+
+class NumberSequence(models.Model):
+    """
+    تسلسلات الترقيم - Document Number Sequences
+    One row per prefix (PRM, TKT, INV, ...) holding the last issued number
+    """
+    prefix = models.CharField(
+        max_length=20,
+        unique=True,
+        verbose_name=_('البادئة')
+    )
+
+    last_value = models.PositiveBigIntegerField(
+        default=0,
+        verbose_name=_('آخر رقم')
+    )
+
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name=_('تاريخ التحديث')
+    )
+
+    class Meta:
+        verbose_name = _('تسلسل الترقيم')
+        verbose_name_plural = _('تسلسلات الترقيم')
+        db_table = 'core_number_sequence'
+        ordering = ['prefix']
+
+    def __str__(self):
+        return f"{self.prefix} - {self.last_value}"
+
+
+class DashboardCounter(models.Model):
+    """
+    عدادات لوحة التحكم - Dashboard Counters
+    Materialized counts maintained by signals (see apps.core.counters)
+    """
+    key = models.CharField(
+        max_length=100,
+        unique=True,
+        verbose_name=_('المفتاح')
+    )
+
+    value = models.BigIntegerField(
+        default=0,
+        verbose_name=_('القيمة')
+    )
+
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name=_('تاريخ التحديث')
+    )
+
+    class Meta:
+        verbose_name = _('عداد لوحة التحكم')
+        verbose_name_plural = _('عدادات لوحة التحكم')
+        db_table = 'core_dashboard_counter'
+        ordering = ['key']
+
+    def __str__(self):
+        return f"{self.key} = {self.value}"
+
+
+class ActivityEvent(models.Model):
+    """
+    سجل النشاطات - Activity Events
+    Append-only log of creations and status changes across modules
+    """
+    VERB_CHOICES = [
+        ('created', _('إنشاء')),
+        ('status_changed', _('تغيير الحالة')),
+    ]
+
+    OBJECT_TYPE_CHOICES = [
+        ('permit', _('تصريح')),
+        ('ticket', _('صيانة')),
+        ('case', _('شكوى')),
+        ('invoice', _('فاتورة')),
+        ('payment', _('دفعة')),
+        ('leave', _('إجازة')),
+    ]
+
+    actor = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='activity_events',
+        verbose_name=_('المستخدم')
+    )
+
+    verb = models.CharField(
+        max_length=20,
+        choices=VERB_CHOICES,
+        verbose_name=_('الإجراء')
+    )
+
+    object_type = models.CharField(
+        max_length=20,
+        choices=OBJECT_TYPE_CHOICES,
+        verbose_name=_('نوع السجل')
+    )
+
+    object_id = models.PositiveBigIntegerField(
+        verbose_name=_('رقم السجل')
+    )
+
+    title = models.CharField(
+        max_length=200,
+        verbose_name=_('العنوان')
+    )
+
+    status = models.CharField(
+        max_length=20,
+        blank=True,
+        default='',
+        verbose_name=_('الحالة')
+    )
+
+    previous_status = models.CharField(
+        max_length=20,
+        blank=True,
+        default='',
+        verbose_name=_('الحالة السابقة')
+    )
+
+    # default بدلاً من auto_now_add للسماح باستيراد النشاطات السابقة بتواريخها
+    created_at = models.DateTimeField(
+        default=timezone.now,
+        verbose_name=_('تاريخ الإنشاء')
+    )
+
+    class Meta:
+        verbose_name = _('نشاط')
+        verbose_name_plural = _('النشاطات')
+        db_table = 'core_activity_event'
+        ordering = ['-created_at', '-id']
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='activity_created_idx'),
+            models.Index(fields=['actor', '-created_at', '-id'], name='activity_actor_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_object_type_display()} {self.title} - {self.get_verb_display()}"
+
+    @property
+    def type_display(self):
+        return self.get_object_type_display()
+
+    @property
+    def status_display(self):
+        """اسم الحالة المعروض - Status label from the source model's choices"""
+        from .activity import status_display
+        return status_display(self.object_type, self.status)
+
+    @property
+    def url(self):
+        """رابط السجل - Link to the source record"""
+        from .activity import object_url
+        return object_url(self)
+
+
+def export_storage():
+    """
+    تخزين ملفات التصدير - Export files live outside the public MEDIA tree
+    (settings.EXPORT_FILES_ROOT) and are only served by the owner-scoped download view.
+    """
+    return FileSystemStorage(location=settings.EXPORT_FILES_ROOT)
+
+
+class ExportJob(models.Model):
+    """
+    مهام التصدير - Export Jobs
+    Large exports written to EXPORT_FILES_ROOT by a background worker
+    """
+    STATUS_CHOICES = [
+        ('pending', _('في الانتظار')),
+        ('running', _('قيد التنفيذ')),
+        ('completed', _('مكتمل')),
+        ('failed', _('فشل')),
+    ]
+
+    FORMAT_CHOICES = [
+        ('xlsx', 'Excel'),
+        ('csv', 'CSV'),
+    ]
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='export_jobs',
+        verbose_name=_('المستخدم')
+    )
+
+    export_type = models.CharField(
+        max_length=30,
+        verbose_name=_('نوع التصدير')
+    )
+
+    file_format = models.CharField(
+        max_length=10,
+        choices=FORMAT_CHOICES,
+        default='xlsx',
+        verbose_name=_('الصيغة')
+    )
+
+    params = models.JSONField(
+        default=dict,
+        blank=True,
+        verbose_name=_('الفلاتر')
+    )
+
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default='pending',
+        verbose_name=_('الحالة')
+    )
+
+    total_rows = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_('إجمالي الصفوف')
+    )
+
+    processed_rows = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_('الصفوف المنجزة')
+    )
+
+    file = models.FileField(
+        upload_to='exports/%Y/%m/',
+        storage=export_storage,
+        blank=True,
+        verbose_name=_('الملف')
+    )
+
+    error = models.TextField(
+        blank=True,
+        default='',
+        verbose_name=_('الخطأ')
+    )
+
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name=_('تاريخ الإنشاء')
+    )
+
+    started_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name=_('تاريخ البدء')
+    )
+
+    finished_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name=_('تاريخ الانتهاء')
+    )
+
+    class Meta:
+        verbose_name = _('مهمة تصدير')
+        verbose_name_plural = _('مهام التصدير')
+        db_table = 'core_export_job'
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.export_type}.{self.file_format} - {self.get_status_display()}"
+
+    @property
+    def progress(self):
+        """نسبة الإنجاز - Percentage complete (0-100)"""
+        if self.status == 'completed':
+            return 100
+        if not self.total_rows:
+            return 0
+        return min(100, int(self.processed_rows * 100 / self.total_rows))
+
+
+class SearchEntry(models.Model):
+    """
+    فهرس البحث - Search Index Entries
+    One normalized text document per permit/ticket/case/invoice, kept in sync by
+    signals. SQLite mirrors it into an FTS5 table and PostgreSQL indexes it with
+    GIN (see apps/core/search.py and migration 0010).
+    """
+    object_type = models.CharField(
+        max_length=20,
+        verbose_name=_('نوع السجل')
+    )
+
+    object_id = models.PositiveBigIntegerField(
+        verbose_name=_('رقم السجل')
+    )
+
+    title = models.CharField(
+        max_length=255,
+        verbose_name=_('العنوان')
+    )
+
+    # النص بعد التطبيع العربي - Arabic-normalized, lower-cased text
+    document = models.TextField(
+        verbose_name=_('النص المفهرس')
+    )
+
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name=_('تاريخ التحديث')
+    )
+
+    class Meta:
+        verbose_name = _('مدخل بحث')
+        verbose_name_plural = _('فهرس البحث')
+        db_table = 'core_search_entry'
+        constraints = [
+            models.UniqueConstraint(fields=['object_type', 'object_id'], name='search_entry_object_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.object_type} {self.title}"
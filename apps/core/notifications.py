@@ -0,0 +1,225 @@
+"""
+Notification Service - خدمة الإشعارات
+Bulk fan-out plus a cache-backed unread counter per user
+"""
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count
+
+from .cache import bump_version, versioned_get
+from .models import Notification
+from .pubsub import publish
+
+# عدد السجلات في كل INSERT - Rows per bulk INSERT
+BATCH_SIZE = 500
+
+# يُعاد حساب العداد من قاعدة البيانات بعد انتهاء المدة - Counter self-reconciles after this
+UNREAD_TIMEOUT = 60 * 60
+
+# عدد الإشعارات في قائمة الهيدر - Notifications shown in the header dropdown
+RECENT_LIMIT = 5
+
+
+def _unread_key(user_id):
+    return f'notifications:unread:{user_id}'
+
+
+def _namespace(user_id):
+    return f'notifications:{user_id}'
+
+
+def channel_for(user_id):
+    """قناة البث للمستخدم - Pub/sub channel carrying a user's live notifications"""
+    return f'notifications:live:{user_id}'
+
+
+def serialize(notification):
+    """تحويل الإشعار إلى JSON - Notification as sent to the browser"""
+    return {
+        'id': notification.id,
+        'title': str(notification.title),
+        'message': str(notification.message),
+        'type': notification.notification_type,
+        'link': notification.link,
+        'created_at': notification.created_at.strftime('%Y-%m-%d %H:%M'),
+    }
+
+
+def _user_ids(users):
+    """
+    تحويل المستخدمين إلى معرفات - Normalize a user, id, queryset or iterable to unique ids
+    """
+    if users is None:
+        return []
+    if isinstance(users, int) or hasattr(users, 'pk'):
+        users = [users]
+    ids = (user if isinstance(user, int) else user.pk for user in users)
+    return list(dict.fromkeys(user_id for user_id in ids if user_id is not None))
+
+
+def _adjust_unread(user_ids, delta):
+    """
+    تعديل العدادات بعد الحفظ - Shift cached unread counters and drop cached header lists
+    Missing counters are left missing; the next read recounts them.
+    """
+    for user_id in user_ids:
+        key = _unread_key(user_id)
+        try:
+            if cache.incr(key, delta) < 0:
+                cache.delete(key)
+        except ValueError:
+            pass
+        bump_version(_namespace(user_id))
+
+
+def _adjust_unread_counts(notifications):
+    """زيادة العدادات حسب عدد إشعارات كل مستخدم - +n per recipient"""
+    per_user = {}
+    for notification in notifications:
+        per_user[notification.user_id] = per_user.get(notification.user_id, 0) + 1
+    for user_id, count in per_user.items():
+        _adjust_unread([user_id], count)
+
+
+def notify(users, title, message, notification_type='info', link=None):
+    """
+    إرسال إشعار لمستخدم أو أكثر - Fan a notification out to one or many users
+
+    Args:
+        users: مستخدم أو معرف أو QuerySet أو قائمة
+        title: العنوان
+        message: الرسالة
+        notification_type: نوع الإشعار
+        link: رابط اختياري
+
+    Returns:
+        list: الإشعارات المنشأة (INSERT واحد لكل BATCH_SIZE مستخدم)
+
+    Example:
+        >>> notify(User.objects.filter(is_superuser=True), 'تنبيه', '...', 'warning')
+    """
+    user_ids = _user_ids(users)
+    if not user_ids:
+        return []
+
+    return send_bulk([
+        Notification(
+            user_id=user_id,
+            title=title,
+            message=message,
+            notification_type=notification_type,
+            link=link,
+        )
+        for user_id in user_ids
+    ])
+
+
+def send_bulk(notifications):
+    """
+    حفظ إشعارات مختلفة دفعة واحدة - Insert prepared (unsaved) Notification objects
+    Use when each recipient gets a different message; counters and live push
+    are updated on commit exactly as in notify().
+
+    Returns:
+        list: الإشعارات المنشأة
+    """
+    if not notifications:
+        return []
+
+    created = Notification.objects.bulk_create(notifications, batch_size=BATCH_SIZE)
+
+    def on_commit():
+        _adjust_unread_counts(created)
+        _push_created(created)
+
+    transaction.on_commit(on_commit)
+    return created
+
+
+def _push_created(notifications):
+    """
+    بث الإشعارات الجديدة - Push new rows to connected browsers
+    Unread counts are attached only when already cached (no extra queries).
+    """
+    counts = cache.get_many([_unread_key(n.user_id) for n in notifications])
+    for notification in notifications:
+        message = serialize(notification)
+        message['unread'] = counts.get(_unread_key(notification.user_id))
+        publish(channel_for(notification.user_id), {'event': 'notification', 'data': message})
+
+
+def get_unread_count(user):
+    """
+    عدد الإشعارات غير المقروءة - Unread count from the cached counter
+    Falls back to an index-only COUNT on (user, is_read) when the counter is cold.
+    """
+    user_id = _user_ids(user)[0]
+    key = _unread_key(user_id)
+
+    count = cache.get(key)
+    if count is None:
+        count = Notification.objects.filter(user_id=user_id, is_read=False).count()
+        cache.add(key, count, UNREAD_TIMEOUT)
+    return count
+
+
+def get_recent(user, limit=RECENT_LIMIT):
+    """
+    أحدث الإشعارات - Latest notifications for the header (cached until they change)
+    """
+    user_id = _user_ids(user)[0]
+
+    def loader():
+        return list(
+            Notification.objects.filter(user_id=user_id).order_by('-created_at')[:limit]
+        )
+
+    return versioned_get(_namespace(user_id), f'recent:{limit}', loader)
+
+
+def mark_read(user, notification_ids=None):
+    """
+    تعليم الإشعارات كمقروءة - Mark some (or all) of a user's notifications as read
+
+    Args:
+        user: المستخدم
+        notification_ids: معرفات الإشعارات (None = الكل)
+
+    Returns:
+        int: عدد الإشعارات التي تم تعليمها
+    """
+    user_id = _user_ids(user)[0]
+    queryset = Notification.objects.filter(user_id=user_id, is_read=False)
+    if notification_ids is not None:
+        queryset = queryset.filter(pk__in=notification_ids)
+
+    updated = queryset.update(is_read=True)
+    if updated:
+        def on_commit():
+            _adjust_unread([user_id], -updated)
+            publish(channel_for(user_id), {'event': 'read', 'data': {'unread': get_unread_count(user_id)}})
+
+        transaction.on_commit(on_commit)
+    return updated
+
+
+def reconcile_unread_counts():
+    """
+    مطابقة العدادات مع قاعدة البيانات - Recompute every user's unread counter
+    One GROUP BY query; users without unread notifications are reset to 0.
+
+    Returns:
+        dict: {user_id: unread_count}
+    """
+    from django.contrib.auth import get_user_model
+
+    counts = dict.fromkeys(get_user_model().objects.values_list('pk', flat=True), 0)
+    counts.update(
+        Notification.objects.filter(is_read=False)
+        .values('user_id')
+        .annotate(unread=Count('id'))
+        .values_list('user_id', 'unread')
+    )
+
+    cache.set_many({_unread_key(user_id): count for user_id, count in counts.items()}, UNREAD_TIMEOUT)
+    return counts
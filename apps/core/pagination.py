@@ -0,0 +1,165 @@
+"""
+Keyset (Cursor) Pagination - التقسيم إلى صفحات بالمؤشر
+Constant-time pages at any depth: no OFFSET and no COUNT(*)
+"""
+import base64
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+# عدد السجلات في الصفحة - Default page size of the list views
+PER_PAGE = 20
+
+# الترتيب الافتراضي (مدعوم بفهرس مركب على created_at, id) - backed by a (created_at, id) index
+DEFAULT_ORDERING = ('-created_at', '-id')
+
+
+def encode_cursor(values):
+    """ترميز المؤشر - Encode key values into an opaque URL-safe cursor"""
+    raw = json.dumps([v.isoformat() if hasattr(v, 'isoformat') else v for v in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """فك ترميز المؤشر - Decode a cursor (None if missing or malformed)"""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (ValueError, TypeError):
+        return None
+    return values if isinstance(values, list) else None
+
+
+class KeysetPage:
+    """
+    صفحة نتائج - One page of keyset-paginated results
+    """
+    def __init__(self, object_list, has_next, has_previous, next_cursor, previous_cursor):
+        self.object_list = object_list
+        self.has_next = has_next
+        self.has_previous = has_previous
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_other_pages(self):
+        return self.has_next or self.has_previous
+
+
+class KeysetPaginator:
+    """
+    مُقسّم الصفحات بالمؤشر - Keyset paginator over a unique ordering
+
+    The ordering must be unique (end with the primary key) and should be
+    backed by a matching composite index.
+
+    Example:
+        >>> paginator = KeysetPaginator(Permit.objects.all(), 20)
+        >>> page = paginator.get_page(after=request.GET.get('after'),
+        ...                           before=request.GET.get('before'))
+    """
+    def __init__(self, queryset, per_page=PER_PAGE, ordering=DEFAULT_ORDERING):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.ordering = tuple(ordering)
+        self.fields = [name.lstrip('-') for name in self.ordering]
+
+    def _to_python(self, values):
+        opts = self.queryset.model._meta
+        return [
+            opts.pk.to_python(value) if name in ('pk', 'id') else opts.get_field(name).to_python(value)
+            for name, value in zip(self.fields, values)
+        ]
+
+    def _seek(self, values, forward):
+        """
+        شرط البحث بعد/قبل المؤشر - Row-value comparison built from Q objects
+        (a, b) after (x, y) for DESC ordering  =>  a < x OR (a = x AND b < y)
+        """
+        condition = Q()
+        equal = {}
+        for order, name, value in zip(self.ordering, self.fields, values):
+            descending = order.startswith('-')
+            lookup = 'lt' if descending == forward else 'gt'
+            condition |= Q(**equal, **{f'{name}__{lookup}': value})
+            equal[name] = value
+        return condition
+
+    def _cursor_for(self, obj):
+        return encode_cursor([getattr(obj, name) for name in self.fields])
+
+    def get_page(self, after=None, before=None):
+        """
+        جلب صفحة - Fetch the page after/before a cursor (first page if neither)
+        """
+        queryset = self.queryset
+        forward = True
+        values = decode_cursor(after)
+        if values is None:
+            values = decode_cursor(before)
+            forward = values is None
+
+        if values is not None:
+            try:
+                if len(values) != len(self.fields):
+                    raise ValueError('cursor does not match ordering')
+                queryset = queryset.filter(self._seek(self._to_python(values), forward))
+            except (ValidationError, ValueError, TypeError):
+                # Malformed cursor - fall back to the first page
+                values = None
+                forward = True
+
+        if forward:
+            rows = list(queryset.order_by(*self.ordering)[:self.per_page + 1])
+        else:
+            reverse = [name[1:] if name.startswith('-') else f'-{name}' for name in self.ordering]
+            rows = list(queryset.order_by(*reverse)[:self.per_page + 1])
+
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if not forward:
+            rows.reverse()
+
+        if forward:
+            has_next, has_previous = has_more, values is not None
+        else:
+            has_next, has_previous = True, has_more
+
+        return KeysetPage(
+            rows,
+            has_next=has_next,
+            has_previous=has_previous,
+            next_cursor=self._cursor_for(rows[-1]) if rows and has_next else None,
+            previous_cursor=self._cursor_for(rows[0]) if rows and has_previous else None,
+        )
+
+
+def paginate(request, queryset, per_page=PER_PAGE, ordering=DEFAULT_ORDERING):
+    """
+    صفحة القائمة من الطلب الحالي - Keyset page for a list view's ?after= / ?before=
+
+    page.querystring keeps the view's filters so templates/core/pagination.html
+    can build next/previous links without losing them.
+
+    Example:
+        >>> page_obj = paginate(request, permits)
+        >>> {% include 'core/pagination.html' %}
+    """
+    page = KeysetPaginator(queryset, per_page, ordering).get_page(
+        after=request.GET.get('after'),
+        before=request.GET.get('before')
+    )
+
+    params = request.GET.copy()
+    for key in ('after', 'before', 'page'):
+        params.pop(key, None)
+    page.querystring = params.urlencode()
+    return page
@@ -0,0 +1,107 @@
+"""
+Pub/Sub - النشر والاشتراك
+Fan-out of small JSON messages to long-lived connections (SSE).
+In-process by default; Redis pub/sub when REDIS_URL is set so every worker
+receives messages published by any other process.
+"""
+import asyncio
+import json
+import logging
+import threading
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class InProcessBroker:
+    """
+    وسيط داخل العملية - Broker for a single process (runserver / one ASGI worker)
+    Publishing is thread-safe: messages are handed to each subscriber's event loop.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = {}
+
+    def publish(self, channel, message):
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, message)
+            except RuntimeError:
+                # Event loop already closed - the subscriber is gone
+                pass
+
+    async def subscribe(self, channel):
+        entry = (asyncio.get_running_loop(), asyncio.Queue())
+        with self._lock:
+            self._subscribers.setdefault(channel, set()).add(entry)
+        try:
+            while True:
+                yield await entry[1].get()
+        finally:
+            with self._lock:
+                subscribers = self._subscribers.get(channel)
+                if subscribers is not None:
+                    subscribers.discard(entry)
+                    if not subscribers:
+                        del self._subscribers[channel]
+
+
+class RedisBroker:
+    """
+    وسيط Redis - Broker backed by Redis PUBLISH/SUBSCRIBE
+    """
+    def __init__(self, url):
+        import redis
+        self.url = url
+        self._client = redis.Redis.from_url(url)
+
+    def publish(self, channel, message):
+        try:
+            self._client.publish(channel, json.dumps(message))
+        except Exception:
+            # الإشعار محفوظ في قاعدة البيانات - the row is saved; the push is best effort
+            logger.exception('Redis publish failed for %s', channel)
+
+    async def subscribe(self, channel):
+        import redis.asyncio as aioredis
+        client = aioredis.Redis.from_url(self.url)
+        pubsub = client.pubsub()
+        await pubsub.subscribe(channel)
+        try:
+            async for item in pubsub.listen():
+                if item.get('type') == 'message':
+                    yield json.loads(item['data'])
+        finally:
+            await pubsub.unsubscribe(channel)
+            await pubsub.aclose()
+            await client.aclose()
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    """
+    الوسيط الحالي - Process-wide broker (Redis when REDIS_URL is set)
+    """
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                redis_url = getattr(settings, 'REDIS_URL', '')
+                _broker = RedisBroker(redis_url) if redis_url else InProcessBroker()
+    return _broker
+
+
+def publish(channel, message):
+    """نشر رسالة - Publish a JSON-serializable message to a channel"""
+    get_broker().publish(channel, message)
+
+
+def subscribe(channel):
+    """الاشتراك في قناة - Async iterator over messages published to a channel"""
+    return get_broker().subscribe(channel)
@@ -0,0 +1,350 @@
+"""
+Full-Text Search - البحث النصي
+One normalized SearchEntry per permit/ticket/case/invoice, matched with
+PostgreSQL full-text search (GIN index), an SQLite FTS5 shadow table, or a
+plain substring scan on other backends. Arabic text is normalized the same
+way when indexing and when searching. Entries that index fields of related
+rows (the tenant's name on invoices) are rebuilt when those rows change.
+"""
+import re
+from collections import namedtuple
+
+from django.apps import apps as global_apps
+from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import connection, transaction
+from django.db.models.expressions import RawSQL
+from django.urls import NoReverseMatch, reverse
+from django.utils.translation import gettext_lazy as _
+
+# حد النتائج لكل وحدة في البحث العام - Hits per module in the global search
+RESULTS_PER_TYPE = 10
+
+# عدد السجلات في كل دفعة عند إعادة البناء - Rows per batch when rebuilding
+REBUILD_BATCH_SIZE = 2000
+
+FTS_TABLE = 'core_search_fts'
+
+# model: النموذج / object_type: نوع السجل / number_field: حقل الرقم /
+# fields: الحقول المفهرسة (تدعم tenant__username) / related: select_related / url_name: صفحة التفاصيل
+SearchSource = namedtuple('SearchSource', ['model', 'object_type', 'number_field', 'fields', 'related', 'url_name'])
+
+SOURCES = [
+    SearchSource('permits.Permit', 'permit', 'permit_number',
+                 ('permit_number', 'title', 'description', 'company_name', 'contact_person'),
+                 (), 'permits:permit_detail'),
+    SearchSource('maintenance.Ticket', 'ticket', 'ticket_number',
+                 ('ticket_number', 'title', 'description', 'unit_number', 'building_name'),
+                 (), 'maintenance:ticket_detail'),
+    SearchSource('complaints.Case', 'case', 'case_number',
+                 ('case_number', 'title', 'description', 'department'),
+                 (), 'complaints:case_detail'),
+    SearchSource('finance.Invoice', 'invoice', 'invoice_number',
+                 ('invoice_number', 'notes', 'tenant__username', 'tenant__first_name',
+                  'tenant__last_name', 'tenant__tenant_profile__company_name'),
+                 ('tenant__tenant_profile',), 'finance:invoice_detail'),
+]
+
+SOURCES_BY_MODEL = {source.model: source for source in SOURCES}
+SOURCES_BY_TYPE = {source.object_type: source for source in SOURCES}
+
+# model: النموذج المرتبط / fields: حقوله المفهرسة / source: نموذج السجلات المفهرسة /
+# lookup + key: السجلات حيث lookup = قيمة key في النموذج المرتبط (تعمل بعد حذفه أيضاً)
+RelatedSource = namedtuple('RelatedSource', ['model', 'fields', 'source', 'lookup', 'key'])
+
+RELATED_SOURCES = [
+    RelatedSource(settings.AUTH_USER_MODEL, ('username', 'first_name', 'last_name'),
+                  'finance.Invoice', 'tenant', 'pk'),
+    RelatedSource('accounts.TenantProfile', ('company_name',),
+                  'finance.Invoice', 'tenant', 'user_id'),
+]
+
+TYPE_LABELS = {
+    'permit': _('التصاريح'),
+    'ticket': _('تذاكر الصيانة'),
+    'case': _('القضايا'),
+    'invoice': _('الفواتير'),
+}
+
+# التشكيل والتطويل - Harakat, superscript alef and tatweel
+_DIACRITICS = re.compile('[\u0610-\u061a\u064b-\u065f\u0670\u06d6-\u06ed\u0640]')
+
+_LETTERS = str.maketrans({
+    'أ': 'ا', 'إ': 'ا', 'آ': 'ا', 'ٱ': 'ا',
+    'ى': 'ي', 'ئ': 'ي',
+    'ؤ': 'و',
+    'ة': 'ه',
+})
+
+_TERM = re.compile(r'\w+')
+
+# object_type / object_id / title / url
+SearchHit = namedtuple('SearchHit', ['object_type', 'object_id', 'title', 'url'])
+
+
+def normalize(text):
+    """
+    تطبيع النص العربي - Strip diacritics, unify alef/ya/ta-marbuta, lower-case
+
+    Example:
+        >>> normalize('إِدارةُ المَكتبة')
+        'اداره المكتبه'
+    """
+    if not text:
+        return ''
+    text = _DIACRITICS.sub('', str(text)).translate(_LETTERS).lower()
+    return ' '.join(text.split())
+
+
+def _document(text):
+    """
+    النص المفهرس - Normalized text plus article-less forms ('المكتبه' -> 'مكتبه')
+    so prefix matching also finds words written with the definite article.
+    """
+    text = normalize(text)
+    stems = [word[2:] for word in _TERM.findall(text) if word.startswith('ال') and len(word) > 4]
+    return ' '.join([text] + stems)
+
+
+def terms(query):
+    """كلمات البحث بعد التطبيع - Normalized search terms (letters and digits only)"""
+    return _TERM.findall(normalize(query))
+
+
+# ----------------------------------------------------------------------
+# Indexing
+# ----------------------------------------------------------------------
+
+def _value(instance, path):
+    value = instance
+    for attr in path.split('__'):
+        try:
+            value = getattr(value, attr)
+        except ObjectDoesNotExist:
+            # علاقة غير موجودة (مثل مستخدم بدون ملف مستأجر) - missing related row
+            return ''
+        if value is None:
+            return ''
+    return value
+
+
+def _entry_for(source, instance, entry_model):
+    title = str(getattr(instance, source.number_field) or '')
+    extra = getattr(instance, 'title', '')
+    if extra:
+        title = f'{title} - {extra}'
+    return entry_model(
+        object_type=source.object_type,
+        object_id=instance.pk,
+        title=title[:255],
+        document=_document(' '.join(str(_value(instance, path)) for path in source.fields)),
+    )
+
+
+def index_instances(instances, registry=global_apps):
+    """
+    فهرسة سجلات - Upsert SearchEntries for instances of one searchable model
+    One DELETE and one bulk INSERT, so it also suits bulk imports.
+    """
+    instances = [instance for instance in instances if instance.pk is not None]
+    if not instances:
+        return 0
+
+    source = SOURCES_BY_MODEL[instances[0]._meta.label]
+    entry_model = registry.get_model('core', 'SearchEntry')
+    entries = [_entry_for(source, instance, entry_model) for instance in instances]
+
+    entry_model.objects.filter(
+        object_type=source.object_type,
+        object_id__in=[instance.pk for instance in instances]
+    ).delete()
+    entry_model.objects.bulk_create(entries, batch_size=REBUILD_BATCH_SIZE)
+    return len(entries)
+
+
+def reindex(model, pks):
+    """
+    فهرسة حسب المعرفات - Reindex rows written without signals (bulk_create / bulk_update)
+    Reloads them with the source's select_related so related fields cost no extra queries.
+    """
+    source = SOURCES_BY_MODEL.get(model._meta.label)
+    if source is None or not pks:
+        return 0
+    return index_instances(list(model.objects.select_related(*source.related).filter(pk__in=list(pks))))
+
+
+def related_targets(instance, update_fields=None):
+    """
+    السجلات المتأثرة بتعديل سجل مرتبط - (source, lookup, key) triples naming the
+    entries that include fields of `instance`. Saves limited to other fields
+    (update_fields=['last_login']) return nothing.
+    """
+    targets = []
+    for related in RELATED_SOURCES:
+        if related.model != instance._meta.label:
+            continue
+        if update_fields is not None and not set(update_fields) & set(related.fields):
+            continue
+        targets.append((related.source, related.lookup, getattr(instance, related.key)))
+    return targets
+
+
+def reindex_related(source, lookup, key):
+    """
+    فهرسة السجلات المرتبطة - Reindex `source` rows where lookup=key (e.g. a
+    renamed tenant's invoices), in batches
+    """
+    model = global_apps.get_model(source)
+    pks = list(model.objects.filter(**{lookup: key}).values_list('pk', flat=True))
+    count = 0
+    for start in range(0, len(pks), REBUILD_BATCH_SIZE):
+        count += reindex(model, pks[start:start + REBUILD_BATCH_SIZE])
+    return count
+
+
+def remove_instance(instance):
+    """حذف من الفهرس - Drop an instance's SearchEntry"""
+    from .models import SearchEntry
+
+    source = SOURCES_BY_MODEL[instance._meta.label]
+    SearchEntry.objects.filter(object_type=source.object_type, object_id=instance.pk).delete()
+
+
+def rebuild(object_types=None, registry=global_apps):
+    """
+    إعادة بناء الفهرس - Reindex every searchable record in batches
+
+    Args:
+        object_types: أنواع محددة (None = الكل)
+        registry: سجل النماذج (apps في ملفات الترحيل)
+
+    Returns:
+        dict: {object_type: عدد السجلات}
+    """
+    entry_model = registry.get_model('core', 'SearchEntry')
+    counts = {}
+
+    for source in SOURCES:
+        if object_types and source.object_type not in object_types:
+            continue
+        model = registry.get_model(source.model)
+        queryset = model.objects.select_related(*source.related).order_by('pk')
+        batch = []
+        counts[source.object_type] = 0
+
+        # البحث يرى الفهرس القديم حتى اكتمال البناء - searches see the old entries until commit
+        with transaction.atomic():
+            entry_model.objects.filter(object_type=source.object_type).delete()
+            for instance in queryset.iterator(chunk_size=REBUILD_BATCH_SIZE):
+                batch.append(_entry_for(source, instance, entry_model))
+                if len(batch) >= REBUILD_BATCH_SIZE:
+                    entry_model.objects.bulk_create(batch)
+                    counts[source.object_type] += len(batch)
+                    batch = []
+            entry_model.objects.bulk_create(batch)
+            counts[source.object_type] += len(batch)
+
+    return counts
+
+
+# ----------------------------------------------------------------------
+# Matching
+# ----------------------------------------------------------------------
+
+def _backend():
+    """
+    نوع المطابقة - 'postgresql', 'fts5', or 'like'
+    The FTS5 table is only created when SQLite was built with FTS5.
+    """
+    if connection.vendor == 'postgresql':
+        return 'postgresql'
+    if connection.vendor == 'sqlite':
+        flag = getattr(connection, '_search_fts5', None)
+        if flag is None:
+            flag = FTS_TABLE in connection.introspection.table_names()
+            connection._search_fts5 = flag
+        return 'fts5' if flag else 'like'
+    return 'like'
+
+
+def _match_sql(object_type, words, columns, ranked=True):
+    """
+    استعلام المطابقة - (sql, params) selecting `columns` of matching entries, best first if ranked
+    Every term must match as a prefix (so 'PRM-20' finds PRM-2026-001).
+    """
+    backend = _backend()
+    if backend == 'postgresql':
+        tsquery = ' & '.join(f'{word}:*' for word in words)
+        sql = (
+            f"SELECT {columns} FROM core_search_entry e "
+            "WHERE e.object_type = %s AND to_tsvector('simple', e.document) @@ to_tsquery('simple', %s)"
+        )
+        params = [object_type, tsquery]
+        if ranked:
+            sql += " ORDER BY ts_rank(to_tsvector('simple', e.document), to_tsquery('simple', %s)) DESC, e.object_id DESC"
+            params.append(tsquery)
+        return sql, params
+
+    if backend == 'fts5':
+        sql = (
+            f"SELECT {columns} FROM {FTS_TABLE} f JOIN core_search_entry e ON e.id = f.rowid "
+            f"WHERE {FTS_TABLE} MATCH %s AND e.object_type = %s"
+        )
+        if ranked:
+            sql += f" ORDER BY bm25({FTS_TABLE}), e.object_id DESC"
+        return sql, [' AND '.join(f'"{word}"*' for word in words), object_type]
+
+    where = ' AND '.join(['e.document LIKE %s'] * len(words))
+    sql = f"SELECT {columns} FROM core_search_entry e WHERE e.object_type = %s AND {where}"
+    if ranked:
+        sql += " ORDER BY e.object_id DESC"
+    return sql, [object_type] + [f'%{word}%' for word in words]
+
+
+def filter_queryset(queryset, object_type, query):
+    """
+    تطبيق البحث على قائمة - Restrict a list view's queryset to records matching `query`
+    The view keeps its own ordering and pagination.
+
+    Example:
+        >>> permits = filter_queryset(permits, 'permit', request.GET.get('search'))
+    """
+    words = terms(query)
+    if not words:
+        return queryset
+    sql, params = _match_sql(object_type, words, 'e.object_id', ranked=False)
+    return queryset.filter(pk__in=RawSQL(sql, params))
+
+
+def _url(source, object_id):
+    try:
+        return reverse(source.url_name, kwargs={'pk': object_id})
+    except NoReverseMatch:
+        return '#'
+
+
+def search(query, object_types=None, limit=RESULTS_PER_TYPE):
+    """
+    البحث العام - Ranked hits across modules, one query per module
+
+    Returns:
+        dict: {object_type: [SearchHit, ...]} (الوحدات بدون نتائج غير مدرجة)
+    """
+    words = terms(query)
+    if not words:
+        return {}
+
+    results = {}
+    with connection.cursor() as cursor:
+        for source in SOURCES:
+            if object_types is not None and source.object_type not in object_types:
+                continue
+            sql, params = _match_sql(source.object_type, words, 'e.object_id, e.title')
+            cursor.execute(f'{sql} LIMIT %s', params + [limit])
+            hits = [
+                SearchHit(source.object_type, object_id, title, _url(source, object_id))
+                for object_id, title in cursor.fetchall()
+            ]
+            if hits:
+                results[source.object_type] = hits
+    return results
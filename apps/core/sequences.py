@@ -0,0 +1,145 @@
+"""
+Document Number Sequences - تسلسلات ترقيم المستندات
+Concurrency-safe numbering backed by one NumberSequence row per prefix
+"""
+import threading
+from collections import deque
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import NumberSequence
+
+# البادئات التي تم التأكد من وجود سجلها - Prefixes known to have a row
+_known_prefixes = set()
+
+# كتل الأرقام المحجوزة لهذه العملية - Number blocks reserved by this worker
+_blocks = {}
+_lock = threading.Lock()
+
+
+def format_code(prefix, number, length=3):
+    """
+    تنسيق الرمز - Format a document code
+
+    Example:
+        >>> format_code('PRM', 42)
+        'PRM-042'
+    """
+    return f"{prefix}-{str(number).zfill(length)}"
+
+
+def _current_max(model_class, field_name, prefix):
+    """
+    أكبر رقم مستخدم حالياً - Highest number already stored in the table
+    Parsed numerically so that 'PRM-1000' sorts after 'PRM-999'.
+    Only runs once per prefix, when the sequence row is first created.
+    """
+    highest = 0
+    values = model_class.objects.filter(
+        **{f'{field_name}__startswith': f'{prefix}-'}
+    ).values_list(field_name, flat=True)
+
+    for value in values.iterator(chunk_size=2000):
+        try:
+            highest = max(highest, int(value.rsplit('-', 1)[-1]))
+        except (ValueError, IndexError):
+            continue
+    return highest
+
+
+def _ensure_sequence(prefix, model_class=None, field_name=None):
+    """إنشاء سجل التسلسل عند أول استخدام - Create the sequence row on first use"""
+    if prefix in _known_prefixes:
+        return
+
+    if not NumberSequence.objects.filter(prefix=prefix).exists():
+        start = _current_max(model_class, field_name, prefix) if model_class else 0
+        try:
+            with transaction.atomic():
+                NumberSequence.objects.create(prefix=prefix, last_value=start)
+        except IntegrityError:
+            # Another worker created it first
+            pass
+
+    _known_prefixes.add(prefix)
+
+
+def reserve_block(prefix, count, model_class=None, field_name=None):
+    """
+    حجز كتلة أرقام - Atomically reserve `count` consecutive numbers
+
+    The UPDATE takes the row lock before the value is read back, so concurrent
+    callers are serialized on the sequence row on every backend. Inside an
+    outer transaction the reservation rolls back with it (no gaps).
+
+    Args:
+        prefix: البادئة (e.g. 'INV')
+        count: عدد الأرقام المطلوبة
+        model_class / field_name: used to seed the sequence from existing data
+
+    Returns:
+        range: الأرقام المحجوزة
+    """
+    _ensure_sequence(prefix, model_class, field_name)
+
+    with transaction.atomic():
+        updated = NumberSequence.objects.filter(prefix=prefix).update(
+            last_value=F('last_value') + count,
+            updated_at=timezone.now()
+        )
+        if not updated:
+            # Row was removed since we cached it - recreate and retry
+            _known_prefixes.discard(prefix)
+            return reserve_block(prefix, count, model_class, field_name)
+
+        last = NumberSequence.objects.filter(prefix=prefix).values_list(
+            'last_value', flat=True
+        ).get()
+
+    return range(last - count + 1, last + 1)
+
+
+def next_value(prefix, model_class=None, field_name=None):
+    """
+    الرقم التالي - Next number for a prefix
+
+    With NUMBER_SEQUENCE_BLOCK_SIZE > 1 each worker reserves a block of numbers
+    at once and hands them out from memory (fewer round-trips, but numbers left
+    in a block are lost when the worker exits). Block allocation is skipped
+    inside transactions, where a rollback would un-reserve the block.
+    """
+    block_size = getattr(settings, 'NUMBER_SEQUENCE_BLOCK_SIZE', 1)
+    if block_size <= 1 or connection.in_atomic_block:
+        return reserve_block(prefix, 1, model_class, field_name)[0]
+
+    with _lock:
+        block = _blocks.get(prefix)
+        if not block:
+            block = _blocks[prefix] = deque(
+                reserve_block(prefix, block_size, model_class, field_name)
+            )
+        return block.popleft()
+
+
+def next_code(prefix, model_class=None, field_name=None, length=3):
+    """
+    الرمز التالي - Next formatted code
+
+    Example:
+        >>> next_code('PRM', Permit, 'permit_number')
+        'PRM-043'
+    """
+    return format_code(prefix, next_value(prefix, model_class, field_name), length)
+
+
+def reserve_codes(prefix, count, model_class=None, field_name=None, length=3):
+    """
+    حجز مجموعة رموز - Reserve `count` formatted codes for bulk inserts
+    """
+    return [
+        format_code(prefix, number, length)
+        for number in reserve_block(prefix, count, model_class, field_name)
+    ]
@@ -0,0 +1,145 @@
+"""
+Signals for Core App
+إشارات تطبيق Core
+"""
+from collections import Counter
+from types import SimpleNamespace
+
+from django.apps import apps
+from django.db.models.signals import post_delete, post_init, post_save, pre_save
+
+from . import activity, counters, search
+from .background import enqueue
+from .tasks import reindex_related_task
+
+# الحقول المتتبعة لكل نموذج - Fields whose loaded value is remembered per model
+TRACKED_FIELDS = {}
+
+
+def _build_tracked_fields():
+    for spec in counters.COUNTERS:
+        TRACKED_FIELDS.setdefault(spec.model, set()).update(spec.fields)
+    for source in activity.SOURCES:
+        fields = TRACKED_FIELDS.setdefault(source.model, set())
+        if any(field.name == 'status' for field in apps.get_model(source.model)._meta.fields):
+            fields.add('status')
+
+
+def _label(sender):
+    return sender._meta.label
+
+
+def _state_of(label, instance):
+    return {field: getattr(instance, field) for field in TRACKED_FIELDS[label]}
+
+
+def snapshot_state(sender, instance, **kwargs):
+    """
+    حفظ القيم عند تحميل السجل - Remember tracked values as loaded
+    Skipped when tracked fields are deferred, to avoid a query per instance.
+    """
+    label = _label(sender)
+    if instance.pk is None or TRACKED_FIELDS[label] & instance.get_deferred_fields():
+        instance._tracked_state = None
+    else:
+        instance._tracked_state = _state_of(label, instance)
+
+
+def load_missing_state(sender, instance, **kwargs):
+    """تحميل القيم القديمة إذا لم تتوفر - Fetch the stored row when no snapshot exists"""
+    if instance._state.adding or getattr(instance, '_tracked_state', None) is not None:
+        return
+    label = _label(sender)
+    if not TRACKED_FIELDS[label]:
+        return
+    stored = sender._base_manager.filter(pk=instance.pk).values(*TRACKED_FIELDS[label]).first()
+    instance._tracked_state = stored
+
+
+def _counter_keys(label, state):
+    if state is None:
+        return frozenset()
+    return counters.matching_keys(label, SimpleNamespace(**state))
+
+
+def on_tracked_save(sender, instance, created, **kwargs):
+    """
+    بعد الحفظ - Update dashboard counters and the activity feed
+    """
+    label = _label(sender)
+    old_state = None if created else getattr(instance, '_tracked_state', None)
+    new_state = _state_of(label, instance)
+
+    if label in counters.COUNTED_MODELS:
+        old = _counter_keys(label, old_state)
+        new = counters.matching_keys(label, instance)
+        deltas = Counter({key: 1 for key in new - old})
+        deltas.subtract({key: 1 for key in old - new})
+        counters.apply_deltas(deltas)
+
+    if label in activity.SOURCES_BY_MODEL:
+        if created:
+            activity.record(instance, 'created')
+        elif old_state and 'status' in new_state and old_state.get('status') != new_state['status']:
+            activity.record(instance, 'status_changed', previous_status=old_state.get('status'))
+
+    instance._tracked_state = new_state
+
+
+def on_tracked_delete(sender, instance, **kwargs):
+    """بعد الحذف - Decrement dashboard counters"""
+    label = _label(sender)
+    if label not in counters.COUNTED_MODELS:
+        return
+    state = getattr(instance, '_tracked_state', None)
+    old = _counter_keys(label, state) if state is not None else counters.matching_keys(label, instance)
+    counters.apply_deltas({key: -1 for key in old})
+
+
+def on_searchable_save(sender, instance, raw=False, **kwargs):
+    """تحديث فهرس البحث - Reindex the saved record"""
+    if not raw:
+        search.index_instances([instance])
+
+
+def on_searchable_delete(sender, instance, **kwargs):
+    """حذف من فهرس البحث - Drop the deleted record from the search index"""
+    search.remove_instance(instance)
+
+
+def _enqueue_related(targets):
+    # قد يشمل المستأجر آلاف الفواتير، فتتم الفهرسة في الخلفية بعد الحفظ
+    for source, lookup, key in targets:
+        enqueue(reindex_related_task, source, lookup, key)
+
+
+def on_related_save(sender, instance, raw=False, update_fields=None, **kwargs):
+    """تحديث السجلات المرتبطة في الفهرس - e.g. invoices after a tenant is renamed"""
+    if not raw:
+        _enqueue_related(search.related_targets(instance, update_fields))
+
+
+def on_related_delete(sender, instance, **kwargs):
+    """حذف سجل مرتبط - e.g. invoices lose a deleted tenant profile's company name"""
+    _enqueue_related(search.related_targets(instance))
+
+
+def connect_signals():
+    """ربط الإشارات - Connect tracking signals for counted, logged and searchable models"""
+    _build_tracked_fields()
+    for model_label in TRACKED_FIELDS:
+        uid = f'core_tracking:{model_label}'
+        post_init.connect(snapshot_state, sender=model_label, dispatch_uid=uid)
+        pre_save.connect(load_missing_state, sender=model_label, dispatch_uid=uid)
+        post_save.connect(on_tracked_save, sender=model_label, dispatch_uid=uid)
+        post_delete.connect(on_tracked_delete, sender=model_label, dispatch_uid=uid)
+
+    for model_label in search.SOURCES_BY_MODEL:
+        uid = f'core_search:{model_label}'
+        post_save.connect(on_searchable_save, sender=model_label, dispatch_uid=uid)
+        post_delete.connect(on_searchable_delete, sender=model_label, dispatch_uid=uid)
+
+    for model_label in {related.model for related in search.RELATED_SOURCES}:
+        uid = f'core_search_related:{model_label}'
+        post_save.connect(on_related_save, sender=model_label, dispatch_uid=uid)
+        post_delete.connect(on_related_delete, sender=model_label, dispatch_uid=uid)
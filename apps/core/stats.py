@@ -0,0 +1,59 @@
+"""
+Statistics Engine - محرك الإحصائيات
+Compute all stat-card numbers for a model in a single aggregate query
+"""
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db.models import Count, Sum
+
+# مدة التخزين الافتراضية للإحصائيات - Default stats cache TTL (seconds)
+STATS_CACHE_TIMEOUT = 30
+
+
+def aggregate_stats(queryset, counts=None, sums=None, cache_key=None, timeout=STATS_CACHE_TIMEOUT):
+    """
+    حساب الإحصائيات في استعلام واحد - Compute counts and sums in one query
+
+    Args:
+        queryset: QuerySet الأساسي
+        counts: dict اسم -> Q أو None (None = العدد الكلي)
+        sums: dict اسم -> (اسم الحقل, Q أو None)
+        cache_key: مفتاح الكاش (اختياري) لتخزين النتيجة لفترة قصيرة
+        timeout: مدة التخزين بالثواني
+
+    Returns:
+        dict: القيم المحسوبة (المجاميع الفارغة تُرجع 0)
+
+    Example:
+        >>> aggregate_stats(
+        ...     Invoice.objects.all(),
+        ...     counts={'total_invoices': None, 'paid_invoices': Q(status='paid')},
+        ...     sums={'total_amount': ('total_amount', None)},
+        ... )
+        {'total_invoices': 12, 'paid_invoices': 7, 'total_amount': Decimal('5400.00')}
+    """
+    if cache_key:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    # Aliases are prefixed so stat names may shadow model fields (e.g. total_amount)
+    aggregates = {}
+    for name, condition in (counts or {}).items():
+        aggregates[f'stat__{name}'] = Count('pk', filter=condition)
+    for name, (field, condition) in (sums or {}).items():
+        aggregates[f'stat__{name}'] = Sum(field, filter=condition)
+
+    result = queryset.order_by().aggregate(**aggregates)
+    stats = {alias[len('stat__'):]: value for alias, value in result.items()}
+
+    for name in (sums or {}):
+        if stats[name] is None:
+            stats[name] = Decimal('0.00')
+
+    if cache_key:
+        cache.set(cache_key, stats, timeout)
+
+    return stats
+
@@ -0,0 +1,19 @@
+"""
+Celery Tasks for Core App
+المهام الخلفية لتطبيق Core (تعمل أيضاً في خيوط داخل العملية عند تعطيل Celery)
+"""
+from celery import shared_task
+
+
+@shared_task
+def run_export_job_task(job_id):
+    """تنفيذ مهمة تصدير - Build an ExportJob's file"""
+    from .exports import run_export_job
+    run_export_job(job_id)
+
+
+@shared_task
+def reindex_related_task(source, lookup, key):
+    """فهرسة السجلات المرتبطة - Reindex entries after a related row (e.g. a tenant) changes"""
+    from .search import reindex_related
+    reindex_related(source, lookup, key)
@@ -5,12 +5,21 @@ app_name = 'core'
 
 urlpatterns = [
     path('', views.dashboard, name='dashboard'),
+    path('activity/', views.activity_stream, name='activity_stream'),
+    path('search/', views.global_search, name='global_search'),
+    path('lookup/', views.number_lookup, name='number_lookup'),
 
     # Notifications
     path('notifications/', views.notification_list, name='notification_list'),
     path('notifications/<int:pk>/read/', views.notification_mark_read, name='notification_mark_read'),
     path('notifications/mark-all-read/', views.notification_mark_all_read, name='notification_mark_all_read'),
     path('notifications/unread/', views.notification_get_unread, name='notification_get_unread'),
+    path('notifications/stream/', views.notification_stream, name='notification_stream'),
+
+    # Export Jobs
+    path('exports/', views.export_job_list, name='export_job_list'),
+    path('exports/<int:pk>/status/', views.export_job_status, name='export_job_status'),
+    path('exports/<int:pk>/download/', views.export_job_download, name='export_job_download'),
 
     # Switch User (Development/Testing)
     path('switch-user/<int:user_id>/', views.switch_user, name='switch_user'),
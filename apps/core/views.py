@@ -3,19 +3,31 @@ from django.contrib.auth.decorators import login_required
 from django.contrib.auth import get_user_model, login
 from django.db.models import Count, Q
 from django.utils import timezone
-from django.http import JsonResponse
+from django.core.handlers.asgi import ASGIRequest
+from django.http import FileResponse, HttpResponse, JsonResponse, StreamingHttpResponse
+from django.urls import reverse
 from django.contrib import messages
 from django.utils.translation import gettext_lazy as _
 from datetime import timedelta
-
-from apps.permits.models import Permit
-from apps.maintenance.models import Ticket
-from apps.complaints.models import Case
-from apps.marketing.models import Event
-from .models import Notification
+import asyncio
+import json
+
+from .models import ExportJob, Notification
+from .decorators import staff_required
+from .counters import get_dashboard_counters
+from .activity import activity_page
+from .lookup import find_exact, lookup
+from .search import TYPE_LABELS, search
+from .notifications import channel_for, get_unread_count, mark_read, serialize
+from .pubsub import subscribe
 
 User = get_user_model()
 
+# إعدادات البث - SSE timing (seconds / milliseconds)
+SSE_HEARTBEAT = 25
+SSE_RETRY_MS = 5000
+SSE_REPLAY_LIMIT = 20
+
 
 @login_required
 def dashboard(request):
@@ -27,85 +39,102 @@ def dashboard(request):
     if hasattr(request.user, 'tenant_profile'):
         return redirect('accounts:tenant_dashboard')
 
-    # Get statistics for staff/admin
-    permits_count = Permit.objects.count()
-    permits_pending = Permit.objects.filter(status='pending').count()
-
-    tickets_count = Ticket.objects.count()
-    tickets_urgent = Ticket.objects.filter(priority='urgent', status__in=['open', 'in_progress']).count()
-
-    cases_count = Case.objects.count()
-    cases_review = Case.objects.filter(status='in_review').count()
-
-    events_count = Event.objects.count()
-    events_active = Event.objects.filter(status='active').count()
-
-    # Get recent activities
-    recent_permits = Permit.objects.select_related('tenant').order_by('-created_at')[:5]
-    recent_tickets = Ticket.objects.select_related('created_by').order_by('-created_at')[:5]
-    recent_cases = Case.objects.select_related('created_by').order_by('-created_at')[:5]
-
-    # Combine and sort all activities by date
-    activities = []
-    
-    for permit in recent_permits:
-        activities.append({
-            'type': 'permit',
-            'type_display': _('تصريح'),
-            'title': permit.permit_number,
-            'status': permit.status,
-            'status_display': permit.get_status_display(),
-            'date': permit.created_at,
-            'url': f'/permits/detail/{permit.pk}/',
-        })
-    
-    for ticket in recent_tickets:
-        activities.append({
-            'type': 'ticket',
-            'type_display': _('صيانة'),
-            'title': ticket.ticket_number,
-            'status': ticket.status,
-            'status_display': ticket.get_status_display(),
-            'date': ticket.created_at,
-            'url': f'/maintenance/ticket/{ticket.pk}/',
-        })
-    
-    for case in recent_cases:
-        activities.append({
-            'type': 'case',
-            'type_display': _('شكوى'),
-            'title': case.case_number,
-            'status': case.status,
-            'status_display': case.get_status_display(),
-            'date': case.created_at,
-            'url': f'/complaints/case/{case.pk}/',
-        })
-    
-    # Sort by date (newest first) and limit to 10
-    activities = sorted(activities, key=lambda x: x['date'], reverse=True)[:10]
+    # Get statistics for staff/admin (materialized counters - no table scans)
+    counters = get_dashboard_counters()
+
+    # Get recent activities (one indexed query on the activity feed)
+    activities = activity_page(per_page=10).object_list
 
     context = {
-        'permits_count': permits_count,
-        'permits_pending': permits_pending,
-        'tickets_count': tickets_count,
-        'tickets_urgent': tickets_urgent,
-        'cases_count': cases_count,
-        'cases_review': cases_review,
-        'events_count': events_count,
-        'events_active': events_active,
+        **counters,
         'recent_activities': activities,
     }
 
     return render(request, 'dashboard/dashboard.html', context)
 
 
+@login_required
+@staff_required
+def activity_stream(request):
+    """
+    سجل النشاطات - Activity Stream
+    Keyset-paginated feed of creations and status changes across modules
+    """
+    actor = request.user if request.GET.get('mine') else None
+    page_obj = activity_page(
+        actor=actor,
+        after=request.GET.get('after'),
+        before=request.GET.get('before'),
+    )
+
+    context = {
+        'activities': page_obj,
+        'page_obj': page_obj,
+        'mine': bool(actor),
+    }
+
+    return render(request, 'core/activity_stream.html', context)
+
+
+@login_required
+@staff_required
+def global_search(request):
+    """
+    البحث العام - Global Search
+    Ranked matches across permits, tickets, cases and invoices (JSON for AJAX)
+    An exact document number (e.g. PRM-042) redirects straight to its page.
+    """
+    query = request.GET.get('q', '').strip()
+    is_ajax = request.headers.get('X-Requested-With') == 'XMLHttpRequest'
+
+    if not is_ajax:
+        exact = find_exact(query)
+        if exact is not None:
+            return redirect(exact.url)
+
+    results = search(query)
+
+    if is_ajax:
+        return JsonResponse({
+            'query': query,
+            'results': {
+                object_type: [hit._asdict() for hit in hits]
+                for object_type, hits in results.items()
+            },
+        })
+
+    context = {
+        'query': query,
+        'groups': [(TYPE_LABELS[object_type], hits) for object_type, hits in results.items()],
+    }
+
+    return render(request, 'core/search_results.html', context)
+
+
+@login_required
+@staff_required
+def number_lookup(request):
+    """
+    البحث برقم المستند - Document number lookup (JSON)
+    Exact match first, otherwise numbers starting with the query (index range scan).
+    """
+    query = request.GET.get('q', '').strip()
+    exact, hits = lookup(query)
+
+    return JsonResponse({
+        'query': query,
+        'exact': exact._asdict() if exact else None,
+        'results': [hit._asdict() for hit in hits],
+    })
+
+
 @login_required
 def notification_list(request):
     """
     قائمة الإشعارات - Notifications List
     """
     notifications = Notification.objects.filter(user=request.user)[:50]
-    unread_count = Notification.get_unread_count(request.user)
+    unread_count = get_unread_count(request.user)
 
     context = {
         'notifications': notifications,
@@ -121,8 +150,7 @@ def notification_mark_read(request, pk):
     تعليم الإشعار كمقروء - Mark notification as read
     """
     notification = get_object_or_404(Notification, pk=pk, user=request.user)
-    notification.is_read = True
-    notification.save()
+    mark_read(request.user, [notification.pk])
 
     if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
         return JsonResponse({'success': True})
@@ -137,7 +165,7 @@ def notification_mark_all_read(request):
     """
     تعليم جميع الإشعارات كمقروءة - Mark all notifications as read
     """
-    Notification.mark_all_as_read(request.user)
+    mark_read(request.user)
 
     if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
         return JsonResponse({'success': True})
@@ -157,23 +185,120 @@ def notification_get_unread(request):
     ).order_by('-created_at')[:10]
 
     data = {
-        'count': notifications.count(),
-        'notifications': [
-            {
-                'id': n.id,
-                'title': n.title,
-                'message': n.message,
-                'type': n.notification_type,
-                'link': n.link,
-                'created_at': n.created_at.strftime('%Y-%m-%d %H:%M'),
-            }
-            for n in notifications
-        ]
+        'count': get_unread_count(request.user),
+        'notifications': [serialize(n) for n in notifications]
     }
 
     return JsonResponse(data)
 
 
+def _sse(event, data, event_id=None):
+    """تنسيق رسالة SSE - Format one server-sent event"""
+    lines = [f'id: {event_id}'] if event_id else []
+    lines += [f'event: {event}', f'data: {json.dumps(data)}']
+    return '\n'.join(lines) + '\n\n'
+
+
+async def notification_stream(request):
+    """
+    بث الإشعارات المباشر - Live notifications (Server-Sent Events)
+    Long-lived ASGI response fed by apps.core.pubsub; idle tabs cost no queries.
+    On reconnect the browser sends Last-Event-ID and missed rows are replayed once.
+    """
+    if not isinstance(request, ASGIRequest):
+        # تحت WSGI سيحجز كل تبويب عاملاً كاملاً - 204 tells EventSource not to reconnect
+        return HttpResponse(status=204)
+
+    user = await request.auser()
+    if not user.is_authenticated:
+        return HttpResponse(status=401)
+
+    try:
+        last_event_id = int(request.headers.get('Last-Event-ID', ''))
+    except ValueError:
+        last_event_id = None
+
+    async def events():
+        messages_iter = subscribe(channel_for(user.pk))
+        next_message = asyncio.ensure_future(messages_iter.__anext__())
+        try:
+            yield f'retry: {SSE_RETRY_MS}\n\n'
+
+            if last_event_id is not None:
+                missed = Notification.objects.filter(
+                    user_id=user.pk, pk__gt=last_event_id
+                ).order_by('pk')[:SSE_REPLAY_LIMIT]
+                async for notification in missed:
+                    yield _sse('notification', serialize(notification), notification.pk)
+
+            while True:
+                done, _pending = await asyncio.wait({next_message}, timeout=SSE_HEARTBEAT)
+                if not done:
+                    # تعليق للإبقاء على الاتصال - keep proxies from closing the connection
+                    yield ': keep-alive\n\n'
+                    continue
+
+                message = next_message.result()
+                next_message = asyncio.ensure_future(messages_iter.__anext__())
+                yield _sse(message['event'], message['data'], message['data'].get('id'))
+        finally:
+            next_message.cancel()
+            try:
+                await next_message
+            except (asyncio.CancelledError, StopAsyncIteration):
+                pass
+            await messages_iter.aclose()
+
+    response = StreamingHttpResponse(events(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+@login_required
+def export_job_list(request):
+    """
+    مهام التصدير - Export Jobs (current user's)
+    """
+    jobs = ExportJob.objects.filter(user=request.user)[:50]
+
+    context = {
+        'jobs': jobs,
+        'has_running': any(job.status in ('pending', 'running') for job in jobs),
+    }
+
+    return render(request, 'core/export_job_list.html', context)
+
+
+@login_required
+def export_job_status(request, pk):
+    """
+    حالة مهمة التصدير - Export job progress (AJAX)
+    """
+    job = get_object_or_404(ExportJob, pk=pk, user=request.user)
+
+    return JsonResponse({
+        'id': job.pk,
+        'status': job.status,
+        'status_display': str(job.get_status_display()),
+        'total_rows': job.total_rows,
+        'processed_rows': job.processed_rows,
+        'progress': job.progress,
+        'download_url': reverse('core:export_job_download', args=[job.pk]) if job.status == 'completed' else None,
+        'error': job.error,
+    })
+
+
+@login_required
+def export_job_download(request, pk):
+    """
+    تحميل ملف التصدير - Download a finished export
+    """
+    job = get_object_or_404(ExportJob, pk=pk, user=request.user, status='completed')
+
+    return FileResponse(job.file.open('rb'), as_attachment=True, filename=job.file.name.rsplit('/', 1)[-1])
+
+
 @login_required
 def switch_user(request, user_id):
     """
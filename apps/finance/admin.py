@@ -3,6 +3,7 @@ from django.utils.translation import gettext_lazy as _
 from django.utils.html import format_html
 from django.urls import reverse
 from .models import Invoice, InvoiceItem, Payment, InvoiceSettings
+from .totals import batch_totals
 
 
 class InvoiceItemInline(admin.TabularInline):
@@ -51,14 +52,19 @@ class InvoiceAdmin(admin.ModelAdmin):
             'fields': ('notes',)
         }),
         (_('التتبع'), {
-            'fields': ('created_by', 'created_at', 'updated_at'),
+            'fields': ('created_by', 'created_at', 'updated_at', 'reminder_level', 'last_reminder_at'),
             'classes': ('collapse',)
         }),
     )
 
-    readonly_fields = ('tax_amount', 'total_amount', 'created_at', 'updated_at')
+    readonly_fields = ('tax_amount', 'total_amount', 'created_at', 'updated_at', 'reminder_level', 'last_reminder_at')
     inlines = [InvoiceItemInline, PaymentInline]
 
+    def save_related(self, request, form, formsets, change):
+        """إعادة حساب المجاميع مرة واحدة بعد حفظ البنود - one recompute for all inline items"""
+        with batch_totals(form.instance):
+            super().save_related(request, form, formsets, change)
+
     def balance_due(self, obj):
         return f"${obj.balance_due:,.2f}"
     balance_due.short_description = _('المبلغ المتبقي')
@@ -0,0 +1,163 @@
+"""
+Accounts Receivable Aging - أعمار الذمم المدينة
+Outstanding balances per tenant bucketed by days past due, computed in the
+database: the buckets are conditional SUMs of the invoices' balances grouped
+by tenant - one query whatever the number of invoices. Today's report reads
+the paid_amount kept up to date by payment posting; earlier report dates
+re-sum each invoice's payments up to that date. Reports are cached per date
+in a versioned namespace bumped by every invoice or payment write.
+"""
+from collections import namedtuple
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from apps.core.cache import bump_version, get_version
+
+from .models import Invoice, Payment
+from .reconcile import AMOUNT_FIELD
+from .totals import TWO_PLACES
+
+# key: اسم العمود / label: العنوان / first, last: أيام التأخير (None = بلا حد)
+AgingBucket = namedtuple('AgingBucket', ['key', 'label', 'first', 'last'])
+
+BUCKETS = [
+    AgingBucket('current', _('غير مستحقة'), None, 0),
+    AgingBucket('days_1_30', _('1-30 يوماً'), 1, 30),
+    AgingBucket('days_31_60', _('31-60 يوماً'), 31, 60),
+    AgingBucket('days_61_90', _('61-90 يوماً'), 61, 90),
+    AgingBucket('days_over_90', _('أكثر من 90 يوماً'), 91, None),
+]
+
+# مدة تخزين التقرير - one report per date, kept for a day
+AGING_CACHE_TIMEOUT = 60 * 60 * 24
+
+AGING_CACHE_NAMESPACE = 'finance.aging'
+
+
+def _bucket_filter(bucket, as_of):
+    """أيام التأخير كشرط على due_date - Day range as a due_date range (no date arithmetic in SQL)"""
+    condition = Q()
+    if bucket.first is not None:
+        condition &= Q(due_date__lte=as_of - timedelta(days=bucket.first))
+    if bucket.last is not None:
+        condition &= Q(due_date__gte=as_of - timedelta(days=bucket.last))
+    return condition
+
+
+def _paid_as_of(as_of):
+    """المدفوع حتى تاريخ التقرير - Correlated SUM of the invoice's payments up to as_of"""
+    payments = (
+        Payment.objects.filter(invoice=OuterRef('pk'), payment_date__lte=as_of)
+        .order_by().values('invoice').annotate(total=Sum('amount')).values('total')
+    )
+    return Coalesce(Subquery(payments, output_field=AMOUNT_FIELD), Value(Decimal('0.00')), output_field=AMOUNT_FIELD)
+
+
+def open_balances(as_of):
+    """
+    الفواتير ذات الرصيد المستحق - Invoices issued by as_of with a positive balance on that date
+    Annotated with balance.
+    """
+    if as_of >= timezone.localdate():
+        paid = F('paid_amount')
+    else:
+        paid = _paid_as_of(as_of)
+    return (
+        Invoice.objects.filter(issue_date__lte=as_of)
+        .exclude(status__in=('draft', 'cancelled'))
+        .order_by()
+        .annotate(balance=F('total_amount') - paid)
+        .filter(balance__gt=0)
+    )
+
+
+def compute_aging(as_of):
+    """
+    حساب أعمار الذمم - One grouped, conditional aggregation over invoices and payments
+
+    Returns:
+        dict: {'as_of', 'tenants': [...], 'totals': {...}}
+              كل صف مستأجر: tenant_id, name, invoices, total, amounts (بترتيب BUCKETS)
+    """
+    aggregates = {
+        f'aging__{bucket.key}': Sum('balance', filter=_bucket_filter(bucket, as_of))
+        for bucket in BUCKETS
+    }
+    rows = (
+        open_balances(as_of)
+        .values('tenant_id', 'tenant__username', 'tenant__first_name', 'tenant__last_name')
+        .annotate(invoices=Count('pk'), total=Sum('balance'), **aggregates)
+        .order_by('-total', 'tenant_id')
+    )
+
+    zero = Decimal('0.00')
+    tenants = []
+    totals = {'invoices': 0, 'total': zero, 'amounts': [zero] * len(BUCKETS)}
+    for row in rows:
+        amounts = [(row[f'aging__{bucket.key}'] or zero).quantize(TWO_PLACES) for bucket in BUCKETS]
+        name = f"{row['tenant__first_name']} {row['tenant__last_name']}".strip()
+        total = row['total'].quantize(TWO_PLACES)
+        tenants.append({
+            'tenant_id': row['tenant_id'],
+            'name': name or row['tenant__username'],
+            'invoices': row['invoices'],
+            'total': total,
+            'amounts': amounts,
+        })
+        totals['invoices'] += row['invoices']
+        totals['total'] += total
+        totals['amounts'] = [total + amount for total, amount in zip(totals['amounts'], amounts)]
+
+    return {
+        'as_of': as_of,
+        'tenants': tenants,
+        'totals': totals,
+    }
+
+
+def aging_report(as_of=None, refresh=False):
+    """
+    تقرير أعمار الذمم - compute_aging() cached per report date
+
+    Args:
+        as_of: تاريخ التقرير (الافتراضي اليوم)
+        refresh: إعادة الحساب وتحديث الكاش
+
+    Example:
+        >>> report = aging_report()
+        >>> report['totals']['amounts']
+        [Decimal('1200.00'), Decimal('350.00'), Decimal('0.00'), Decimal('0.00'), Decimal('80.00')]
+    """
+    as_of = as_of or timezone.localdate()
+    cache_key = f'{AGING_CACHE_NAMESPACE}:{get_version(AGING_CACHE_NAMESPACE)}:{as_of.isoformat()}'
+    if not refresh:
+        report = cache.get(cache_key)
+        if report is not None:
+            return report
+
+    report = compute_aging(as_of)
+    cache.set(cache_key, report, AGING_CACHE_TIMEOUT)
+    return report
+
+
+def invalidate_aging():
+    """
+    إبطال تقارير الأعمار المخزنة - Bump the report cache version once the write commits
+    """
+    transaction.on_commit(lambda: bump_version(AGING_CACHE_NAMESPACE))
+
+
+def report_rows(report):
+    """صفوف التصدير - Header plus one row per tenant and a total row"""
+    yield [_('المستأجر'), _('عدد الفواتير')] + [bucket.label for bucket in BUCKETS] + [_('الإجمالي')]
+    for tenant in report['tenants']:
+        yield [tenant['name'], tenant['invoices']] + tenant['amounts'] + [tenant['total']]
+    totals = report['totals']
+    yield [_('الإجمالي'), totals['invoices']] + totals['amounts'] + [totals['total']]
@@ -6,3 +6,6 @@ class FinanceConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.finance'
     verbose_name = _('المالية')
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,189 @@
+"""
+Recurring Rent Billing - فوترة الإيجار الشهري
+One rental invoice per active tenant contract and month, written in batches:
+invoice numbers are reserved as a block, invoices and their items are inserted
+with bulk_create, and the side effects that bulk_create skips (activity feed,
+search index, ledger balances, aging reports, tenant notifications) are
+done per batch.
+Invoice.billing_period is unique per tenant, so a period is never billed twice
+and an interrupted run can simply be started again.
+"""
+import calendar
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, F, OuterRef
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.translation import gettext as _
+
+from apps.accounts.models import TenantProfile
+from apps.core.activity import record_created
+from apps.core.models import Notification
+from apps.core.notifications import send_bulk
+from apps.core.search import reindex
+from apps.core.sequences import reserve_codes
+
+from .aging import invalidate_aging
+from .ledger import invalidate_balances
+from .models import Invoice, InvoiceItem
+from .totals import TWO_PLACES, compute_totals
+
+# عدد العقود في كل معاملة - Contracts billed per transaction
+BILLING_BATCH_SIZE = 1000
+
+# عدد السجلات في كل INSERT - Rows per bulk INSERT
+INSERT_BATCH_SIZE = 500
+
+
+def period_bounds(day=None):
+    """
+    حدود الشهر - (first day, last day) of the month containing `day` (default today)
+    """
+    day = day or timezone.localdate()
+    start = day.replace(day=1)
+    return start, start.replace(day=calendar.monthrange(start.year, start.month)[1])
+
+
+def billable_contracts(period_start, period_end):
+    """
+    العقود المستحقة للفوترة - Active contracts overlapping the period with rent and no invoice yet
+    """
+    billed = Invoice.objects.filter(tenant_id=OuterRef('user_id'), billing_period=period_start)
+    return (
+        TenantProfile.objects.filter(
+            is_active=True,
+            monthly_rent__gt=0,
+            contract_start_date__lte=period_end,
+            contract_end_date__gte=period_start,
+        )
+        .filter(contract_start_date__lte=F('contract_end_date'))
+        .filter(~Exists(billed))
+        .order_by('pk')
+    )
+
+
+def rent_amount(monthly_rent, contract_start, contract_end, period_start, period_end):
+    """
+    مبلغ الإيجار للفترة - Monthly rent, prorated by day when the contract starts or ends mid-month
+
+    Returns:
+        tuple: (المبلغ, الأيام المفوترة, أيام الشهر)
+
+    Example:
+        >>> rent_amount(Decimal('3000.00'), date(2026, 11, 16), date(2027, 11, 15),
+        ...             date(2026, 11, 1), date(2026, 11, 30))
+        (Decimal('1500.00'), 15, 30)
+    """
+    month_days = (period_end - period_start).days + 1
+    days = (min(contract_end, period_end) - max(contract_start, period_start)).days + 1
+    if days >= month_days:
+        return monthly_rent, month_days, month_days
+    return (monthly_rent * days / month_days).quantize(TWO_PLACES), days, month_days
+
+
+def generate_rent_invoices(period=None, user=None, dry_run=False):
+    """
+    إصدار فواتير الإيجار - Bill every billable contract for one month
+
+    Args:
+        period: أي يوم في الشهر المطلوب (الافتراضي الشهر الحالي)
+        user: المستخدم المسجل كمنشئ للفواتير
+        dry_run: حساب العدد والمبلغ فقط بدون إنشاء
+
+    Returns:
+        dict: {'period': date, 'invoices': n, 'total': Decimal}
+    """
+    period_start, period_end = period_bounds(period)
+    contracts = billable_contracts(period_start, period_end).values_list(
+        'pk', 'user_id', 'monthly_rent', 'contract_number', 'unit_number',
+        'contract_start_date', 'contract_end_date',
+    )
+
+    result = {'period': period_start, 'invoices': 0, 'total': Decimal('0.00')}
+    last_pk = 0
+    while True:
+        # التقسيم بالمؤشر على pk - keyset batches (dry runs do not remove billed rows)
+        batch = list(contracts.filter(pk__gt=last_pk)[:BILLING_BATCH_SIZE])
+        if not batch:
+            return result
+        last_pk = batch[-1][0]
+
+        if dry_run:
+            for pk, user_id, rent, number, unit, start, end in batch:
+                subtotal = rent_amount(rent, start, end, period_start, period_end)[0]
+                result['total'] += compute_totals(subtotal, settings.RENT_INVOICE_TAX_RATE, Decimal('0.00'))[1]
+            result['invoices'] += len(batch)
+            continue
+
+        invoices = _bill_batch(batch, period_start, period_end, user)
+        result['invoices'] += len(invoices)
+        result['total'] += sum((invoice.total_amount for invoice in invoices), Decimal('0.00'))
+
+
+def _bill_batch(batch, period_start, period_end, user):
+    """فوترة دفعة عقود في معاملة واحدة - One transaction per batch of contracts"""
+    tax_rate = settings.RENT_INVOICE_TAX_RATE
+    due_date = period_start + timedelta(days=settings.RENT_INVOICE_DUE_DAYS)
+    month = period_start.strftime('%Y-%m')
+    actor_id = user.pk if user is not None else None
+
+    invoices = []
+    items = []
+    for pk, user_id, rent, number, unit, start, end in batch:
+        subtotal, days, month_days = rent_amount(rent, start, end, period_start, period_end)
+        tax_amount, total_amount = compute_totals(subtotal, tax_rate, Decimal('0.00'))
+        invoices.append(Invoice(
+            invoice_type='rental',
+            tenant_id=user_id,
+            billing_period=period_start,
+            issue_date=period_start,
+            due_date=due_date,
+            subtotal=subtotal,
+            tax_rate=tax_rate,
+            tax_amount=tax_amount,
+            total_amount=total_amount,
+            status='pending',
+            notes=_('عقد رقم %(contract)s') % {'contract': number},
+            created_by_id=actor_id,
+        ))
+
+        description = _('إيجار شهر %(month)s - وحدة %(unit)s') % {'month': month, 'unit': unit}
+        if days < month_days:
+            description += ' ' + _('(%(days)s من %(month_days)s يوم)') % {'days': days, 'month_days': month_days}
+        items.append(InvoiceItem(description=description, quantity=Decimal('1.00'), unit_price=subtotal, total=subtotal))
+
+    with transaction.atomic():
+        codes = reserve_codes('INV', len(invoices), Invoice, 'invoice_number')
+        for invoice, code in zip(invoices, codes):
+            invoice.invoice_number = code
+
+        invoices = Invoice.objects.bulk_create(invoices, batch_size=INSERT_BATCH_SIZE)
+        for invoice, item in zip(invoices, items):
+            item.invoice_id = invoice.pk
+        InvoiceItem.objects.bulk_create(items, batch_size=INSERT_BATCH_SIZE)
+
+        record_created(invoices, actor_id=actor_id)
+        reindex(Invoice, [invoice.pk for invoice in invoices])
+        invalidate_balances(invoice.tenant_id for invoice in invoices)
+        invalidate_aging()
+        send_bulk([_notification(invoice, month) for invoice in invoices])
+
+    return invoices
+
+
+def _notification(invoice, month):
+    """إشعار المستأجر بالفاتورة - Tenant notification for a new rent invoice"""
+    return Notification(
+        user_id=invoice.tenant_id,
+        title=_('فاتورة إيجار جديدة'),
+        message=_('تم إصدار فاتورة الإيجار %(number)s لشهر %(month)s بمبلغ %(amount)s USD') % {
+            'number': invoice.invoice_number,
+            'month': month,
+            'amount': f'{invoice.total_amount:,.2f}',
+        },
+        notification_type='invoice',
+        link=reverse('accounts:tenant_invoice_detail', args=[invoice.pk]),
+    )
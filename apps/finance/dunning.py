@@ -0,0 +1,135 @@
+"""
+Invoice Dunning - متابعة الفواتير المتأخرة
+Periodic sweep: unsettled invoices past due_date are flagged overdue with an
+indexed (status, due_date) range query and one UPDATE per batch; tenants then
+get a reminder at each dunning level (settings.INVOICE_DUNNING_DAYS). The level
+reached is stored on the invoice in the same transaction as the notifications,
+so the sweep can run every few minutes without sending anything twice.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.translation import gettext as _
+
+from apps.core.activity import record_status_changes
+from apps.core.models import Notification
+from apps.core.notifications import send_bulk
+
+from .aging import invalidate_aging
+from .models import Invoice
+
+# حالات غير مسددة تصبح متأخرة بعد الاستحقاق - unsettled statuses that turn overdue
+OPEN_STATUSES = ('pending', 'partially_paid')
+
+# عدد الفواتير في كل معاملة - Invoices locked and updated per transaction
+SWEEP_BATCH_SIZE = 500
+
+
+def dunning_days():
+    """مراحل التذكير - Sorted days past due for reminder levels 1..n"""
+    return sorted({days for days in getattr(settings, 'INVOICE_DUNNING_DAYS', ()) if days >= 0})
+
+
+def sweep_overdue_invoices(today=None, now=None):
+    """
+    معالجة الفواتير المتأخرة - Flag overdue invoices and send due reminders
+
+    Args:
+        today: تاريخ احتساب التأخير (للاختبار)
+        now: الوقت الحالي (للاختبار)
+
+    Returns:
+        dict: {'overdue': n, 'reminders': {level: n}, 'notifications': n}
+    """
+    today = today or timezone.localdate()
+    now = now or timezone.now()
+
+    flagged = sum(_flag_overdue(status, today, now) for status in OPEN_STATUSES)
+    if flagged:
+        invalidate_aging()
+
+    reminders = {}
+    days = dunning_days()
+    # الفاتورة المتأخرة كثيراً تقفز إلى أعلى مرحلة مستحقة بتذكير واحد
+    # an invoice found far past due jumps to its highest due level with one reminder
+    for current in range(len(days)):
+        cutoff = today - timedelta(days=days[current])
+        while True:
+            sent = _send_reminders(current, cutoff, days, today, now)
+            for level, count in sent.items():
+                reminders[level] = reminders.get(level, 0) + count
+            if not sent:
+                break
+
+    return {'overdue': flagged, 'reminders': reminders, 'notifications': sum(reminders.values())}
+
+
+def _flag_overdue(status, today, now):
+    """تحويل الفواتير المستحقة إلى متأخرة - One locked batch at a time, walking the index"""
+    flagged = 0
+    while True:
+        with transaction.atomic():
+            rows = list(
+                Invoice.objects.select_for_update(skip_locked=True)
+                .filter(status=status, due_date__lt=today)
+                .order_by('due_date', 'pk')
+                .values_list('pk', 'invoice_number', 'created_by_id')[:SWEEP_BATCH_SIZE]
+            )
+            if not rows:
+                return flagged
+
+            Invoice.objects.filter(pk__in=[row[0] for row in rows]).update(status='overdue', updated_at=now)
+            record_status_changes([
+                (Invoice(pk=pk, invoice_number=number, created_by_id=created_by_id, status='overdue'), status)
+                for pk, number, created_by_id in rows
+            ])
+        flagged += len(rows)
+
+
+def _send_reminders(current, cutoff, days, today, now):
+    """
+    إرسال تذكيرات مرحلة - One batch of overdue invoices at reminder_level=current
+    whose next reminder is due; returns {level: n}
+    """
+    with transaction.atomic():
+        rows = list(
+            Invoice.objects.select_for_update(skip_locked=True)
+            .filter(status='overdue', reminder_level=current, due_date__lte=cutoff)
+            .order_by('due_date', 'pk')
+            .values('pk', 'invoice_number', 'tenant_id', 'due_date', 'total_amount', 'paid_amount')[:SWEEP_BATCH_SIZE]
+        )
+        if not rows:
+            return {}
+
+        levels = {}
+        notifications = []
+        for row in rows:
+            days_overdue = (today - row['due_date']).days
+            level = sum(1 for days_due in days if days_overdue >= days_due)
+            levels.setdefault(level, []).append(row['pk'])
+            notifications.append(_reminder(row, level, days_overdue))
+
+        for level, pks in levels.items():
+            Invoice.objects.filter(pk__in=pks).update(reminder_level=level, last_reminder_at=now)
+        send_bulk(notifications)
+
+    return {level: len(pks) for level, pks in levels.items()}
+
+
+def _reminder(row, level, days_overdue):
+    """إشعار التذكير للمستأجر - Tenant reminder for one invoice"""
+    title = _('تذكير بفاتورة متأخرة') if level == 1 else _('تذكير رقم %(level)s بفاتورة متأخرة') % {'level': level}
+    return Notification(
+        user_id=row['tenant_id'],
+        title=title,
+        message=_('الفاتورة %(number)s متأخرة منذ %(days)s يوماً، المبلغ المستحق %(amount)s USD') % {
+            'number': row['invoice_number'],
+            'days': days_overdue,
+            'amount': f"{max(row['total_amount'] - row['paid_amount'], 0):,.2f}",
+        },
+        notification_type='invoice',
+        link=reverse('accounts:tenant_invoice_detail', args=[row['pk']]),
+    )
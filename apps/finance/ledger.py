@@ -0,0 +1,179 @@
+"""
+Tenant Ledger - كشف حساب المستأجر
+Invoices (debit) and payments (credit) of one tenant interleaved by date with
+a running balance from a SQL window function, read one keyset page per query.
+The closing balance per tenant is cached and dropped on every invoice or
+payment write (signals, payments.apply_payment_deltas, totals.recalculate_totals).
+"""
+from collections import namedtuple
+from datetime import date
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import connection, transaction
+
+from apps.core.pagination import PER_PAGE, KeysetPage, decode_cursor, encode_cursor
+
+from .models import Invoice, Payment
+from .payments import MANUAL_STATUSES
+from .totals import TWO_PLACES
+
+# يُعاد حساب الرصيد من قاعدة البيانات بعد انتهاء المدة - cached balance self-reconciles after this
+BALANCE_CACHE_TIMEOUT = 60 * 60
+
+# kind: 'invoice' (مدين) أو 'payment' (دائن) / entry_id: معرف السجل /
+# invoice_id: الفاتورة / reference: رقم الفاتورة للدفعة
+LedgerEntry = namedtuple('LedgerEntry', [
+    'entry_date', 'kind', 'entry_id', 'number', 'invoice_id', 'reference', 'debit', 'credit', 'balance',
+])
+
+# قيود المستأجر - one row per posted invoice and per payment
+# (the invoice rows sort before payments of the same day: 'invoice' < 'payment')
+ENTRIES_SQL = f"""
+    SELECT inv.issue_date AS entry_date, 'invoice' AS kind, inv.id AS entry_id,
+           inv.invoice_number AS number, inv.id AS invoice_id, '' AS reference,
+           inv.total_amount AS debit, 0 AS credit
+    FROM {Invoice._meta.db_table} inv
+    WHERE inv.tenant_id = %s AND inv.status NOT IN ({', '.join(['%s'] * len(MANUAL_STATUSES))})
+    UNION ALL
+    SELECT pay.payment_date, 'payment', pay.id,
+           pay.payment_number, pay.invoice_id, inv.invoice_number,
+           0, pay.amount
+    FROM {Payment._meta.db_table} pay
+    INNER JOIN {Invoice._meta.db_table} inv ON inv.id = pay.invoice_id
+    WHERE inv.tenant_id = %s
+"""
+
+LEDGER_SQL = f"""
+    SELECT entry_date, kind, entry_id, number, invoice_id, reference, debit, credit, balance
+    FROM (
+        SELECT entries.*, SUM(debit - credit) OVER (
+            ORDER BY entry_date, kind, entry_id ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW
+        ) AS balance
+        FROM ({ENTRIES_SQL}) entries
+    ) ledger
+    {{seek}}
+    ORDER BY entry_date {{direction}}, kind {{direction}}, entry_id {{direction}}
+    LIMIT %s
+"""
+
+BALANCE_SQL = f'SELECT COALESCE(SUM(debit - credit), 0) FROM ({ENTRIES_SQL}) entries'
+
+
+def _entries_params(tenant_id):
+    return [tenant_id, *MANUAL_STATUSES, tenant_id]
+
+
+def _date(value):
+    """SQLite يعيد التواريخ كنص - SQLite returns dates from raw SQL as text"""
+    return value if isinstance(value, date) else date.fromisoformat(str(value)[:10])
+
+
+def _amount(value):
+    return Decimal(str(value or 0)).quantize(TWO_PLACES)
+
+
+def _entry(row):
+    entry_date, kind, entry_id, number, invoice_id, reference, debit, credit, balance = row
+    return LedgerEntry(
+        _date(entry_date), kind, entry_id, number, invoice_id, reference,
+        _amount(debit), _amount(credit), _amount(balance),
+    )
+
+
+def _seek(values, forward):
+    """
+    شرط الصفحة بعد/قبل المؤشر - (entry_date, kind, entry_id) before/after the cursor
+    Newest first, so "after" means earlier entries.
+    """
+    op = '<' if forward else '>'
+    sql = (
+        f'WHERE entry_date {op} %s'
+        f' OR (entry_date = %s AND kind {op} %s)'
+        f' OR (entry_date = %s AND kind = %s AND entry_id {op} %s)'
+    )
+    entry_date, kind, entry_id = values
+    return sql, [entry_date, entry_date, kind, entry_date, kind, entry_id]
+
+
+def ledger_page(tenant_id, after=None, before=None, per_page=PER_PAGE):
+    """
+    صفحة كشف الحساب - One keyset page of the tenant's ledger, newest first
+
+    The running balance is computed over all of the tenant's entries in the
+    same query, so every page shows the balance after each entry.
+
+    Returns:
+        KeysetPage: صفوف LedgerEntry
+    """
+    forward = True
+    values = decode_cursor(after)
+    if values is None:
+        values = decode_cursor(before)
+        forward = values is None
+
+    seek, seek_params = '', []
+    if values is not None:
+        try:
+            entry_date, kind, entry_id = values
+            values = [_date(entry_date).isoformat(), str(kind), int(entry_id)]
+        except (ValueError, TypeError):
+            # مؤشر غير صالح - malformed cursor, first page
+            values = None
+            forward = True
+        else:
+            seek, seek_params = _seek(values, forward)
+
+    sql = LEDGER_SQL.format(seek=seek, direction='DESC' if forward else 'ASC')
+    with connection.cursor() as cursor:
+        cursor.execute(sql, _entries_params(tenant_id) + seek_params + [per_page + 1])
+        rows = [_entry(row) for row in cursor.fetchall()]
+
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    if forward:
+        has_next, has_previous = has_more, values is not None
+    else:
+        rows.reverse()
+        has_next, has_previous = True, has_more
+
+    def cursor_for(entry):
+        return encode_cursor([entry.entry_date, entry.kind, entry.entry_id])
+
+    page = KeysetPage(
+        rows,
+        has_next=has_next,
+        has_previous=has_previous,
+        next_cursor=cursor_for(rows[-1]) if rows and has_next else None,
+        previous_cursor=cursor_for(rows[0]) if rows and has_previous else None,
+    )
+    # لا توجد فلاتر في كشف الحساب - no filters to keep in templates/core/pagination.html links
+    page.querystring = ''
+    return page
+
+
+def _balance_key(tenant_id):
+    return f'finance:tenant_balance:{tenant_id}'
+
+
+def closing_balance(tenant_id):
+    """
+    الرصيد الختامي للمستأجر - Invoiced minus paid, cached until the next write
+    """
+    key = _balance_key(tenant_id)
+    balance = cache.get(key)
+    if balance is None:
+        with connection.cursor() as cursor:
+            cursor.execute(BALANCE_SQL, _entries_params(tenant_id))
+            balance = _amount(cursor.fetchone()[0])
+        cache.set(key, balance, BALANCE_CACHE_TIMEOUT)
+    return balance
+
+
+def invalidate_balances(tenant_ids):
+    """
+    إبطال الأرصدة المخزنة - Drop cached closing balances once the write commits
+    """
+    keys = [_balance_key(tenant_id) for tenant_id in set(tenant_ids) if tenant_id is not None]
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
@@ -0,0 +1,62 @@
+"""
+Management command to flag overdue invoices and send dunning reminders
+يحوّل الفواتير المتجاوزة لتاريخ الاستحقاق إلى متأخرة ويرسل تذكيرات للمستأجرين
+"""
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+from apps.finance.dunning import dunning_days, sweep_overdue_invoices
+
+
+class Command(BaseCommand):
+    help = 'Flag invoices past due_date as overdue and send tenant reminders (INVOICE_DUNNING_DAYS)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help='Keep running as a scheduler')
+        parser.add_argument('--interval', type=int, default=300, help='Seconds between sweeps with --loop')
+        parser.add_argument('--today', help='Reference date for overdue (YYYY-MM-DD)')
+
+    def handle(self, *args, **options):
+        """
+        فحص الفواتير المستحقة وإرسال التذكيرات
+        """
+        self.today = None
+        if options['today']:
+            try:
+                self.today = date.fromisoformat(options['today'])
+            except ValueError as exc:
+                raise CommandError(f'Invalid --today: {options["today"]}') from exc
+
+        if not options['loop']:
+            self.sweep()
+            return
+
+        self.stdout.write(self.style.SUCCESS(f'⏱️  Sweeping every {options["interval"]}s (Ctrl+C to stop)'))
+        try:
+            while True:
+                close_old_connections()
+                self.sweep()
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.SUCCESS('\n👋 Stopped'))
+
+    def sweep(self):
+        self.stdout.write(self.style.SUCCESS('🔍 Checking invoice due dates...'))
+
+        started = time.perf_counter()
+        result = sweep_overdue_invoices(today=self.today)
+        elapsed = time.perf_counter() - started
+
+        days = dunning_days()
+        for level, count in sorted(result['reminders'].items()):
+            self.stdout.write(f'   Level {level} ({days[level - 1]}+ days overdue): {count} reminders')
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'\n✅ Marked {result["overdue"]} invoices overdue\n'
+                f'🔔 Sent {result["notifications"]} reminders ({elapsed:.1f}s)'
+            )
+        )
@@ -0,0 +1,49 @@
+"""
+Management command to bill monthly rent
+يصدر فواتير الإيجار الشهرية لجميع العقود النشطة (مرة واحدة لكل شهر)
+"""
+import time
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.finance.billing import generate_rent_invoices
+
+
+class Command(BaseCommand):
+    help = 'Generate monthly rental invoices for active tenant contracts (idempotent per month)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--period', help='Month to bill (YYYY-MM, default: current month)')
+        parser.add_argument('--user', help='Username recorded as created_by')
+        parser.add_argument('--dry-run', action='store_true', help='Count and total only, write nothing')
+
+    def handle(self, *args, **options):
+        period = None
+        if options['period']:
+            try:
+                period = date.fromisoformat(f'{options["period"]}-01')
+            except ValueError as exc:
+                raise CommandError(f'Invalid --period: {options["period"]}') from exc
+
+        user = None
+        if options['user']:
+            user = get_user_model().objects.filter(username=options['user']).first()
+            if user is None:
+                raise CommandError(f'Unknown user: {options["user"]}')
+
+        mode = 'Checking' if options['dry_run'] else 'Billing'
+        self.stdout.write(self.style.SUCCESS(f'🧾 {mode} rent...'))
+
+        started = time.perf_counter()
+        result = generate_rent_invoices(period, user=user, dry_run=options['dry_run'])
+        elapsed = time.perf_counter() - started
+
+        verb = 'to issue' if options['dry_run'] else 'issued'
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'\n✅ {result["invoices"]} invoices {verb} for {result["period"]:%Y-%m} in {elapsed:.1f}s\n'
+                f'💰 Total: {result["total"]:,.2f}'
+            )
+        )
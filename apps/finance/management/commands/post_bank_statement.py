@@ -0,0 +1,108 @@
+"""
+Management command to post a bank statement of payments
+ترحيل كشف حساب بنكي (xlsx/csv) كدفعات في دفعة واحدة مع تحديث الفواتير
+"""
+import time
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.imports import LOOKUP_BATCH_SIZE, read_rows
+from apps.finance.models import Invoice, Payment
+from apps.finance.payments import post_payments
+
+# أعمدة الكشف - Statement columns (payment_method and reference_number are optional)
+COLUMNS = ('invoice_number', 'amount', 'payment_date', 'payment_method', 'reference_number')
+
+
+def _date(value):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value).strip())
+
+
+class Command(BaseCommand):
+    help = 'Post a bank statement (.xlsx/.csv with columns: ' + ', '.join(COLUMNS) + ')'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='.xlsx or .csv file')
+        parser.add_argument('--method', default='bank_transfer', help='Payment method when the row has none')
+        parser.add_argument('--user', help='Username recorded as created_by')
+        parser.add_argument('--dry-run', action='store_true', help='Validate only, write nothing')
+        parser.add_argument('--max-errors', type=int, default=50, help='Row errors to print')
+
+    def handle(self, *args, **options):
+        user = None
+        if options['user']:
+            user = get_user_model().objects.filter(username=options['user']).first()
+            if user is None:
+                raise CommandError(f'Unknown user: {options["user"]}')
+
+        self.stdout.write(self.style.SUCCESS(f'🏦 Reading {options["path"]}...'))
+        rows = list(read_rows(options['path']))
+        invoices = self._invoices(rows)
+        methods = dict(Payment.PAYMENT_METHOD_CHOICES)
+
+        payments = []
+        errors = []
+        for row_number, row in enumerate(rows, start=2):
+            number = str(row.get('invoice_number') or '').strip()
+            try:
+                amount = Decimal(str(row.get('amount')).strip())
+                payment_date = _date(row.get('payment_date'))
+            except (InvalidOperation, ValueError, TypeError):
+                errors.append((row_number, 'invalid amount or payment_date'))
+                continue
+            method = str(row.get('payment_method') or options['method']).strip()
+
+            if number not in invoices:
+                errors.append((row_number, f'unknown invoice: {number}'))
+            elif amount <= 0:
+                errors.append((row_number, f'amount must be positive: {amount}'))
+            elif method not in methods:
+                errors.append((row_number, f'unknown payment method: {method}'))
+            else:
+                payments.append(Payment(
+                    invoice_id=invoices[number],
+                    amount=amount,
+                    payment_method=method,
+                    payment_date=payment_date,
+                    reference_number=str(row.get('reference_number') or '').strip() or None,
+                ))
+
+        for row_number, message in errors[:options['max_errors']]:
+            self.stdout.write(self.style.WARNING(f'⚠️  Row {row_number}: {message}'))
+        if len(errors) > options['max_errors']:
+            self.stdout.write(self.style.WARNING(f'   ... {len(errors) - options["max_errors"]} more'))
+
+        if options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(f'\n✅ {len(payments)} payments valid, {len(errors)} errors (dry run)'))
+            return
+
+        started = time.perf_counter()
+        created = post_payments(payments, user=user)
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'\n✅ Posted {len(created)} payments to {len({payment.invoice_id for payment in created})} invoices '
+                f'in {elapsed:.1f}s\n'
+                f'💰 Total: {sum((payment.amount for payment in created), Decimal("0.00")):,.2f}\n'
+                f'❌ Errors: {len(errors)}'
+            )
+        )
+
+    def _invoices(self, rows):
+        """أرقام الفواتير -> المعرفات - One IN query per batch of invoice numbers"""
+        numbers = sorted({str(row.get('invoice_number') or '').strip() for row in rows} - {''})
+        invoices = {}
+        for start in range(0, len(numbers), LOOKUP_BATCH_SIZE):
+            invoices.update(
+                Invoice.objects.filter(invoice_number__in=numbers[start:start + LOOKUP_BATCH_SIZE])
+                .values_list('invoice_number', 'pk')
+            )
+        return invoices
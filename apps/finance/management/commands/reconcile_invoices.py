@@ -0,0 +1,44 @@
+"""
+Management command to reconcile invoice paid amounts and statuses
+يطابق المبالغ المدفوعة وحالات الفواتير مع الدفعات (بديل update_invoice_statuses.py)
+"""
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.finance.reconcile import reconcile_invoices
+
+
+class Command(BaseCommand):
+    help = 'Recompute paid_amount and status (paid / partially_paid / pending / overdue) for all invoices'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Print the diff without updating')
+        parser.add_argument('--today', help='Reference date for overdue (YYYY-MM-DD)')
+
+    def handle(self, *args, **options):
+        today = None
+        if options['today']:
+            try:
+                today = date.fromisoformat(options['today'])
+            except ValueError as exc:
+                raise CommandError(f'Invalid --today: {options["today"]}') from exc
+
+        mode = 'Checking' if options['dry_run'] else 'Reconciling'
+        self.stdout.write(self.style.SUCCESS(f'🔄 {mode} invoices...'))
+
+        started = time.perf_counter()
+        diff = reconcile_invoices(today=today, dry_run=options['dry_run'])
+        elapsed = time.perf_counter() - started
+
+        for change in diff:
+            arrow = change.old_status if change.old_status == change.new_status else f'{change.old_status} → {change.new_status}'
+            self.stdout.write(f'   {arrow:<32} {change.count:>8} invoices   paid {change.paid_change:+,.2f}')
+
+        total = sum(change.count for change in diff)
+        verb = 'would change' if options['dry_run'] else 'updated'
+        if total:
+            self.stdout.write(self.style.SUCCESS(f'\n✅ {total} invoices {verb} in {elapsed:.1f}s'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'\n✅ All invoices already consistent ({elapsed:.1f}s)'))
@@ -0,0 +1,33 @@
+# Generated by Django 5.0.14 on 2026-10-18 17:43
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0003_keyset_pagination_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='invoice',
+            name='last_reminder_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='آخر تذكير'),
+        ),
+        migrations.AddField(
+            model_name='invoice',
+            name='reminder_level',
+            field=models.PositiveSmallIntegerField(default=0, verbose_name='مرحلة التذكير'),
+        ),
+        migrations.AddIndex(
+            model_name='invoice',
+            index=models.Index(fields=['status', 'due_date'], name='invoice_status_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='invoice',
+            index=models.Index(fields=['status', 'reminder_level', 'due_date'], name='invoice_dunning_idx'),
+        ),
+    ]
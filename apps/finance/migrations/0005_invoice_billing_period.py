@@ -0,0 +1,24 @@
+# Generated by Django 5.0.14 on 2026-10-18 17:59
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0004_invoice_dunning'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='invoice',
+            name='billing_period',
+            field=models.DateField(blank=True, null=True, verbose_name='فترة الفوترة'),
+        ),
+        migrations.AddConstraint(
+            model_name='invoice',
+            constraint=models.UniqueConstraint(condition=models.Q(('billing_period__isnull', False)), fields=('tenant', 'billing_period'), name='invoice_tenant_period_unique'),
+        ),
+    ]
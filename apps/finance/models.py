@@ -2,12 +2,15 @@
 Finance App Models
 نماذج القسم المالي
 """
-from django.db import models
+from collections import defaultdict
+
+from django.db import models, transaction
 from django.contrib.auth import get_user_model
 from django.utils.translation import gettext_lazy as _
 from django.core.validators import MinValueValidator
 from decimal import Decimal
 from apps.core.utils import generate_code
+from apps.core.cache import load_singleton, invalidate_singleton
 
 User = get_user_model()
 
@@ -133,6 +136,7 @@ class InvoiceSettings(models.Model):
         """Ensure only one instance exists (Singleton pattern)"""
         self.pk = 1
         super().save(*args, **kwargs)
+        invalidate_singleton(InvoiceSettings)
 
     def delete(self, *args, **kwargs):
         """Prevent deletion"""
@@ -140,9 +144,8 @@ class InvoiceSettings(models.Model):
 
     @classmethod
     def load(cls):
-        """Load the singleton instance"""
-        obj, created = cls.objects.get_or_create(pk=1)
-        return obj
+        """Load the singleton instance (cached, invalidated on save)"""
+        return load_singleton(cls)
 
 
 class Invoice(models.Model):
@@ -257,6 +260,25 @@ class Invoice(models.Model):
         verbose_name=_('الحالة')
     )
 
+    # فترة الفوترة - Billing period (أول يوم في الشهر) for recurring rent, see billing.py
+    billing_period = models.DateField(
+        blank=True,
+        null=True,
+        verbose_name=_('فترة الفوترة')
+    )
+
+    # التذكيرات - Dunning (آخر مرحلة تذكير أرسلت للمستأجر، انظر dunning.py)
+    reminder_level = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name=_('مرحلة التذكير')
+    )
+
+    last_reminder_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        verbose_name=_('آخر تذكير')
+    )
+
     # ملاحظات - Notes
     notes = models.TextField(
         blank=True,
@@ -288,22 +310,40 @@ class Invoice(models.Model):
         verbose_name_plural = _('الفواتير')
         db_table = 'finance_invoice'
         ordering = ['-created_at']
+        indexes = [
+            # التقسيم بالمؤشر - keyset pagination of the staff and tenant lists
+            models.Index(fields=['created_at', 'id'], name='invoice_created_id_idx'),
+            models.Index(fields=['tenant', 'created_at', 'id'], name='invoice_tenant_created_idx'),
+            # الفواتير المتأخرة والتذكيرات - overdue sweep and dunning (dunning.py)
+            models.Index(fields=['status', 'due_date'], name='invoice_status_due_idx'),
+            models.Index(fields=['status', 'reminder_level', 'due_date'], name='invoice_dunning_idx'),
+        ]
+        constraints = [
+            # فاتورة إيجار واحدة لكل مستأجر في كل فترة - makes billing idempotent per period
+            models.UniqueConstraint(
+                fields=['tenant', 'billing_period'],
+                condition=models.Q(billing_period__isnull=False),
+                name='invoice_tenant_period_unique',
+            ),
+        ]
 
     def __str__(self):
         return f"{self.invoice_number} - {self.tenant.get_full_name()}"
 
     @property
     def balance_due(self):
-        """المبلغ المتبقي"""
-        return self.total_amount - self.paid_amount
+        """المبلغ المتبقي (الدفع الزائد لا يظهر كرصيد سالب)"""
+        return max(self.total_amount - self.paid_amount, Decimal('0.00'))
 
     def calculate_totals(self):
-        """حساب المجاميع من عناصر الفاتورة - Calculate totals from invoice items"""
-        items = self.items.all()
-        self.subtotal = sum(item.total for item in items)
-        self.tax_amount = (self.subtotal * self.tax_rate) / 100
-        self.total_amount = self.subtotal + self.tax_amount - self.discount_amount
-        self.save()
+        """
+        حساب المجاميع من عناصر الفاتورة - Calculate totals from invoice items
+        One SQL aggregate under a row lock (see totals.py); refreshes this instance.
+        """
+        from .totals import recalculate_totals
+
+        for name, value in recalculate_totals([self.pk]).get(self.pk, {}).items():
+            setattr(self, name, value)
 
     def get_total_paid(self):
         """حساب إجمالي المبالغ المدفوعة - Calculate total paid amount"""
@@ -311,22 +351,6 @@ class Invoice(models.Model):
         total = self.payments.aggregate(total=Sum('amount'))['total']
         return total or Decimal('0.00')
 
-    def update_payment_status(self):
-        """تحديث حالة الدفع بناءً على المبالغ المدفوعة - Update payment status based on paid amounts"""
-        total_paid = self.get_total_paid()
-
-        if total_paid >= self.total_amount:
-            self.status = 'paid'
-            self.paid_amount = self.total_amount
-        elif total_paid > 0:
-            self.status = 'partially_paid'
-            self.paid_amount = total_paid
-        elif self.status not in ['draft', 'cancelled']:
-            self.status = 'pending'
-            self.paid_amount = Decimal('0.00')
-
-        self.save()
-
     def save(self, *args, **kwargs):
         # توليد رقم الفاتورة تلقائياً
         if not self.invoice_number:
@@ -334,8 +358,9 @@ class Invoice(models.Model):
 
         # حساب المبلغ الإجمالي تلقائياً إذا لم يكن هناك عناصر
         if not self.pk:  # فقط عند الإنشاء
-            self.tax_amount = (self.subtotal * self.tax_rate) / 100
-            self.total_amount = self.subtotal + self.tax_amount - self.discount_amount
+            from .totals import compute_totals
+
+            self.tax_amount, self.total_amount = compute_totals(self.subtotal, self.tax_rate, self.discount_amount)
 
         super().save(*args, **kwargs)
 
@@ -471,31 +496,37 @@ class Payment(models.Model):
     )
 
     def save(self, *args, **kwargs):
-        """Override save to auto-generate payment_number and update invoice status"""
+        """
+        Override save to auto-generate payment_number and post the amount to the invoice
+        Only the difference is applied (see payments.apply_payment_deltas).
+        """
+        from .payments import apply_payment_deltas
+
         if not self.payment_number:
             self.payment_number = generate_code(Payment, 'payment_number', 'PAY', 3)
-        super().save(*args, **kwargs)
 
-        # تحديث حالة الفاتورة بعد حفظ الدفعة
-        # Update invoice status after saving payment
-        if self.invoice:
-            self.invoice.update_payment_status()
-
-    def delete(self, *args, **kwargs):
-        """Override delete to update invoice status after deletion"""
-        invoice = self.invoice
-        super().delete(*args, **kwargs)
+        with transaction.atomic():
+            previous = None
+            if not self._state.adding:
+                previous = Payment.objects.filter(pk=self.pk).values_list('invoice_id', 'amount').first()
+            super().save(*args, **kwargs)
 
-        # تحديث حالة الفاتورة بعد حذف الدفعة
-        # Update invoice status after deleting payment
-        if invoice:
-            invoice.update_payment_status()
+            # تحديث المدفوع في الفاتورة بالفرق فقط - move paid_amount by the difference only
+            deltas = defaultdict(Decimal)
+            deltas[self.invoice_id] += self.amount
+            if previous is not None:
+                deltas[previous[0]] -= previous[1]
+            apply_payment_deltas(deltas)
 
     class Meta:
         verbose_name = _('دفعة')
         verbose_name_plural = _('الدفعات')
         db_table = 'finance_payment'
         ordering = ['-payment_date']
+        indexes = [
+            # التقسيم بالمؤشر حسب تاريخ الدفع - keyset pagination in payment_date order
+            models.Index(fields=['payment_date', 'id'], name='payment_date_id_idx'),
+        ]
 
     def __str__(self):
         return f"{self.payment_number} - {self.amount} USD"
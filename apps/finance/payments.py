@@ -0,0 +1,141 @@
+"""
+Payment Posting - ترحيل الدفعات
+Payments move Invoice.paid_amount by a delta (F() expression) under a row
+lock instead of re-summing every payment and re-saving the whole invoice.
+A bank statement of thousands of payments is posted in one batch: one bulk
+INSERT and one status recompute per affected invoice.
+"""
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from apps.core.activity import record_created, record_status_changes
+from apps.core.sequences import reserve_codes
+
+from .models import Invoice, Payment
+
+# عدد الدفعات في كل INSERT - Payments per bulk INSERT
+POSTING_BATCH_SIZE = 1000
+
+
+# حالات لا تتغير إلى متأخرة أو قيد الانتظار - statuses kept while nothing is paid
+MANUAL_STATUSES = ('draft', 'cancelled')
+
+
+def payment_status(paid_amount, total_amount, status, due_date=None, today=None):
+    """
+    حالة الدفع - Invoice status for a paid amount
+    Same rules as the SQL in reconcile.expected_status(): an unsettled invoice
+    past its due date is overdue, even when partially paid.
+    """
+    if paid_amount >= total_amount:
+        return 'paid'
+    if due_date is not None and status not in MANUAL_STATUSES and due_date < (today or timezone.localdate()):
+        return 'overdue'
+    if paid_amount > 0:
+        return 'partially_paid'
+    if status in MANUAL_STATUSES:
+        return status
+    return 'pending'
+
+
+def apply_payment_deltas(deltas, actor_id=None, now=None):
+    """
+    تطبيق فروقات المدفوع - Add amounts to invoices' paid_amount
+
+    The invoices are locked in pk order, paid_amount is moved with
+    F('paid_amount') + delta and only paid_amount / status / updated_at are
+    written. Status changes go to the activity feed in one INSERT and the
+    tenants' cached ledger balances and the aging reports are dropped.
+
+    Args:
+        deltas: {invoice_id: Decimal} (سالبة عند حذف دفعة)
+
+    Returns:
+        dict: {invoice_id: الحالة الجديدة}
+    """
+    from .aging import invalidate_aging
+    from .ledger import invalidate_balances
+
+    deltas = {pk: delta for pk, delta in deltas.items() if pk is not None and delta}
+    if not deltas:
+        return {}
+
+    now = now or timezone.now()
+    statuses = {}
+    status_changes = []
+    # فواتير بنفس الفرق ونفس الحالة الجديدة تحدث معاً - one UPDATE per (delta, new status)
+    groups = defaultdict(list)
+    with transaction.atomic():
+        invoices = (
+            Invoice.objects.select_for_update()
+            .filter(pk__in=list(deltas)).order_by('pk')
+            .only('status', 'total_amount', 'paid_amount', 'due_date', 'invoice_number', 'created_by', 'tenant')
+        )
+        today = timezone.localdate()
+        tenant_ids = set()
+        for invoice in invoices:
+            tenant_ids.add(invoice.tenant_id)
+            delta = deltas[invoice.pk]
+            previous = invoice.status
+            status = payment_status(invoice.paid_amount + delta, invoice.total_amount, previous, invoice.due_date, today)
+            statuses[invoice.pk] = status
+            if status != previous:
+                invoice.status = status
+                status_changes.append((invoice, previous))
+            groups[(delta, status if status != previous else None)].append(invoice.pk)
+
+        for (delta, status), pks in groups.items():
+            changes = {'paid_amount': F('paid_amount') + delta, 'updated_at': now}
+            if status is not None:
+                changes['status'] = status
+            Invoice.objects.filter(pk__in=pks).update(**changes)
+
+        record_status_changes(status_changes, actor_id=actor_id)
+        invalidate_balances(tenant_ids)
+        invalidate_aging()
+
+    return statuses
+
+
+def post_payments(payments, user=None):
+    """
+    ترحيل دفعات - Insert unsaved Payments and update their invoices in one transaction
+
+    Args:
+        payments: دفعات غير محفوظة (invoice_id, amount, payment_method, payment_date, ...)
+        user: المستخدم المسجل للدفعات (created_by الافتراضي)
+
+    Returns:
+        list: الدفعات المنشأة
+
+    Example:
+        >>> post_payments([Payment(invoice_id=7, amount=Decimal('500'), payment_method='bank_transfer',
+        ...                        payment_date=date.today(), reference_number='TRX-1')], user=request.user)
+    """
+    payments = list(payments)
+    if not payments:
+        return []
+
+    actor_id = user.pk if user is not None else None
+    deltas = defaultdict(Decimal)
+    for payment in payments:
+        if actor_id and payment.created_by_id is None:
+            payment.created_by_id = actor_id
+        deltas[payment.invoice_id] += payment.amount
+
+    with transaction.atomic():
+        unnumbered = [payment for payment in payments if not payment.payment_number]
+        if unnumbered:
+            codes = reserve_codes('PAY', len(unnumbered), Payment, 'payment_number')
+            for payment, code in zip(unnumbered, codes):
+                payment.payment_number = code
+
+        created = Payment.objects.bulk_create(payments, batch_size=POSTING_BATCH_SIZE)
+        apply_payment_deltas(deltas, actor_id=actor_id)
+        record_created(created, actor_id=actor_id)
+
+    return created
@@ -0,0 +1,104 @@
+"""
+Invoice Reconciliation - مطابقة الفواتير
+Recomputes paid_amount and status for every invoice in the database:
+payments are summed with one grouped subquery, the expected status is a SQL
+CASE (same rules as payments.payment_status) and the corrections are written
+with one UPDATE per target status. No invoice rows are loaded into Python.
+"""
+from collections import namedtuple
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import (
+    Case, Count, DecimalField, F, OuterRef, Q, Subquery, Sum, Value, When,
+)
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import Invoice, Payment
+from .payments import MANUAL_STATUSES
+
+# old_status / new_status / count: عدد الفواتير / paid_change: مجموع تصحيح المدفوع
+StatusChange = namedtuple('StatusChange', ['old_status', 'new_status', 'count', 'paid_change'])
+
+AMOUNT_FIELD = DecimalField(max_digits=12, decimal_places=2)
+
+
+def paid_sum():
+    """مجموع الدفعات لكل فاتورة - Correlated SUM(amount) subquery (0 without payments)"""
+    payments = (
+        Payment.objects.filter(invoice=OuterRef('pk'))
+        .order_by().values('invoice').annotate(total=Sum('amount')).values('total')
+    )
+    return Coalesce(Subquery(payments, output_field=AMOUNT_FIELD), Value(Decimal('0.00')), output_field=AMOUNT_FIELD)
+
+
+def expected_status(today):
+    """
+    الحالة المتوقعة - SQL CASE mirroring payments.payment_status()
+    Expects the paid_sum annotation.
+    """
+    return Case(
+        When(paid_sum__gte=F('total_amount'), then=Value('paid')),
+        When(Q(due_date__lt=today) & ~Q(status__in=MANUAL_STATUSES), then=Value('overdue')),
+        When(paid_sum__gt=0, then=Value('partially_paid')),
+        When(status__in=MANUAL_STATUSES, then=F('status')),
+        default=Value('pending'),
+    )
+
+
+def mismatched_invoices(today=None, queryset=None):
+    """
+    الفواتير غير المتطابقة - Invoices whose paid_amount or status differ from their payments
+    Annotated with paid_sum and expected_status.
+    """
+    today = today or timezone.localdate()
+    queryset = Invoice.objects.all() if queryset is None else queryset
+    return (
+        queryset.order_by()
+        .annotate(paid_sum=paid_sum())
+        .annotate(expected_status=expected_status(today))
+        .exclude(paid_sum=F('paid_amount'), expected_status=F('status'))
+    )
+
+
+def reconcile_invoices(today=None, dry_run=False, queryset=None):
+    """
+    مطابقة الفواتير - Fix paid_amount / status of every mismatched invoice
+
+    Args:
+        today: تاريخ احتساب التأخير (الافتراضي اليوم)
+        dry_run: حساب الفروقات فقط بدون تحديث
+        queryset: تقييد المطابقة (مثلاً فواتير مستأجر)
+
+    Returns:
+        list: [StatusChange, ...] - الفروقات مجمعة حسب (الحالة القديمة، الحالة الجديدة)
+    """
+    from .aging import invalidate_aging
+
+    today = today or timezone.localdate()
+    now = timezone.now()
+
+    with transaction.atomic():
+        mismatched = mismatched_invoices(today, queryset)
+        diff = [
+            StatusChange(row['status'], row['expected_status'], row['count'], row['paid_change'] or Decimal('0.00'))
+            for row in mismatched.values('status', 'expected_status').annotate(
+                count=Count('pk'),
+                paid_change=Sum(F('paid_sum') - F('paid_amount'), output_field=AMOUNT_FIELD),
+            ).order_by('status', 'expected_status')
+        ]
+        if dry_run:
+            return diff
+
+        for status in sorted({change.new_status for change in diff}):
+            targets = mismatched.filter(expected_status=status).values('pk')
+            Invoice.objects.filter(pk__in=Subquery(targets)).update(
+                paid_amount=paid_sum(),
+                status=status,
+                updated_at=now,
+            )
+        if diff:
+            invalidate_aging()
+
+    return diff
@@ -0,0 +1,47 @@
+"""
+Signals for Finance App
+إشارات تطبيق المالية
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .aging import invalidate_aging
+from .ledger import invalidate_balances
+from .models import Invoice, InvoiceItem, Payment
+from .payments import apply_payment_deltas
+from .totals import items_changed
+
+
+@receiver(post_save, sender=Invoice, dispatch_uid='invoice_balance_save')
+@receiver(post_delete, sender=Invoice, dispatch_uid='invoice_balance_delete')
+def invoice_written(sender, instance, raw=False, **kwargs):
+    """تحديث رصيد المستأجر - Drop the tenant's cached closing balance and the aging reports"""
+    if not raw:
+        invalidate_balances([instance.tenant_id])
+        invalidate_aging()
+
+
+@receiver(post_save, sender=InvoiceItem, dispatch_uid='invoice_item_totals_save')
+def invoice_item_saved(sender, instance, raw=False, **kwargs):
+    """تحديث مجاميع الفاتورة بعد حفظ بند - Keep invoice totals in step with its items"""
+    if not raw:
+        items_changed(instance.invoice_id)
+
+
+@receiver(post_delete, sender=InvoiceItem, dispatch_uid='invoice_item_totals_delete')
+def invoice_item_deleted(sender, instance, origin=None, **kwargs):
+    """تحديث المجاميع بعد حذف بند - Skipped when the invoice itself is being deleted"""
+    if isinstance(origin, Invoice) or getattr(origin, 'model', None) is Invoice:
+        return
+    items_changed(instance.invoice_id)
+
+
+@receiver(post_delete, sender=Payment, dispatch_uid='payment_paid_amount_delete')
+def payment_deleted(sender, instance, origin=None, **kwargs):
+    """
+    خصم الدفعة المحذوفة من الفاتورة - Subtract a deleted payment from its invoice
+    Also covers queryset / admin bulk deletes; skipped when the invoice itself is being deleted.
+    """
+    if isinstance(origin, Invoice) or getattr(origin, 'model', None) is Invoice:
+        return
+    apply_payment_deltas({instance.invoice_id: -instance.amount})
@@ -0,0 +1,33 @@
+"""
+Celery Tasks for Finance App
+المهام الخلفية لتطبيق المالية (تعمل أيضاً في خيوط داخل العملية عند تعطيل Celery)
+"""
+from celery import shared_task
+
+
+@shared_task
+def generate_rent_invoices_task(period, user_id):
+    """إصدار فواتير الإيجار لشهر - Bill a month (ISO date) and notify the user who started it"""
+    from datetime import date
+
+    from django.contrib.auth import get_user_model
+    from django.urls import reverse
+    from django.utils.translation import gettext as _
+
+    from apps.core.notifications import notify
+
+    from .billing import generate_rent_invoices
+
+    user = get_user_model().objects.filter(pk=user_id).first()
+    result = generate_rent_invoices(date.fromisoformat(period), user=user)
+    notify(
+        user_id,
+        title=_('تم إصدار فواتير الإيجار'),
+        message=_('تم إصدار %(count)s فاتورة إيجار لشهر %(month)s بإجمالي %(total)s USD') % {
+            'count': result['invoices'],
+            'month': result['period'].strftime('%Y-%m'),
+            'total': f"{result['total']:,.2f}",
+        },
+        notification_type='success',
+        link=reverse('finance:invoice_list') + '?invoice_type=rental',
+    )
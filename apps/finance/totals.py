@@ -0,0 +1,159 @@
+"""
+Invoice Totals - مجاميع الفواتير
+Subtotal / tax / total follow the invoice's items: the invoice row is locked
+(select_for_update), its items are summed with one SQL aggregate and the totals
+written with one UPDATE, inside the caller's transaction. Item saves and
+deletes trigger it through signals; batch_totals() defers it so a formset
+with 100 items recomputes once.
+"""
+import threading
+from contextlib import contextmanager
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Sum
+from django.utils import timezone
+
+from apps.core.activity import record_status_changes
+
+TWO_PLACES = Decimal('0.01')
+
+_local = threading.local()
+
+
+def compute_totals(subtotal, tax_rate, discount_amount):
+    """
+    حساب الضريبة والإجمالي - (tax_amount, total_amount) for a subtotal
+
+    Example:
+        >>> compute_totals(Decimal('100.00'), Decimal('15.00'), Decimal('5.00'))
+        (Decimal('15.00'), Decimal('110.00'))
+    """
+    tax_amount = (subtotal * tax_rate / 100).quantize(TWO_PLACES)
+    return tax_amount, subtotal + tax_amount - discount_amount
+
+
+def recalculate_totals(invoice_ids):
+    """
+    إعادة حساب مجاميع الفواتير - Recompute totals from the items in SQL
+
+    Independent of the number of items: one locking SELECT, one
+    SUM(total) GROUP BY invoice, then one UPDATE per invoice. When the total
+    changes the status is re-derived in the same UPDATE (payments.payment_status),
+    so a paid invoice that gains an item is open again. The tenants' cached
+    ledger balances and the aging reports are dropped.
+
+    Returns:
+        dict: {invoice_id: {'subtotal', 'tax_amount', 'total_amount', 'status'}}
+    """
+    from .aging import invalidate_aging
+    from .ledger import invalidate_balances
+    from .models import Invoice, InvoiceItem
+    from .payments import payment_status
+
+    invoice_ids = sorted(set(invoice_ids))
+    if not invoice_ids:
+        return {}
+
+    now = timezone.now()
+    today = timezone.localdate()
+    results = {}
+    status_changes = []
+    with transaction.atomic():
+        # الترتيب الثابت للأقفال يمنع الجمود - locks taken in pk order to avoid deadlocks
+        invoices = list(
+            Invoice.objects.select_for_update().filter(pk__in=invoice_ids).order_by('pk')
+            .only('tax_rate', 'discount_amount', 'total_amount', 'paid_amount', 'status', 'due_date',
+                  'tenant', 'invoice_number', 'created_by')
+        )
+        subtotals = dict(
+            InvoiceItem.objects.filter(invoice_id__in=invoice_ids)
+            .values('invoice_id').annotate(subtotal=Sum('total'))
+            .values_list('invoice_id', 'subtotal')
+        )
+
+        for invoice in invoices:
+            subtotal = (subtotals.get(invoice.pk) or Decimal('0.00')).quantize(TWO_PLACES)
+            tax_amount, total_amount = compute_totals(subtotal, invoice.tax_rate, invoice.discount_amount)
+            status = invoice.status
+            if total_amount != invoice.total_amount:
+                status = payment_status(invoice.paid_amount, total_amount, status, invoice.due_date, today)
+            if status != invoice.status:
+                previous = invoice.status
+                invoice.status = status
+                status_changes.append((invoice, previous))
+
+            results[invoice.pk] = {
+                'subtotal': subtotal,
+                'tax_amount': tax_amount,
+                'total_amount': total_amount,
+                'status': status,
+            }
+            Invoice.objects.filter(pk=invoice.pk).update(updated_at=now, **results[invoice.pk])
+
+        record_status_changes(status_changes)
+        invalidate_balances(invoice.tenant_id for invoice in invoices)
+        invalidate_aging()
+
+    return results
+
+
+class TotalsBatch:
+    """
+    دفعة إعادة حساب - Invoices to recompute when the batch_totals() block ends
+    """
+    def __init__(self):
+        self.ids = set()
+        self.instances = []
+
+    def add(self, invoice):
+        """Always recompute this invoice and refresh its in-memory totals"""
+        self.instances.append(invoice)
+
+    def flush(self):
+        instances = [invoice for invoice in self.instances if invoice.pk is not None]
+        totals = recalculate_totals(self.ids | {invoice.pk for invoice in instances})
+        for invoice in instances:
+            for name, value in totals.get(invoice.pk, {}).items():
+                setattr(invoice, name, value)
+
+
+def items_changed(invoice_id):
+    """
+    تغيرت بنود الفاتورة - Recompute now, or at the end of the current batch_totals()
+    """
+    batch = getattr(_local, 'batch', None)
+    if batch is not None:
+        batch.ids.add(invoice_id)
+    else:
+        recalculate_totals([invoice_id])
+
+
+@contextmanager
+def batch_totals(*invoices):
+    """
+    تأجيل إعادة الحساب - Recompute touched invoices once, when the block ends
+
+    The given invoices are always recomputed (e.g. after a tax rate change) and
+    get their in-memory totals refreshed. Nested blocks join the outer one.
+
+    Example:
+        >>> with transaction.atomic(), batch_totals(invoice):
+        ...     form.save()
+        ...     formset.save()
+    """
+    batch = getattr(_local, 'batch', None)
+    if batch is not None:
+        for invoice in invoices:
+            batch.add(invoice)
+        yield batch
+        return
+
+    batch = _local.batch = TotalsBatch()
+    for invoice in invoices:
+        batch.add(invoice)
+    try:
+        yield batch
+    finally:
+        _local.batch = None
+    batch.flush()
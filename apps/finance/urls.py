@@ -13,9 +13,15 @@ urlpatterns = [
     path('invoices/create/', views.invoice_create, name='invoice_create'),
     path('invoices/<int:pk>/edit/', views.invoice_edit, name='invoice_edit'),
     path('invoices/<int:pk>/delete/', views.invoice_delete, name='invoice_delete'),
+    path('invoices/rent-billing/', views.rent_billing, name='rent_billing'),
     
     # Payment URLs
     path('payments/', views.payment_list, name='payment_list'),
     path('payments/create/', views.payment_create, name='payment_create'),
+
+    # Report URLs
+    path('reports/aging/', views.ar_aging, name='ar_aging'),
+    path('reports/aging/export/', views.ar_aging_export, name='ar_aging_export'),
+    path('tenants/<int:tenant_id>/ledger/', views.tenant_ledger, name='tenant_ledger'),
 ]
 
@@ -1,14 +1,34 @@
 """
 Finance Views
 """
+from datetime import date
+
 from django.shortcuts import render, redirect, get_object_or_404
+from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
-from django.db.models import Q, Sum
+from django.db import transaction
+from django.db.models import Q
 from .models import Invoice, InvoiceItem, Payment
 from .forms import InvoiceForm, PaymentForm, InvoiceItemFormSet
+from .aging import BUCKETS, aging_report, report_rows
+from .tasks import generate_rent_invoices_task
+from .ledger import closing_balance, ledger_page
+from .totals import batch_totals
+from apps.core.background import enqueue
 from apps.core.decorators import staff_required
+from apps.core.exports import rows_csv_response
+from apps.core.lookup import number_filter
+from apps.core.pagination import paginate
+from apps.core.search import filter_queryset
+from apps.core.stats import aggregate_stats
+
+User = get_user_model()
+
+# ترتيب قائمة المدفوعات (فهرس payment_date_id_idx) - payments keep their payment_date order
+PAYMENT_ORDERING = ('-payment_date', '-id')
 
 
 @login_required
@@ -27,29 +47,57 @@ def invoice_list(request):
     if invoice_type:
         invoices = invoices.filter(invoice_type=invoice_type)
     if search:
-        invoices = invoices.filter(
-            Q(invoice_number__icontains=search) |
-            Q(tenant__username__icontains=search) |
-            Q(tenant__tenant_profile__company_name__icontains=search)
-        )
-
-    # Statistics
-    stats = {
-        'total_invoices': Invoice.objects.count(),
-        'pending_invoices': Invoice.objects.filter(status='pending').count(),
-        'paid_invoices': Invoice.objects.filter(status='paid').count(),
-        'overdue_invoices': Invoice.objects.filter(status='overdue').count(),
-        'total_amount': Invoice.objects.aggregate(Sum('total_amount'))['total_amount__sum'] or 0,
-        'paid_amount': Invoice.objects.filter(status='paid').aggregate(Sum('total_amount'))['total_amount__sum'] or 0,
-    }
+        invoices = filter_queryset(invoices, 'invoice', search)
+
+    # Statistics (single aggregate query)
+    stats = aggregate_stats(
+        Invoice.objects.all(),
+        counts={
+            'total_invoices': None,
+            'pending_invoices': Q(status='pending'),
+            'paid_invoices': Q(status='paid'),
+            'overdue_invoices': Q(status='overdue'),
+        },
+        sums={
+            'total_amount': ('total_amount', None),
+            'paid_amount': ('total_amount', Q(status='paid')),
+        },
+        cache_key='finance:invoice_list:stats',
+    )
+
+    # Pagination (keyset - no COUNT/OFFSET)
+    page_obj = paginate(request, invoices)
 
     context = {
-        'invoices': invoices,
+        'invoices': page_obj,
+        'page_obj': page_obj,
         'stats': stats,
     }
     return render(request, 'finance/invoice_list.html', context)
 
 
+@login_required
+@staff_required
+def rent_billing(request):
+    """
+    إصدار فواتير الإيجار الشهرية - Queue rent billing for a month (POST period=YYYY-MM)
+    Runs as a background job; the user is notified with the result.
+    """
+    if request.method != 'POST':
+        return redirect('finance:invoice_list')
+
+    try:
+        period = date.fromisoformat(f"{request.POST.get('period', '')}-01")
+    except ValueError:
+        period = timezone.localdate().replace(day=1)
+
+    enqueue(generate_rent_invoices_task, period.isoformat(), request.user.pk)
+    messages.info(request, _('جاري إصدار فواتير الإيجار لشهر %(month)s، سيصلك إشعار عند الانتهاء') % {
+        'month': period.strftime('%Y-%m')
+    })
+    return redirect('finance:invoice_list')
+
+
 @login_required
 @staff_required
 def invoice_detail(request, pk):
@@ -75,16 +123,16 @@ def invoice_create(request):
         formset = InvoiceItemFormSet(request.POST)
 
         if form.is_valid() and formset.is_valid():
-            invoice = form.save(commit=False)
-            invoice.created_by = request.user
-            invoice.save()
-
-            # Save invoice items
-            formset.instance = invoice
-            formset.save()
+            # البنود والمجاميع في معاملة واحدة - items and totals in one transaction
+            with transaction.atomic(), batch_totals() as totals:
+                invoice = form.save(commit=False)
+                invoice.created_by = request.user
+                invoice.save()
+                totals.add(invoice)
 
-            # Recalculate totals
-            invoice.calculate_totals()
+                # Save invoice items
+                formset.instance = invoice
+                formset.save()
 
             messages.success(request, _('تم إنشاء الفاتورة بنجاح'))
             return redirect('finance:invoice_detail', pk=invoice.pk)
@@ -110,11 +158,10 @@ def invoice_edit(request, pk):
         formset = InvoiceItemFormSet(request.POST, instance=invoice)
 
         if form.is_valid() and formset.is_valid():
-            form.save()
-            formset.save()
-
-            # Recalculate totals
-            invoice.calculate_totals()
+            # إعادة حساب واحدة بعد حفظ كل البنود - one recompute after all items are saved
+            with transaction.atomic(), batch_totals(invoice):
+                form.save()
+                formset.save()
 
             messages.success(request, _('تم تحديث الفاتورة بنجاح'))
             return redirect('finance:invoice_detail', pk=invoice.pk)
@@ -149,7 +196,7 @@ def invoice_delete(request, pk):
 @staff_required
 def payment_list(request):
     """قائمة المدفوعات - Payment List"""
-    payments = Payment.objects.all().select_related('invoice', 'created_by').order_by('-payment_date')
+    payments = Payment.objects.all().select_related('invoice__tenant__tenant_profile', 'created_by').order_by('-payment_date')
 
     # Filters
     payment_method = request.GET.get('payment_method')
@@ -158,20 +205,31 @@ def payment_list(request):
     if payment_method:
         payments = payments.filter(payment_method=payment_method)
     if search:
-        payments = payments.filter(
-            Q(payment_number__icontains=search) |
-            Q(invoice__invoice_number__icontains=search) |
-            Q(reference_number__icontains=search)
-        )
-
-    # Statistics
-    stats = {
-        'total_payments': Payment.objects.count(),
-        'total_amount': Payment.objects.aggregate(Sum('amount'))['amount__sum'] or 0,
-    }
+        # أرقام PAY-/INV- عبر نطاق الفهرس الفريد - number-shaped queries use the unique indexes
+        by_number = number_filter('payment_number', search) or number_filter('invoice__invoice_number', search)
+        if by_number is not None:
+            payments = payments.filter(by_number)
+        else:
+            payments = payments.filter(
+                Q(payment_number__icontains=search) |
+                Q(invoice__invoice_number__icontains=search) |
+                Q(reference_number__icontains=search)
+            )
+
+    # Statistics (single aggregate query)
+    stats = aggregate_stats(
+        Payment.objects.all(),
+        counts={'total_payments': None},
+        sums={'total_amount': ('amount', None)},
+        cache_key='finance:payment_list:stats',
+    )
+
+    # Pagination (keyset on the payment_date display order)
+    page_obj = paginate(request, payments, ordering=PAYMENT_ORDERING)
 
     context = {
-        'payments': payments,
+        'payments': page_obj,
+        'page_obj': page_obj,
         'stats': stats,
     }
     return render(request, 'finance/payment_list.html', context)
@@ -199,3 +257,51 @@ def payment_create(request):
 
     context = {'form': form}
     return render(request, 'finance/payment_form.html', context)
+
+
+def _report_date(request):
+    """تاريخ التقرير من ?as_of= - Report date from the query string (default today)"""
+    try:
+        return date.fromisoformat(request.GET.get('as_of', ''))
+    except ValueError:
+        return timezone.localdate()
+
+
+@login_required
+@staff_required
+def ar_aging(request):
+    """
+    أعمار الذمم المدينة - Accounts receivable aging per tenant
+    (?as_of=YYYY-MM-DD, ?refresh=1 recomputes the cached report)
+    """
+    report = aging_report(_report_date(request), refresh=bool(request.GET.get('refresh')))
+
+    context = {
+        'report': report,
+        'buckets': BUCKETS,
+    }
+    return render(request, 'finance/ar_aging.html', context)
+
+
+@login_required
+@staff_required
+def ar_aging_export(request):
+    """تصدير أعمار الذمم إلى CSV - Streaming CSV of the aging report"""
+    report = aging_report(_report_date(request))
+    return rows_csv_response(report_rows(report), f'ar_aging_{report["as_of"].isoformat()}')
+
+
+@login_required
+@staff_required
+def tenant_ledger(request, tenant_id):
+    """كشف حساب مستأجر - Tenant ledger with running balance (staff)"""
+    tenant = get_object_or_404(User.objects.select_related('tenant_profile'), pk=tenant_id)
+    page_obj = ledger_page(tenant.pk, after=request.GET.get('after'), before=request.GET.get('before'))
+
+    context = {
+        'tenant': tenant,
+        'entries': page_obj,
+        'page_obj': page_obj,
+        'closing_balance': closing_balance(tenant.pk),
+    }
+    return render(request, 'finance/tenant_ledger.html', context)
@@ -53,6 +53,10 @@ class LeaveRequest(models.Model):
         verbose_name_plural = _('طلبات الإجازات')
         db_table = 'hr_leaverequest'
         ordering = ['-created_at']
+        indexes = [
+            # التقسيم بالمؤشر - keyset pagination
+            models.Index(fields=['created_at', 'id'], name='leave_created_id_idx'),
+        ]
 
     def __str__(self):
         return f"{self.request_number} - {self.employee.get_full_name()}"
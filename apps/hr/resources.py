@@ -1,7 +1,7 @@
 from import_export import resources, fields
 from import_export.widgets import ForeignKeyWidget
 from django.contrib.auth import get_user_model
-from .models import LeaveRequest, LeaveRequestApproval, Attendance, Payroll, PayrollItem
+from .models import LeaveRequest, Attendance
 
 User = get_user_model()
 
@@ -48,27 +48,7 @@ class AttendanceResource(resources.ModelResource):
         model = Attendance
         fields = (
             'id', 'employee', 'date', 'check_in', 'check_out',
-            'status', 'notes', 'created_at', 'updated_at'
-        )
-        export_order = fields
-
-
-class PayrollResource(resources.ModelResource):
-    """Resource class for Payroll model"""
-    
-    employee = fields.Field(
-        column_name='employee',
-        attribute='employee',
-        widget=ForeignKeyWidget(User, 'username')
-    )
-    
-    class Meta:
-        model = Payroll
-        fields = (
-            'id', 'employee', 'month', 'year', 'basic_salary',
-            'total_allowances', 'total_deductions', 'net_salary',
-            'status', 'payment_date', 'notes',
-            'created_at', 'updated_at'
+            'is_present', 'is_late', 'notes', 'created_at', 'updated_at'
         )
         export_order = fields
 
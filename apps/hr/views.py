@@ -5,15 +5,16 @@ Views for HR App
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.core.paginator import Paginator
 from django.db.models import Q, Count
-from django.http import HttpResponse
 from django.utils.translation import gettext as _
 from django.utils import timezone
 
 from .models import LeaveRequest, Attendance
 from .forms import LeaveRequestForm, LeaveRequestApprovalForm, AttendanceForm
 from apps.core.decorators import staff_required
+from apps.core.exports import export_or_enqueue
+from apps.core.pagination import paginate
+from apps.core.stats import aggregate_stats
 
 
 @login_required
@@ -26,11 +27,13 @@ def leave_request_list(request):
         'employee', 'approved_by'
     ).order_by('-created_at')
 
-    # Statistics
-    pending_count = leave_requests.filter(status='pending').count()
-    approved_count = leave_requests.filter(status='approved').count()
-    rejected_count = leave_requests.filter(status='rejected').count()
-    total_count = leave_requests.count()
+    # Statistics (single aggregate query)
+    stats = aggregate_stats(leave_requests, counts={
+        'pending_count': Q(status='pending'),
+        'approved_count': Q(status='approved'),
+        'rejected_count': Q(status='rejected'),
+        'total_count': None,
+    }, cache_key='hr:leave_request_list:stats')
 
     # Filters
     leave_type = request.GET.get('leave_type')
@@ -52,19 +55,13 @@ def leave_request_list(request):
             Q(reason__icontains=search)
         )
 
-    # Pagination
-    paginator = Paginator(leave_requests, 20)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    # Pagination (keyset - no COUNT/OFFSET)
+    page_obj = paginate(request, leave_requests)
 
     context = {
         'leave_requests': page_obj,
         'page_obj': page_obj,
-        'is_paginated': page_obj.has_other_pages(),
-        'pending_count': pending_count,
-        'approved_count': approved_count,
-        'rejected_count': rejected_count,
-        'total_count': total_count,
+        **stats,
     }
 
     return render(request, 'hr/leave_request_list.html', context)
@@ -230,12 +227,43 @@ def leave_request_reject(request, pk):
     return redirect('hr:leave_request_detail', pk=pk)
 
 
+def leave_request_export_queryset(params):
+    """
+    سجلات التصدير بعد تطبيق الفلاتر - Filtered queryset for leave_request_export
+    (also rebuilt from ExportJob.params by the background worker)
+    """
+    queryset = LeaveRequest.objects.order_by('-created_at')
+
+    # Apply filters
+    leave_type = params.get('leave_type', '')
+    status = params.get('status', '')
+    start_date = params.get('start_date', '')
+    search = params.get('search', '')
+
+    if leave_type:
+        queryset = queryset.filter(leave_type=leave_type)
+
+    if status:
+        queryset = queryset.filter(status=status)
+
+    if start_date:
+        queryset = queryset.filter(start_date__gte=start_date)
+
+    if search:
+        queryset = queryset.filter(
+            Q(request_number__icontains=search) |
+            Q(employee__first_name__icontains=search) |
+            Q(employee__last_name__icontains=search) |
+            Q(reason__icontains=search)
+        )
+
+    return queryset
+
+
 @login_required
 @staff_required
 def leave_request_export(request):
     """
     تصدير طلبات الإجازات إلى Excel - Export Leave Requests to Excel
     """
-    # سيتم تنفيذها في المرحلة القادمة
-    messages.info(request, _('سيتم تنفيذ هذه الميزة قريباً'))
-    return redirect('hr:leave_request_list')
+    return export_or_enqueue(request, 'leave_requests')
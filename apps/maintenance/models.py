@@ -161,6 +161,9 @@ class Ticket(models.Model):
             models.Index(fields=['ticket_number']),
             models.Index(fields=['status']),
             models.Index(fields=['priority']),
+            # التقسيم بالمؤشر - keyset pagination of the staff and tenant lists
+            models.Index(fields=['created_at', 'id'], name='ticket_created_id_idx'),
+            models.Index(fields=['created_by', 'created_at', 'id'], name='ticket_creator_created_idx'),
         ]
 
     def __str__(self):
@@ -5,15 +5,16 @@ Views for Maintenance App
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.core.paginator import Paginator
 from django.db.models import Q, Count
-from django.http import HttpResponse
 from django.utils.translation import gettext as _
 
 from .models import Ticket, TicketAttachment, TicketComment
 from .forms import TicketForm, TicketAttachmentForm, TicketCommentForm
-from .resources import TicketResource
 from apps.core.decorators import staff_required
+from apps.core.exports import export_or_enqueue
+from apps.core.pagination import paginate
+from apps.core.search import filter_queryset
+from apps.core.stats import aggregate_stats
 
 
 @login_required
@@ -27,11 +28,13 @@ def ticket_list(request):
         'created_by', 'assigned_to'
     ).order_by('-created_at')
 
-    # Statistics
-    urgent_count = tickets.filter(priority='urgent', status__in=['open', 'in_progress']).count()
-    in_progress_count = tickets.filter(status='in_progress').count()
-    completed_count = tickets.filter(status__in=['resolved', 'closed']).count()
-    total_count = tickets.count()
+    # Statistics (single aggregate query)
+    stats = aggregate_stats(tickets, counts={
+        'urgent_count': Q(priority='urgent', status__in=['open', 'in_progress']),
+        'in_progress_count': Q(status='in_progress'),
+        'completed_count': Q(status__in=['resolved', 'closed']),
+        'total_count': None,
+    }, cache_key='maintenance:ticket_list:stats')
 
     # Filters
     category = request.GET.get('category')
@@ -46,25 +49,15 @@ def ticket_list(request):
     if status:
         tickets = tickets.filter(status=status)
     if search:
-        tickets = tickets.filter(
-            Q(ticket_number__icontains=search) |
-            Q(title__icontains=search) |
-            Q(description__icontains=search)
-        )
+        tickets = filter_queryset(tickets, 'ticket', search)
 
-    # Pagination
-    paginator = Paginator(tickets, 20)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    # Pagination (keyset - no COUNT/OFFSET)
+    page_obj = paginate(request, tickets)
 
     context = {
         'tickets': page_obj,
         'page_obj': page_obj,
-        'is_paginated': page_obj.has_other_pages(),
-        'urgent_count': urgent_count,
-        'in_progress_count': in_progress_count,
-        'completed_count': completed_count,
-        'total_count': total_count,
+        **stats,
     }
 
     return render(request, 'maintenance/ticket_list.html', context)
@@ -180,25 +173,21 @@ def ticket_delete(request, pk):
     return render(request, 'maintenance/ticket_confirm_delete.html', context)
 
 
-@login_required
-@staff_required
-def ticket_export(request):
+def ticket_export_queryset(params):
     """
-    تصدير طلبات الصيانة إلى Excel - Export Tickets to Excel
+    سجلات التصدير بعد تطبيق الفلاتر - Filtered queryset for ticket_export
+    (also rebuilt from ExportJob.params by the background worker)
     """
-    queryset = Ticket.objects.select_related('created_by', 'assigned_to').all()
+    queryset = Ticket.objects.order_by('-created_at')
 
     # Apply filters
-    search = request.GET.get('search', '')
-    status = request.GET.get('status', '')
-    category = request.GET.get('category', '')
-    priority = request.GET.get('priority', '')
+    search = params.get('search', '')
+    status = params.get('status', '')
+    category = params.get('category', '')
+    priority = params.get('priority', '')
 
     if search:
-        queryset = queryset.filter(
-            Q(ticket_number__icontains=search) |
-            Q(title__icontains=search)
-        )
+        queryset = filter_queryset(queryset, 'ticket', search)
 
     if status:
         queryset = queryset.filter(status=status)
@@ -209,11 +198,13 @@ def ticket_export(request):
     if priority:
         queryset = queryset.filter(priority=priority)
 
-    # Export to Excel
-    resource = TicketResource()
-    dataset = resource.export(queryset)
+    return queryset
 
-    response = HttpResponse(dataset.xlsx, content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
-    response['Content-Disposition'] = 'attachment; filename="tickets_export.xlsx"'
 
-    return response
+@login_required
+@staff_required
+def ticket_export(request):
+    """
+    تصدير طلبات الصيانة إلى Excel - Export Tickets to Excel
+    """
+    return export_or_enqueue(request, 'tickets')
@@ -56,6 +56,10 @@ class Event(models.Model):
         verbose_name_plural = _('الفعاليات التسويقية')
         db_table = 'marketing_event'
         ordering = ['-start_date']
+        indexes = [
+            # التقسيم بالمؤشر حسب تاريخ البداية - keyset pagination in start_date order
+            models.Index(fields=['start_date', 'id'], name='event_start_id_idx'),
+        ]
 
     def __str__(self):
         return f"{self.event_number} - {self.title}"
@@ -5,15 +5,18 @@ Views for Marketing App
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.core.paginator import Paginator
 from django.db.models import Q, Count
-from django.http import HttpResponse
 from django.utils.translation import gettext as _
 
 from .models import Event, Activation
 from .forms import EventForm, ActivationForm
-from .resources import EventResource
 from apps.core.decorators import staff_required
+from apps.core.exports import export_or_enqueue
+from apps.core.pagination import paginate
+from apps.core.stats import aggregate_stats
+
+# ترتيب قوائم الفعاليات (فهرس event_start_id_idx) - event lists keep their start_date order
+EVENT_ORDERING = ('-start_date', '-id')
 
 
 @login_required
@@ -26,11 +29,13 @@ def event_list(request):
         'created_by', 'responsible_person'
     ).order_by('-start_date')
 
-    # Statistics
-    active_count = events.filter(status='active').count()
-    upcoming_count = events.filter(status='draft').count()
-    completed_count = events.filter(status='completed').count()
-    total_count = events.count()
+    # Statistics (single aggregate query)
+    stats = aggregate_stats(events, counts={
+        'active_count': Q(status='active'),
+        'upcoming_count': Q(status='draft'),
+        'completed_count': Q(status='completed'),
+        'total_count': None,
+    }, cache_key='marketing:event_list:stats')
 
     # Filters
     event_type = request.GET.get('event_type')
@@ -52,19 +57,13 @@ def event_list(request):
             Q(location__icontains=search)
         )
 
-    # Pagination
-    paginator = Paginator(events, 20)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    # Pagination (keyset on the start_date display order)
+    page_obj = paginate(request, events, ordering=EVENT_ORDERING)
 
     context = {
         'events': page_obj,
         'page_obj': page_obj,
-        'is_paginated': page_obj.has_other_pages(),
-        'active_count': active_count,
-        'upcoming_count': upcoming_count,
-        'completed_count': completed_count,
-        'total_count': total_count,
+        **stats,
     }
 
     return render(request, 'marketing/event_list.html', context)
@@ -172,18 +171,17 @@ def event_delete(request, pk):
     return render(request, 'marketing/event_confirm_delete.html', context)
 
 
-@login_required
-@staff_required
-def event_export(request):
+def event_export_queryset(params):
     """
-    تصدير الفعاليات إلى Excel - Export Events to Excel
+    سجلات التصدير بعد تطبيق الفلاتر - Filtered queryset for event_export
+    (also rebuilt from ExportJob.params by the background worker)
     """
-    queryset = Event.objects.select_related('created_by', 'responsible_person').all()
+    queryset = Event.objects.order_by('-created_at')
 
     # Apply filters
-    search = request.GET.get('search', '')
-    status = request.GET.get('status', '')
-    event_type = request.GET.get('event_type', '')
+    search = params.get('search', '')
+    status = params.get('status', '')
+    event_type = params.get('event_type', '')
 
     if search:
         queryset = queryset.filter(
@@ -197,14 +195,16 @@ def event_export(request):
     if event_type:
         queryset = queryset.filter(event_type=event_type)
 
-    # Export to Excel
-    resource = EventResource()
-    dataset = resource.export(queryset)
+    return queryset
 
-    response = HttpResponse(dataset.xlsx, content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
-    response['Content-Disposition'] = 'attachment; filename="events_export.xlsx"'
 
-    return response
+@login_required
+@staff_required
+def event_export(request):
+    """
+    تصدير الفعاليات إلى Excel - Export Events to Excel
+    """
+    return export_or_enqueue(request, 'events')
 
 
 @login_required
@@ -233,15 +233,12 @@ def tenant_events_list(request):
             Q(location__icontains=search)
         )
 
-    # Pagination
-    paginator = Paginator(events, 12)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    # Pagination (keyset on the start_date display order)
+    page_obj = paginate(request, events, per_page=12, ordering=EVENT_ORDERING)
 
     context = {
         'events': page_obj,
         'page_obj': page_obj,
-        'is_paginated': page_obj.has_other_pages(),
         'is_tenant_view': True,
     }
 
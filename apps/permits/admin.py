@@ -1,3 +1,34 @@
 from django.contrib import admin
+from django.utils.translation import gettext_lazy as _
+from .models import ApprovalWorkflow, ApprovalStage
 
-# Register your models here.
+
+class ApprovalStageInline(admin.TabularInline):
+    """
+    مراحل سير العمل كـ Inline في صفحة سير العمل
+    """
+    model = ApprovalStage
+    extra = 0
+    fields = ('order', 'name', 'approvers', 'quorum', 'deadline_hours')
+    filter_horizontal = ('approvers',)
+
+
+@admin.register(ApprovalWorkflow)
+class ApprovalWorkflowAdmin(admin.ModelAdmin):
+    """
+    سير عمل الموافقات
+    Approval Workflows (single approver, or ordered stages of parallel approvers)
+    """
+    list_display = ('name', 'permit_type', 'approver', 'backup_approver', 'deadline_hours', 'is_active')
+    list_filter = ('permit_type', 'is_active')
+    search_fields = ('name',)
+    inlines = [ApprovalStageInline]
+
+    fieldsets = (
+        (_('سير العمل'), {
+            'fields': ('name', 'permit_type', 'is_active')
+        }),
+        (_('المسؤولون'), {
+            'fields': ('approver', 'backup_approver', 'deadline_hours', 'auto_redirect', 'notify_admin')
+        }),
+    )
@@ -0,0 +1,277 @@
+"""
+Approval Decisions - قرارات الموافقة
+Applies one approver's approve/reject decision to many permits in a single
+transaction: workflow stages advance when their quorum is met, permits are
+finalised with set-based UPDATEs and all notifications go out in one INSERT.
+"""
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Case, Count, F, Q, TextField, Value, When
+from django.db.models.functions import Concat
+from django.utils import timezone
+from django.utils.translation import gettext as _
+
+from apps.core.activity import record_status_changes
+from apps.core.counters import apply_deltas
+from apps.core.models import Notification
+from apps.core.notifications import send_bulk
+
+from .models import PendingApproval, Permit, PermitApproval
+from .routing import active_approvals, get_stage, get_workflow, next_stage, stage_approvals
+
+DECISIONS = ('approved', 'rejected')
+
+
+class DecisionResult:
+    """
+    نتيجة القرارات - Permits grouped by what the decision did to them
+    """
+    def __init__(self):
+        self.approved = []     # موافقة نهائية - final approval
+        self.rejected = []     # رفض نهائي - final rejection
+        self.advanced = []     # انتقل للمرحلة التالية - moved on to the next stage
+        self.recorded = []     # بانتظار باقي الموافقين - waiting for the stage quorum
+        self.skipped = []      # بدون صلاحية أو غير معلقة أو غير موجودة - ids the user may not decide
+
+    @property
+    def decided(self):
+        return self.approved + self.rejected + self.advanced + self.recorded
+
+    def __str__(self):
+        return (
+            f'{len(self.approved)} approved, {len(self.rejected)} rejected, '
+            f'{len(self.advanced)} advanced, {len(self.recorded)} recorded, '
+            f'{len(self.skipped)} skipped'
+        )
+
+
+def decide(user, permit_ids, action, comments='', now=None):
+    """
+    تطبيق قرار على عدة تصاريح - Approve or reject many permits at once
+
+    Only permits still pending are decided. The user acts on the open
+    PendingApprovals assigned to them. Staff users without an assignment
+    vote on the permit's current stage like one of its approvers (the stage
+    quorum still applies), and decide it directly only when it was never
+    routed to an approver. Every other id is returned in result.skipped.
+
+    Args:
+        user: المسؤول صاحب القرار
+        permit_ids: معرفات التصاريح
+        action: 'approved' أو 'rejected'
+        comments: ملاحظات تضاف لكل تصريح
+
+    Returns:
+        DecisionResult
+    """
+    if action not in DECISIONS:
+        raise ValueError(f'Unknown approval action: {action}')
+
+    now = now or timezone.now()
+    result = DecisionResult()
+    permit_ids = list(dict.fromkeys(int(pk) for pk in permit_ids))
+
+    with transaction.atomic():
+        # قفل التصاريح يمنع قرارين متزامنين على نفس المرحلة - serialises quorum checks per permit
+        # التصاريح المعلقة فقط - already decided permits are skipped, not decided again
+        permits = Permit.objects.select_for_update(of=('self',)).filter(status='pending').in_bulk(permit_ids)
+        result.skipped = [pk for pk in permit_ids if pk not in permits]
+
+        routed = set()
+        open_rows = defaultdict(list)
+        for row in PendingApproval.objects.filter(permit_id__in=list(permits)):
+            routed.add(row.permit_id)
+            if not row.completed:
+                open_rows[row.permit_id].append(row)
+
+        own_ids = []
+        votes = []
+        final = {}
+        staged = {}
+        for pk, permit in permits.items():
+            own = [row for row in open_rows[pk] if row.assigned_to_id == user.pk]
+            if not own:
+                stage_rows = [row for row in open_rows[pk] if row.stage_id is not None]
+                if user.is_staff and (pk not in routed or (open_rows[pk] and not stage_rows)):
+                    # تصريح بدون سير عمل أو بدون مراحل - never routed or stage-less, staff decide it directly
+                    final[pk] = action
+                elif user.is_staff and stage_rows:
+                    # صوت المسؤول في المرحلة الحالية - staff vote counts towards the current stage quorum
+                    vote = PendingApproval(
+                        permit=permit,
+                        workflow_id=stage_rows[0].workflow_id,
+                        stage_id=stage_rows[0].stage_id,
+                        assigned_to=user,
+                        deadline=now,
+                        completed=True,
+                        completed_at=now,
+                        decision=action
+                    )
+                    votes.append(vote)
+                    if action == 'rejected':
+                        final[pk] = action
+                    else:
+                        staged[pk] = vote
+                else:
+                    result.skipped.append(pk)
+                continue
+
+            own_ids.extend(row.pk for row in own)
+            if action == 'rejected' or own[0].stage_id is None:
+                final[pk] = action
+            else:
+                staged[pk] = own[0]
+
+        decided = list(final) + list(staged)
+        if not decided:
+            return result
+
+        PendingApproval.objects.filter(pk__in=own_ids).update(
+            completed=True,
+            completed_at=now,
+            decision=action
+        )
+        PendingApproval.objects.bulk_create(votes)
+
+        advancing = _check_quorums(staged, final, result, permits)
+
+        # إغلاق باقي الموافقات المفتوحة للتصاريح المنتهية والمراحل المكتملة
+        PendingApproval.objects.filter(
+            permit_id__in=list(final) + list(advancing),
+            completed=False
+        ).update(completed=True, completed_at=now)
+
+        next_rows = []
+        for pk, (workflow, stage) in advancing.items():
+            next_rows.extend(stage_approvals(permits[pk], workflow, stage, now))
+        next_rows = PendingApproval.objects.bulk_create(active_approvals(next_rows))
+
+        PermitApproval.objects.bulk_create([
+            PermitApproval(permit_id=pk, approver=user, action=action, comments=comments)
+            for pk in decided
+        ])
+
+        _update_permits(permits, decided, final, comments, now, user)
+
+        result.approved = [permits[pk] for pk, outcome in final.items() if outcome == 'approved']
+        result.rejected = [permits[pk] for pk, outcome in final.items() if outcome == 'rejected']
+        result.advanced = [permits[pk] for pk in advancing]
+
+        send_bulk(_build_notifications(result, next_rows, comments))
+
+    return result
+
+
+def _check_quorums(staged, final, result, permits):
+    """
+    فحص اكتمال المراحل - One aggregate query for all staged permits
+
+    Returns:
+        dict: {permit_id: (workflow, next_stage)} للتصاريح المنتقلة لمرحلة تالية
+    """
+    if not staged:
+        return {}
+
+    approvals = {
+        (row['permit_id'], row['stage_id']): row['approvers']
+        for row in PendingApproval.objects.filter(
+            permit_id__in=list(staged),
+            stage_id__in={row.stage_id for row in staged.values()},
+            decision='approved'
+        ).values('permit_id', 'stage_id').annotate(approvers=Count('assigned_to', distinct=True))
+    }
+
+    advancing = {}
+    for pk, row in staged.items():
+        stage = get_stage(row.stage_id)
+        workflow = get_workflow(row.workflow_id)
+        if stage is None or workflow is None:
+            # المرحلة حذفت بعد التوجيه - stage removed since routing, treat as final
+            final[pk] = 'approved'
+        elif approvals.get((pk, stage.pk), 0) < stage.quorum:
+            result.recorded.append(permits[pk])
+        else:
+            following = next_stage(workflow, stage)
+            if following is None:
+                final[pk] = 'approved'
+            else:
+                advancing[pk] = (workflow, following)
+    return advancing
+
+
+def _update_permits(permits, decided, final, comments, now, user):
+    """
+    تحديث التصاريح - Notes and status with one UPDATE per outcome
+    Counters and the activity feed are updated explicitly since update() skips signals.
+    """
+    changes = {}
+    if comments:
+        block = f"--- {_('ملاحظات الموافقة')} ({now.strftime('%Y-%m-%d %H:%M')}) ---\n{comments}"
+        changes['notes'] = Case(
+            When(Q(notes__isnull=True) | Q(notes=''), then=Value(block)),
+            default=Concat(F('notes'), Value(f'\n\n{block}')),
+            output_field=TextField()
+        )
+
+    status_changes = []
+    pending_delta = 0
+    for outcome in DECISIONS:
+        ids = [pk for pk, value in final.items() if value == outcome]
+        if ids:
+            Permit.objects.filter(pk__in=ids).update(status=outcome, updated_at=now, **changes)
+        for pk in ids:
+            permit = permits[pk]
+            previous = permit.status
+            permit.status = outcome
+            if previous != outcome:
+                status_changes.append((permit, previous))
+                if previous == 'pending':
+                    pending_delta -= 1
+
+    others = [pk for pk in decided if pk not in final]
+    if others and changes:
+        Permit.objects.filter(pk__in=others).update(updated_at=now, **changes)
+
+    apply_deltas({'permits_pending': pending_delta})
+    record_status_changes(status_changes, actor_id=user.pk)
+
+
+def _build_notifications(result, next_rows, comments):
+    """إشعارات المستأجرين والمرحلة التالية - Tenant and next-stage approver notifications"""
+    notifications = []
+
+    for permit in result.approved:
+        notifications.append(Notification(
+            user_id=permit.tenant_id,
+            title=_('تمت الموافقة على تصريحك'),
+            message=_('تمت الموافقة على التصريح %(number)s') % {'number': permit.permit_number},
+            notification_type='success',
+            link=f'/permits/{permit.pk}/'
+        ))
+
+    for permit in result.rejected:
+        notifications.append(Notification(
+            user_id=permit.tenant_id,
+            title=_('تم رفض تصريحك'),
+            message=_('تم رفض التصريح %(number)s. السبب: %(reason)s') % {
+                'number': permit.permit_number,
+                'reason': comments or _('غير محدد')
+            },
+            notification_type='error',
+            link=f'/permits/{permit.pk}/'
+        ))
+
+    for row in next_rows:
+        notifications.append(Notification(
+            user_id=row.assigned_to_id,
+            title=_('طلب موافقة جديد'),
+            message=_('التصريح %(number)s بانتظار موافقتك (%(stage)s)') % {
+                'number': row.permit.permit_number,
+                'stage': get_stage(row.stage_id).name
+            },
+            notification_type='permit',
+            link=f'/permits/{row.permit_id}/approve/'
+        ))
+
+    return notifications
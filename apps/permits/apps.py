@@ -5,3 +5,6 @@ class PermitsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.permits'
     verbose_name = 'التصاريح - Permits'
+
+    def ready(self):
+        from . import signals  # noqa: F401
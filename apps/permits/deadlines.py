@@ -0,0 +1,151 @@
+"""
+Approval Deadlines - مهل الموافقات
+Set-based sweep of overdue PendingApprovals: one UPDATE to mark them overdue,
+one UPDATE to redirect them to the backup approver, one bulk INSERT of notifications.
+"""
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Case, F, OuterRef, Subquery, Value, When
+from django.utils import timezone
+from django.utils.translation import gettext as _
+
+from apps.core.models import Notification
+from apps.core.notifications import send_bulk
+
+from .models import ApprovalWorkflow, PendingApproval
+from .routing import get_workflow
+
+
+def sweep_overdue_approvals(queryset=None, now=None):
+    """
+    معالجة الموافقات المتأخرة - Mark, redirect and notify overdue approvals
+
+    Same rules as the old per-row PendingApproval.check_deadline():
+    overdue rows are flagged; rows whose workflow has auto_redirect and an
+    active backup approver are reassigned to it, at most one row per permit
+    stage; admins are notified once per row.
+
+    Args:
+        queryset: تقييد المعالجة (مثلاً موافقة واحدة) - None = كل الموافقات المفتوحة
+        now: الوقت الحالي (للاختبار)
+
+    Returns:
+        dict: {'overdue': n, 'redirected': [PendingApproval, ...], 'notifications': n}
+              (redirected rows keep the previous assigned_to_id, redirected_to_id is the backup)
+    """
+    now = now or timezone.now()
+    queryset = PendingApproval.objects.all() if queryset is None else queryset
+    overdue = queryset.filter(completed=False, redirected=False, deadline__lt=now)
+
+    with transaction.atomic():
+        flagged = overdue.filter(is_overdue=False).update(is_overdue=True)
+
+        to_redirect = list(
+            overdue.filter(
+                workflow__auto_redirect=True,
+                workflow__backup_approver__is_active=True
+            ).select_related('permit').select_for_update(skip_locked=True, of=('self',))
+        )
+        # إعدادات سير العمل من جدول التوجيه المخزن - workflow settings come from the cached routing table
+        workflows = {approval.workflow_id: get_workflow(approval.workflow_id) for approval in to_redirect}
+        to_redirect = _one_per_stage(to_redirect, workflows)
+        if not to_redirect:
+            return {'overdue': flagged, 'redirected': [], 'notifications': 0}
+
+        redirect_ids = [approval.pk for approval in to_redirect]
+        admin_ids = [
+            approval.pk for approval in to_redirect
+            if workflows[approval.workflow_id].notify_admin and not approval.admin_notified
+        ]
+
+        backup_approver = Subquery(
+            ApprovalWorkflow.objects.filter(pk=OuterRef('workflow_id')).values('backup_approver')[:1]
+        )
+        PendingApproval.objects.filter(pk__in=redirect_ids).update(
+            is_overdue=True,
+            redirected=True,
+            redirected_at=now,
+            redirected_to=backup_approver,
+            assigned_to=backup_approver,
+            admin_notified=Case(
+                When(pk__in=admin_ids, then=Value(True)),
+                default=F('admin_notified')
+            ),
+        )
+
+        for approval in to_redirect:
+            approval.redirected_to_id = workflows[approval.workflow_id].backup_approver_id
+
+        notifications = _build_notifications(to_redirect, workflows, set(admin_ids))
+        send_bulk(notifications)
+
+    return {'overdue': flagged, 'redirected': to_redirect, 'notifications': len(notifications)}
+
+
+def _one_per_stage(approvals, workflows):
+    """
+    صف واحد للمسؤول البديل في كل مرحلة - Keep rows whose backup holds no other row
+    of the same permit stage; the quorum counts distinct approvers, so a second
+    row would never count and the stage could not complete
+    """
+    held = set(
+        PendingApproval.objects.filter(
+            permit_id__in={approval.permit_id for approval in approvals}
+        ).values_list('permit_id', 'stage_id', 'assigned_to_id')
+    )
+    kept = []
+    for approval in approvals:
+        key = (approval.permit_id, approval.stage_id, workflows[approval.workflow_id].backup_approver_id)
+        if key not in held:
+            held.add(key)
+            kept.append(approval)
+    return kept
+
+
+def _build_notifications(approvals, workflows, admin_ids):
+    """إشعارات المسؤول البديل والمدراء - Notifications for backup approvers and admins"""
+    User = get_user_model()
+    admins = []
+    names = {}
+    if admin_ids:
+        admins = list(User.objects.filter(is_superuser=True).values_list('pk', flat=True))
+        user_ids = set()
+        for workflow in workflows.values():
+            user_ids.update((workflow.approver_id, workflow.backup_approver_id))
+        # أسماء المسؤولين وقت الإرسال - current names, loaded once
+        names = {user.pk: user.get_full_name() for user in User.objects.filter(pk__in=user_ids - {None})}
+    notifications = []
+
+    for approval in approvals:
+        permit = approval.permit
+        workflow = workflows[approval.workflow_id]
+        link = f'/permits/{permit.pk}/'
+
+        notifications.append(Notification(
+            user_id=workflow.backup_approver_id,
+            title=_('طلب محول إليك'),
+            message=_('تم تحويل التصريح %(number)s إليك بسبب تجاوز المهلة الزمنية') % {
+                'number': permit.permit_number
+            },
+            notification_type='permit',
+            link=link,
+        ))
+
+        if approval.pk in admin_ids:
+            message = _('تم تحويل التصريح %(number)s من %(from_user)s إلى %(to_user)s بسبب تجاوز المهلة الزمنية') % {
+                'number': permit.permit_number,
+                'from_user': names.get(workflow.approver_id, ''),
+                'to_user': names.get(workflow.backup_approver_id, '')
+            }
+            notifications.extend(
+                Notification(
+                    user_id=admin_id,
+                    title=_('تحويل تلقائي بسبب تجاوز المهلة'),
+                    message=message,
+                    notification_type='warning',
+                    link=link,
+                )
+                for admin_id in admins
+            )
+
+    return notifications
@@ -2,50 +2,60 @@
 Management command to check approval deadlines and auto-redirect
 يفحص المهل الزمنية للموافقات ويحول تلقائياً عند التجاوز
 """
+import time
+
+from django.contrib.auth import get_user_model
 from django.core.management.base import BaseCommand
-from django.utils import timezone
-from apps.permits.models import PendingApproval
+from django.db import close_old_connections
+
+from apps.permits.deadlines import sweep_overdue_approvals
 
 
 class Command(BaseCommand):
     help = 'Check approval deadlines and auto-redirect overdue requests'
 
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help='Keep running as a scheduler')
+        parser.add_argument('--interval', type=int, default=60, help='Seconds between sweeps with --loop')
+
     def handle(self, *args, **options):
         """
         فحص جميع الموافقات المعلقة وتحويل المتأخرة
         """
+        if not options['loop']:
+            self.sweep()
+            return
+
+        self.stdout.write(self.style.SUCCESS(f'⏱️  Sweeping every {options["interval"]}s (Ctrl+C to stop)'))
+        try:
+            while True:
+                close_old_connections()
+                self.sweep()
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.SUCCESS('\n👋 Stopped'))
+
+    def sweep(self):
         self.stdout.write(self.style.SUCCESS('🔍 Checking approval deadlines...'))
-        
-        # Get all pending approvals that are not completed or redirected
-        pending_approvals = PendingApproval.objects.filter(
-            completed=False,
-            redirected=False
-        )
-        
-        total_checked = 0
-        total_redirected = 0
-        
-        for approval in pending_approvals:
-            total_checked += 1
-            
-            # Check deadline
-            was_redirected = approval.redirected
-            approval.check_deadline()
-            
-            if not was_redirected and approval.redirected:
-                total_redirected += 1
-                self.stdout.write(
-                    self.style.WARNING(
-                        f'⚠️  Redirected: {approval.permit.permit_number} '
-                        f'from {approval.workflow.approver.username} '
-                        f'to {approval.redirected_to.username}'
-                    )
+
+        result = sweep_overdue_approvals()
+
+        redirected = result['redirected']
+        user_ids = {approval.assigned_to_id for approval in redirected} | {approval.redirected_to_id for approval in redirected}
+        usernames = dict(get_user_model().objects.filter(pk__in=user_ids).values_list('pk', 'username'))
+        for approval in redirected:
+            self.stdout.write(
+                self.style.WARNING(
+                    f'⚠️  Redirected: {approval.permit.permit_number} '
+                    f'from {usernames.get(approval.assigned_to_id)} '
+                    f'to {usernames.get(approval.redirected_to_id)}'
                 )
-        
+            )
+
         self.stdout.write(
             self.style.SUCCESS(
-                f'\n✅ Checked {total_checked} pending approvals\n'
-                f'📤 Redirected {total_redirected} overdue requests'
+                f'\n✅ Marked {result["overdue"]} approvals overdue\n'
+                f'📤 Redirected {len(result["redirected"])} overdue requests\n'
+                f'🔔 Sent {result["notifications"]} notifications'
             )
         )
-
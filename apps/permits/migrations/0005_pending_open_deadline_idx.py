@@ -0,0 +1,19 @@
+# Generated by Django 5.0.14 on 2026-10-18 17:11
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('permits', '0004_alter_permitattachment_options_task'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='pendingapproval',
+            index=models.Index(fields=['completed', 'redirected', 'deadline'], name='pending_open_deadline_idx'),
+        ),
+    ]
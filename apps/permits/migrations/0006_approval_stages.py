@@ -0,0 +1,52 @@
+# Generated by Django 5.0.14 on 2026-10-18 17:14
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('permits', '0005_pending_open_deadline_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pendingapproval',
+            name='decision',
+            field=models.CharField(blank=True, choices=[('approved', 'موافق - Approved'), ('rejected', 'مرفوض - Rejected')], default='', max_length=20, verbose_name='القرار'),
+        ),
+        migrations.CreateModel(
+            name='ApprovalStage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('order', models.PositiveIntegerField(default=1, verbose_name='الترتيب')),
+                ('name', models.CharField(max_length=200, verbose_name='اسم المرحلة')),
+                ('quorum', models.PositiveIntegerField(default=1, verbose_name='عدد الموافقات المطلوبة')),
+                ('deadline_hours', models.IntegerField(blank=True, null=True, verbose_name='المهلة الزمنية (ساعات)')),
+                ('approvers', models.ManyToManyField(related_name='approval_stages', to=settings.AUTH_USER_MODEL, verbose_name='الموافقون')),
+                ('workflow', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stages', to='permits.approvalworkflow', verbose_name='سير العمل')),
+            ],
+            options={
+                'verbose_name': 'مرحلة موافقة',
+                'verbose_name_plural': 'مراحل الموافقة',
+                'db_table': 'permits_approval_stage',
+                'ordering': ['workflow', 'order', 'pk'],
+            },
+        ),
+        migrations.AddField(
+            model_name='pendingapproval',
+            name='stage',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='pending_approvals', to='permits.approvalstage', verbose_name='المرحلة'),
+        ),
+        migrations.AddIndex(
+            model_name='pendingapproval',
+            index=models.Index(fields=['assigned_to', 'completed', 'deadline'], name='pending_assignee_queue_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pendingapproval',
+            index=models.Index(fields=['permit', 'stage', 'completed'], name='pending_permit_stage_idx'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.0.14 on 2026-10-18 17:18
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('permits', '0006_approval_stages'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='permit',
+            index=models.Index(fields=['created_at', 'id'], name='permit_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='permit',
+            index=models.Index(fields=['tenant', 'created_at', 'id'], name='permit_tenant_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['assigned_to', 'created_at', 'id'], name='task_assignee_created_idx'),
+        ),
+    ]
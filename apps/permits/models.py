@@ -162,6 +162,9 @@ class Permit(models.Model):
             models.Index(fields=['permit_number']),
             models.Index(fields=['status']),
             models.Index(fields=['tenant']),
+            # التقسيم بالمؤشر - keyset pagination of the staff and tenant lists
+            models.Index(fields=['created_at', 'id'], name='permit_created_id_idx'),
+            models.Index(fields=['tenant', 'created_at', 'id'], name='permit_tenant_created_idx'),
         ]
 
     def __str__(self):
@@ -355,6 +358,58 @@ class ApprovalWorkflow(models.Model):
         return f"{self.name} - {self.approver.get_full_name()}"
 
 
+class ApprovalStage(models.Model):
+    """
+    مراحل سير العمل - Approval Workflow Stages
+    المراحل تنفذ بالترتيب، والموافقون داخل المرحلة يعملون بالتوازي
+    Stages run in order; a stage's approvers act in parallel until its quorum is met.
+    """
+    workflow = models.ForeignKey(
+        ApprovalWorkflow,
+        on_delete=models.CASCADE,
+        related_name='stages',
+        verbose_name=_('سير العمل')
+    )
+
+    order = models.PositiveIntegerField(
+        default=1,
+        verbose_name=_('الترتيب')
+    )
+
+    name = models.CharField(
+        max_length=200,
+        verbose_name=_('اسم المرحلة')
+    )
+
+    approvers = models.ManyToManyField(
+        settings.AUTH_USER_MODEL,
+        related_name='approval_stages',
+        verbose_name=_('الموافقون')
+    )
+
+    # عدد الموافقات المطلوبة لإكمال المرحلة
+    quorum = models.PositiveIntegerField(
+        default=1,
+        verbose_name=_('عدد الموافقات المطلوبة')
+    )
+
+    # فارغ = مهلة سير العمل
+    deadline_hours = models.IntegerField(
+        null=True,
+        blank=True,
+        verbose_name=_('المهلة الزمنية (ساعات)')
+    )
+
+    class Meta:
+        verbose_name = _('مرحلة موافقة')
+        verbose_name_plural = _('مراحل الموافقة')
+        db_table = 'permits_approval_stage'
+        ordering = ['workflow', 'order', 'pk']
+
+    def __str__(self):
+        return f"{self.workflow.name} - {self.order}. {self.name}"
+
+
 class PendingApproval(models.Model):
     """
     الموافقات المعلقة - Pending Approvals
@@ -374,6 +429,16 @@ class PendingApproval(models.Model):
         verbose_name=_('سير العمل')
     )
 
+    # فارغ لسير العمل بمسؤول واحد - empty for single-approver workflows
+    stage = models.ForeignKey(
+        ApprovalStage,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='pending_approvals',
+        verbose_name=_('المرحلة')
+    )
+
     assigned_to = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
@@ -426,6 +491,15 @@ class PendingApproval(models.Model):
         verbose_name=_('تاريخ الإكمال')
     )
 
+    # قرار المسؤول (فارغ إذا أغلقت المرحلة دون قراره) - empty when closed by a quorum or final decision
+    decision = models.CharField(
+        max_length=20,
+        choices=PermitApproval.ACTION_CHOICES[:2],
+        blank=True,
+        default='',
+        verbose_name=_('القرار')
+    )
+
     created_at = models.DateTimeField(
         auto_now_add=True,
         verbose_name=_('تاريخ الإنشاء')
@@ -436,63 +510,27 @@ class PendingApproval(models.Model):
         verbose_name_plural = _('موافقات معلقة')
         db_table = 'permits_pending_approval'
         ordering = ['deadline', '-created_at']
+        indexes = [
+            # الموافقات المفتوحة حسب المهلة - open approvals by deadline (sweeper)
+            models.Index(fields=['completed', 'redirected', 'deadline'], name='pending_open_deadline_idx'),
+            # قائمة انتظار كل مسؤول - each approver's queue
+            models.Index(fields=['assigned_to', 'completed', 'deadline'], name='pending_assignee_queue_idx'),
+            # الموافقات المفتوحة لكل تصريح ومرحلة - open rows per permit/stage (quorum checks)
+            models.Index(fields=['permit', 'stage', 'completed'], name='pending_permit_stage_idx'),
+        ]
 
     def __str__(self):
         return f"{self.permit.permit_number} - {self.assigned_to.get_full_name()}"
 
     def check_deadline(self):
         """فحص المهلة الزمنية وتحويل تلقائي إذا لزم الأمر"""
-        from django.utils import timezone
-        from apps.core.models import Notification
+        from .deadlines import sweep_overdue_approvals
 
         if self.completed or self.redirected:
             return
 
-        now = timezone.now()
-
-        if now > self.deadline:
-            self.is_overdue = True
-
-            # تحويل تلقائي إذا كان مفعل
-            if self.workflow.auto_redirect and self.workflow.backup_approver:
-                self.redirected = True
-                self.redirected_at = now
-                self.redirected_to = self.workflow.backup_approver
-                self.assigned_to = self.workflow.backup_approver
-
-                # إنشاء إشعار للمسؤول البديل
-                Notification.create_notification(
-                    user=self.workflow.backup_approver,
-                    title=_('طلب محول إليك'),
-                    message=_('تم تحويل التصريح %(number)s إليك بسبب تجاوز المهلة الزمنية') % {
-                        'number': self.permit.permit_number
-                    },
-                    notification_type='permit',
-                    link=f'/permits/{self.permit.pk}/'
-                )
-
-                # إشعار المدير إذا كان مفعل
-                if self.workflow.notify_admin and not self.admin_notified:
-                    from django.contrib.auth import get_user_model
-                    User = get_user_model()
-                    admins = User.objects.filter(is_superuser=True)
-
-                    for admin in admins:
-                        Notification.create_notification(
-                            user=admin,
-                            title=_('تحويل تلقائي بسبب تجاوز المهلة'),
-                            message=_('تم تحويل التصريح %(number)s من %(from_user)s إلى %(to_user)s بسبب تجاوز المهلة الزمنية') % {
-                                'number': self.permit.permit_number,
-                                'from_user': self.workflow.approver.get_full_name(),
-                                'to_user': self.workflow.backup_approver.get_full_name()
-                            },
-                            notification_type='warning',
-                            link=f'/permits/{self.permit.pk}/'
-                        )
-
-                    self.admin_notified = True
-
-            self.save()
+        sweep_overdue_approvals(PendingApproval.objects.filter(pk=self.pk))
+        self.refresh_from_db()
 
 
 class Task(models.Model):
@@ -591,6 +629,10 @@ class Task(models.Model):
         verbose_name = _('مهمة')
         verbose_name_plural = _('المهام')
         ordering = ['-created_at']
+        indexes = [
+            # مهامي بالتقسيم بالمؤشر - keyset pagination of my_tasks
+            models.Index(fields=['assigned_to', 'created_at', 'id'], name='task_assignee_created_idx'),
+        ]
 
     def __str__(self):
         return f"{self.title} - {self.assigned_to.get_full_name()}"
@@ -0,0 +1,211 @@
+"""
+Approval Routing - توجيه الموافقات
+Cached routing table (permit_type -> active workflow, with default fallback)
+so routing a permit is a dict lookup instead of two queries. The table holds
+ids and routing settings only, never User objects: approvers are checked to
+be active with one query when approvals are created. Workflows with
+ApprovalStages route to every approver of their first stage.
+Invalidated on ApprovalWorkflow / ApprovalStage changes (see signals.py).
+"""
+from collections import defaultdict, namedtuple
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+
+from apps.core.cache import bump_version, versioned_get
+
+CACHE_NAMESPACE = 'permits.routing'
+
+# سير العمل في جدول التوجيه - stage_ids: المراحل بالترتيب
+WorkflowRoute = namedtuple('WorkflowRoute', [
+    'pk', 'name', 'permit_type', 'is_active', 'approver_id', 'backup_approver_id',
+    'deadline_hours', 'auto_redirect', 'notify_admin', 'stage_ids',
+])
+
+# مرحلة في جدول التوجيه - approver_ids: موافقو المرحلة
+StageRoute = namedtuple('StageRoute', ['pk', 'workflow_id', 'name', 'quorum', 'deadline_hours', 'approver_ids'])
+
+
+def _load_table():
+    from .models import ApprovalStage, ApprovalWorkflow
+
+    approvers = defaultdict(list)
+    field = ApprovalStage.approvers.field
+    links = ApprovalStage.approvers.through.objects.order_by('pk').values_list(
+        f'{field.m2m_field_name()}_id', f'{field.m2m_reverse_field_name()}_id'
+    )
+    for stage_id, user_id in links:
+        approvers[stage_id].append(user_id)
+
+    stages = {}
+    stage_ids = defaultdict(list)
+    for row in ApprovalStage.objects.order_by('workflow', 'order', 'pk').values(
+        'pk', 'workflow_id', 'name', 'quorum', 'deadline_hours'
+    ):
+        stages[row['pk']] = StageRoute(approver_ids=tuple(approvers[row['pk']]), **row)
+        stage_ids[row['workflow_id']].append(row['pk'])
+
+    by_type = {}
+    by_pk = {}
+    # نفس ترتيب النموذج كما في .first() سابقاً - same order the old .first() lookups used
+    for row in ApprovalWorkflow.objects.order_by('permit_type', 'name', 'pk').values(
+        'pk', 'name', 'permit_type', 'is_active', 'approver_id', 'backup_approver_id',
+        'deadline_hours', 'auto_redirect', 'notify_admin',
+    ):
+        workflow = WorkflowRoute(stage_ids=tuple(stage_ids[row['pk']]), **row)
+        by_pk[workflow.pk] = workflow
+        if workflow.is_active:
+            by_type.setdefault(workflow.permit_type, workflow)
+
+    return {'by_type': by_type, 'by_pk': by_pk, 'stages': stages}
+
+
+def get_routing_table():
+    """
+    جدول التوجيه - Cached routing table
+
+    {'by_type': {permit_type|None: WorkflowRoute}, 'by_pk': {pk: WorkflowRoute}, 'stages': {pk: StageRoute}}
+    """
+    return versioned_get(CACHE_NAMESPACE, 'routes', _load_table)
+
+
+def invalidate_routing():
+    """إبطال جدول التوجيه - Drop the cached routing table once the write commits"""
+    transaction.on_commit(lambda: bump_version(CACHE_NAMESPACE))
+
+
+def resolve_workflow(permit_type):
+    """
+    سير العمل المناسب لنوع التصريح - Active workflow for a permit type, else the default one
+
+    Returns:
+        WorkflowRoute أو None
+    """
+    by_type = get_routing_table()['by_type']
+    return by_type.get(permit_type) or by_type.get(None)
+
+
+def get_workflow(pk):
+    """سير عمل حسب المعرف (من الكاش) - Workflow by pk, including inactive ones"""
+    return get_routing_table()['by_pk'].get(pk)
+
+
+def get_stage(pk):
+    """مرحلة حسب المعرف (من الكاش) - Stage by pk"""
+    return get_routing_table()['stages'].get(pk)
+
+
+def next_stage(workflow, stage):
+    """
+    المرحلة التالية - The stage after `stage` in its workflow (None after the last one)
+    """
+    stage_ids = workflow.stage_ids
+    index = stage_ids.index(stage.pk)
+    return get_stage(stage_ids[index + 1]) if index + 1 < len(stage_ids) else None
+
+
+def stage_approvals(permit, workflow, stage, now):
+    """
+    موافقات مرحلة - Unsaved PendingApprovals, one per approver of the stage
+
+    Pass the rows through active_approvals() before saving them.
+
+    Args:
+        stage: None لسير العمل بمسؤول واحد (workflow.approver)
+    """
+    from .models import PendingApproval
+
+    if stage is None:
+        approver_ids = [workflow.approver_id]
+        hours = workflow.deadline_hours
+    else:
+        approver_ids = stage.approver_ids
+        hours = stage.deadline_hours or workflow.deadline_hours
+
+    deadline = now + timedelta(hours=hours)
+    return [
+        PendingApproval(
+            permit=permit,
+            workflow_id=workflow.pk,
+            stage_id=stage.pk if stage is not None else None,
+            assigned_to_id=approver_id,
+            deadline=deadline,
+            completed=False
+        )
+        for approver_id in approver_ids
+    ]
+
+
+def active_approvals(rows):
+    """
+    المسؤولون النشطون فقط - Drop approvals assigned to inactive users (one query)
+
+    When no active approver is left for a permit's stage, the workflow's
+    backup approver takes it if active; otherwise the permit gets no
+    approval rows for it.
+    """
+    if not rows:
+        return []
+
+    backups = {
+        row.workflow_id: getattr(get_workflow(row.workflow_id), 'backup_approver_id', None)
+        for row in rows
+    }
+    candidates = {row.assigned_to_id for row in rows} | set(backups.values())
+    active = set(
+        get_user_model().objects.filter(pk__in=candidates - {None}, is_active=True).values_list('pk', flat=True)
+    )
+
+    groups = defaultdict(list)
+    for row in rows:
+        groups[(row.permit_id, row.stage_id)].append(row)
+
+    kept = []
+    for group in groups.values():
+        assigned = [row for row in group if row.assigned_to_id in active]
+        if not assigned and backups[group[0].workflow_id] in active:
+            row = group[0]
+            row.assigned_to_id = backups[row.workflow_id]
+            assigned = [row]
+        kept.extend(assigned)
+    return kept
+
+
+def _first_approvals(permit, now):
+    workflow = resolve_workflow(permit.permit_type)
+    if workflow is None:
+        return []
+    first_stage = get_stage(workflow.stage_ids[0]) if workflow.stage_ids else None
+    return stage_approvals(permit, workflow, first_stage, now)
+
+
+def route_permit(permit, now=None):
+    """
+    إرسال التصريح للموافقة - Create the PendingApprovals for a new permit
+
+    Returns:
+        list: الموافقات المنشأة (فارغة إذا لم يوجد سير عمل أو موافق نشط)
+    """
+    from .models import PendingApproval
+
+    return PendingApproval.objects.bulk_create(active_approvals(_first_approvals(permit, now or timezone.now())))
+
+
+def route_permits(permits, now=None):
+    """
+    توجيه مجموعة تصاريح - Route many permits with one bulk INSERT (e.g. after an import)
+    Only permits in 'pending' status are routed.
+
+    Returns:
+        list: الموافقات المنشأة
+    """
+    from .models import PendingApproval
+
+    now = now or timezone.now()
+    pending = []
+    for permit in permits:
+        if permit.status == 'pending':
+            pending.extend(_first_approvals(permit, now))
+    return PendingApproval.objects.bulk_create(active_approvals(pending))
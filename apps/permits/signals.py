@@ -0,0 +1,25 @@
+"""
+Signals for Permits App
+إشارات تطبيق التصاريح
+"""
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .models import ApprovalStage, ApprovalWorkflow
+from .routing import invalidate_routing
+
+
+@receiver(post_save, sender=ApprovalWorkflow, dispatch_uid='approval_routing_save')
+@receiver(post_delete, sender=ApprovalWorkflow, dispatch_uid='approval_routing_delete')
+@receiver(post_save, sender=ApprovalStage, dispatch_uid='approval_stage_routing_save')
+@receiver(post_delete, sender=ApprovalStage, dispatch_uid='approval_stage_routing_delete')
+def invalidate_routing_cache(sender, instance, **kwargs):
+    """إبطال جدول التوجيه عند التعديل - Rebuild routing after workflow changes"""
+    invalidate_routing()
+
+
+@receiver(m2m_changed, sender=ApprovalStage.approvers.through, dispatch_uid='approval_stage_approvers')
+def invalidate_routing_on_approvers(sender, action, **kwargs):
+    """تغيير موافقي المرحلة - Stage approvers added/removed"""
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        invalidate_routing()
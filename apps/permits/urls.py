@@ -32,6 +32,7 @@ urlpatterns = [
     # Approvals
     path('<int:pk>/approve/', views.permit_approve, name='permit_approve'),
     path('my-approvals/', views.my_pending_approvals, name='my_pending_approvals'),
+    path('my-approvals/decide/', views.bulk_decision, name='bulk_decision'),
 
     # Tasks
     path('my-tasks/', views.my_tasks, name='my_tasks'),
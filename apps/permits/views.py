@@ -2,21 +2,25 @@
 Views for Permits App
 إدارة التصاريح
 """
+import json
+
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.core.paginator import Paginator
-from django.db.models import Q
-from django.http import HttpResponse
+from django.http import JsonResponse
 from django.utils.translation import gettext as _
 from django.utils import timezone
 from datetime import timedelta
 
-from .models import Permit, PermitAttachment, PermitApproval, PendingApproval, ApprovalWorkflow, Task
+from .models import Permit, PermitAttachment, PendingApproval, ApprovalWorkflow, Task
 from .forms import PermitForm, PermitAttachmentForm, PermitApprovalForm
-from .resources import PermitResource
+from .approvals import decide
+from .routing import route_permit
 from apps.core.models import Notification
 from apps.core.decorators import staff_required
+from apps.core.exports import export_or_enqueue
+from apps.core.pagination import paginate
+from apps.core.search import filter_queryset
 
 
 @login_required
@@ -43,22 +47,14 @@ def permit_list(request):
     if direction:
         permits = permits.filter(direction=direction)
     if search:
-        permits = permits.filter(
-            Q(permit_number__icontains=search) |
-            Q(applicant__first_name__icontains=search) |
-            Q(applicant__last_name__icontains=search) |
-            Q(purpose__icontains=search)
-        )
-
-    # Pagination
-    paginator = Paginator(permits, 20)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+        permits = filter_queryset(permits, 'permit', search)
+
+    # Pagination (keyset - no COUNT/OFFSET)
+    page_obj = paginate(request, permits)
 
     context = {
         'permits': page_obj,
         'page_obj': page_obj,
-        'is_paginated': page_obj.has_other_pages(),
     }
 
     return render(request, 'permits/permit_list.html', context)
@@ -108,6 +104,8 @@ def permit_create(request):
             permit.created_by = request.user
             permit.tenant = request.user
             permit.save()
+            if permit.status == 'pending':
+                route_permit(permit)
             messages.success(request, _('تم إنشاء التصريح بنجاح'))
             return redirect('permits:permit_detail', pk=permit.pk)
     else:
@@ -179,26 +177,20 @@ def permit_delete(request, pk):
     return render(request, 'permits/permit_confirm_delete.html', context)
 
 
-@login_required
-@staff_required
-def permit_export(request):
+def permit_export_queryset(params):
     """
-    تصدير التصاريح إلى Excel - Export Permits to Excel
-    (Staff Only)
+    سجلات التصدير بعد تطبيق الفلاتر - Filtered queryset for permit_export
+    (also rebuilt from ExportJob.params by the background worker)
     """
-    queryset = Permit.objects.select_related('created_by', 'tenant').all()
+    queryset = Permit.objects.order_by('-created_at')
 
     # Apply filters if provided
-    search = request.GET.get('search', '')
-    status = request.GET.get('status', '')
-    permit_type = request.GET.get('permit_type', '')
+    search = params.get('search', '')
+    status = params.get('status', '')
+    permit_type = params.get('permit_type', '')
 
     if search:
-        queryset = queryset.filter(
-            Q(permit_number__icontains=search) |
-            Q(title__icontains=search) |
-            Q(company_name__icontains=search)
-        )
+        queryset = filter_queryset(queryset, 'permit', search)
 
     if status:
         queryset = queryset.filter(status=status)
@@ -206,14 +198,17 @@ def permit_export(request):
     if permit_type:
         queryset = queryset.filter(permit_type=permit_type)
 
-    # Export to Excel
-    resource = PermitResource()
-    dataset = resource.export(queryset)
+    return queryset
 
-    response = HttpResponse(dataset.xlsx, content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
-    response['Content-Disposition'] = 'attachment; filename="permits_export.xlsx"'
 
-    return response
+@login_required
+@staff_required
+def permit_export(request):
+    """
+    تصدير التصاريح إلى Excel - Export Permits to Excel
+    (Staff Only)
+    """
+    return export_or_enqueue(request, 'permits')
 
 
 @login_required
@@ -286,27 +281,25 @@ def permit_approve(request, pk):
         action = request.POST.get('action')  # 'approved' or 'rejected'
         comments = request.POST.get('comments', '')
 
-        # Save comments to permit notes field
-        if comments:
-            if permit.notes:
-                permit.notes += f"\n\n--- {_('ملاحظات الموافقة')} ({timezone.now().strftime('%Y-%m-%d %H:%M')}) ---\n{comments}"
-            else:
-                permit.notes = f"--- {_('ملاحظات الموافقة')} ({timezone.now().strftime('%Y-%m-%d %H:%M')}) ---\n{comments}"
-
-        # Create approval record
-        approval = PermitApproval.objects.create(
-            permit=permit,
-            approver=request.user,
-            action=action,
-            comments=comments
-        )
-
-        # Update permit status
-        if action == 'approved':
-            permit.status = 'approved'
-            permit.save()
+        if action not in ('approved', 'rejected'):
+            messages.error(request, _('إجراء غير صالح'))
+            return redirect('permits:permit_approve', pk=pk)
+
+        # القرار عبر محرك الموافقات (المراحل والنصاب والإشعارات) - stages, quorum and notifications
+        result = decide(request.user, [permit.pk], action, comments)
+
+        if result.approved:
             messages.success(request, _('تمت الموافقة على التصريح بنجاح'))
+        elif result.rejected:
+            messages.warning(request, _('تم رفض التصريح'))
+        elif result.advanced:
+            messages.success(request, _('تمت الموافقة وتم تحويل التصريح للمرحلة التالية'))
+        elif result.recorded:
+            messages.success(request, _('تم تسجيل موافقتك بانتظار باقي الموافقين'))
+        else:
+            messages.error(request, _('لا يمكن اتخاذ قرار على هذا التصريح'))
 
+        if result.approved:
             # Create task if assigned
             assign_to_id = request.POST.get('assign_to')
             if assign_to_id:
@@ -350,47 +343,6 @@ def permit_approve(request, pk):
                 except User.DoesNotExist:
                     pass
 
-            # Notify tenant
-            Notification.create_notification(
-                user=permit.tenant,
-                title=_('تمت الموافقة على تصريحك'),
-                message=_('تمت الموافقة على التصريح %(number)s') % {'number': permit.permit_number},
-                notification_type='success',
-                link=f'/permits/{permit.pk}/'
-            )
-        elif action == 'rejected':
-            permit.status = 'rejected'
-            permit.save()
-            messages.warning(request, _('تم رفض التصريح'))
-
-            # Notify tenant
-            Notification.create_notification(
-                user=permit.tenant,
-                title=_('تم رفض تصريحك'),
-                message=_('تم رفض التصريح %(number)s. السبب: %(reason)s') % {
-                    'number': permit.permit_number,
-                    'reason': comments or _('غير محدد')
-                },
-                notification_type='error',
-                link=f'/permits/{permit.pk}/'
-            )
-
-        # Mark pending approval as completed
-        if pending_approval:
-            pending_approval.completed = True
-            pending_approval.completed_at = timezone.now()
-            pending_approval.save()
-        else:
-            # If superuser approved without specific pending approval, mark all pending approvals for this permit as completed
-            if request.user.is_superuser:
-                PendingApproval.objects.filter(
-                    permit=permit,
-                    completed=False
-                ).update(
-                    completed=True,
-                    completed_at=timezone.now()
-                )
-
         return redirect('permits:permit_detail', pk=pk)
 
     # Get staff users for task assignment
@@ -415,16 +367,20 @@ def my_pending_approvals(request):
     if request.user.is_superuser:
         pending_approvals = PendingApproval.objects.filter(
             completed=False
-        ).select_related('permit', 'workflow', 'assigned_to').order_by('deadline')
+        ).select_related('permit__tenant', 'workflow', 'stage', 'assigned_to').order_by('deadline')
     else:
         pending_approvals = PendingApproval.objects.filter(
             assigned_to=request.user,
             completed=False
-        ).select_related('permit', 'workflow').order_by('deadline')
+        ).select_related('permit__tenant', 'workflow', 'stage').order_by('deadline')
 
-    # Check deadlines
+    # العرض فقط - التحويل يتم عبر check_deadlines (بدون كتابة أثناء GET)
+    # Display only: redirects are done by the check_deadlines sweeper
+    now = timezone.now()
+    pending_approvals = list(pending_approvals)
     for approval in pending_approvals:
-        approval.check_deadline()
+        if not approval.redirected and approval.deadline < now:
+            approval.is_overdue = True
 
     context = {
         'pending_approvals': pending_approvals,
@@ -433,6 +389,89 @@ def my_pending_approvals(request):
     return render(request, 'permits/my_pending_approvals.html', context)
 
 
+# الحد الأقصى للتصاريح في الطلب الواحد - Permits accepted per bulk decision request
+BULK_DECISION_MAX = 500
+
+
+def _bulk_decision_payload(request):
+    """قراءة الطلب (JSON أو نموذج) - (permit_ids, action, comments) from a JSON or form POST"""
+    if request.content_type == 'application/json':
+        try:
+            data = json.loads(request.body or b'{}')
+        except ValueError:
+            data = {}
+        if not isinstance(data, dict):
+            data = {}
+        permit_ids = data.get('permit_ids') or []
+        action = data.get('action')
+        comments = data.get('comments') or ''
+    else:
+        permit_ids = request.POST.getlist('permit_ids')
+        action = request.POST.get('action')
+        comments = request.POST.get('comments', '')
+
+    if not isinstance(permit_ids, list):
+        permit_ids = []
+    permit_ids = [int(pk) for pk in permit_ids if str(pk).isdigit()]
+    return permit_ids, action, str(comments)
+
+
+@login_required
+def bulk_decision(request):
+    """
+    الموافقة على عدة تصاريح أو رفضها - Approve or reject many permits in one request
+
+    POST permit_ids, action ('approved' / 'rejected') and comments, as a form or
+    as JSON. JSON requests get the outcome per permit id back; form posts are
+    redirected to My approvals with a summary message.
+    """
+    if request.method != 'POST':
+        return redirect('permits:my_pending_approvals')
+
+    wants_json = (
+        request.content_type == 'application/json'
+        or request.headers.get('X-Requested-With') == 'XMLHttpRequest'
+    )
+    permit_ids, action, comments = _bulk_decision_payload(request)
+
+    error = None
+    if action not in ('approved', 'rejected'):
+        error = _('إجراء غير صالح')
+    elif not permit_ids:
+        error = _('الرجاء اختيار تصريح واحد على الأقل')
+    elif len(permit_ids) > BULK_DECISION_MAX:
+        error = _('الحد الأقصى %(max)s تصريح في الطلب الواحد') % {'max': BULK_DECISION_MAX}
+
+    if error:
+        if wants_json:
+            return JsonResponse({'success': False, 'error': error}, status=400)
+        messages.error(request, error)
+        return redirect('permits:my_pending_approvals')
+
+    result = decide(request.user, permit_ids, action, comments)
+
+    if wants_json:
+        return JsonResponse({
+            'success': True,
+            'approved': [permit.pk for permit in result.approved],
+            'rejected': [permit.pk for permit in result.rejected],
+            'advanced': [permit.pk for permit in result.advanced],
+            'recorded': [permit.pk for permit in result.recorded],
+            'skipped': result.skipped,
+        })
+
+    decided = len(result.decided)
+    if decided:
+        if action == 'approved':
+            messages.success(request, _('تمت الموافقة على %(count)s تصريح') % {'count': decided})
+        else:
+            messages.warning(request, _('تم رفض %(count)s تصريح') % {'count': decided})
+    if result.skipped:
+        messages.warning(request, _('تم تجاهل %(count)s تصريح بدون صلاحية') % {'count': len(result.skipped)})
+
+    return redirect('permits:my_pending_approvals')
+
+
 # ==================== Task Views ====================
 
 @login_required
@@ -452,8 +491,12 @@ def my_tasks(request):
     if priority_filter:
         tasks = tasks.filter(priority=priority_filter)
 
+    # Pagination (keyset - no COUNT/OFFSET)
+    page_obj = paginate(request, tasks)
+
     context = {
-        'tasks': tasks,
+        'tasks': page_obj,
+        'page_obj': page_obj,
         'status_filter': status_filter,
         'priority_filter': priority_filter,
     }
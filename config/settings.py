@@ -4,6 +4,7 @@ Django settings for CRM project.
 Generated by 'django-admin startproject' using Django 5.0.14.
 """
 
+from decimal import Decimal
 from pathlib import Path
 from decouple import config, Csv
 import dj_database_url
@@ -85,6 +86,7 @@ SITE_ID = 1
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'apps.core.middleware.RequestCacheMiddleware',  # Per-request memo for cached settings
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'apps.core.middleware.LanguageMiddleware',  # Custom language persistence (before LocaleMiddleware)
@@ -92,6 +94,8 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'apps.core.middleware.ActivityMiddleware',  # Actor for the activity feed
+    'apps.core.middleware.ModulePermissionMiddleware',  # request.module_perms
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'allauth.account.middleware.AccountMiddleware',  # Required by django-allauth
@@ -289,6 +293,31 @@ CORS_ALLOWED_ORIGINS = [
     'http://127.0.0.1:3000',
 ]
 
+# ==============================================================================
+# DOCUMENT NUMBERING
+# ==============================================================================
+
+# عدد الأرقام التي يحجزها كل عامل دفعة واحدة (1 = ترقيم بدون فجوات)
+# Numbers reserved per worker at once (1 = gap-free numbering)
+NUMBER_SEQUENCE_BLOCK_SIZE = config('NUMBER_SEQUENCE_BLOCK_SIZE', default=1, cast=int)
+
+# ==============================================================================
+# INVOICE DUNNING
+# ==============================================================================
+
+# أيام التأخير التي يُرسل عندها تذكير للمستأجر (مرحلة لكل رقم)
+# Days past due_date at which each tenant reminder is sent (one dunning level per entry)
+INVOICE_DUNNING_DAYS = config('INVOICE_DUNNING_DAYS', default='1,7,14,30', cast=Csv(int))
+
+# ==============================================================================
+# RECURRING RENT BILLING
+# ==============================================================================
+
+# أيام السداد من بداية الشهر ونسبة الضريبة لفواتير الإيجار الشهرية
+# Days from the first of the month to due_date, and tax rate (%) of monthly rent invoices
+RENT_INVOICE_DUE_DAYS = config('RENT_INVOICE_DUE_DAYS', default=10, cast=int)
+RENT_INVOICE_TAX_RATE = config('RENT_INVOICE_TAX_RATE', default='0.00', cast=Decimal)
+
 # ==============================================================================
 # CELERY CONFIGURATION
 # ==============================================================================
@@ -300,6 +329,21 @@ CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
 
+# Celery يُستخدم فقط عند تفعيله صراحةً، وإلا تُنفذ المهام الخلفية في خيوط داخل العملية
+# Use Celery only when enabled explicitly; otherwise background jobs run in a thread pool
+CELERY_ENABLED = config('CELERY_ENABLED', default=False, cast=bool)
+BACKGROUND_THREAD_WORKERS = config('BACKGROUND_THREAD_WORKERS', default=2, cast=int)
+
+# ==============================================================================
+# EXPORTS
+# ==============================================================================
+
+# التصدير الأكبر من هذا العدد يُنفذ كمهمة خلفية - Larger exports run as background jobs
+EXPORT_SYNC_MAX_ROWS = config('EXPORT_SYNC_MAX_ROWS', default=5000, cast=int)
+
+# ملفات التصدير خارج MEDIA_ROOT (لا تُخدم مباشرة) - only served by core:export_job_download
+EXPORT_FILES_ROOT = config('EXPORT_FILES_ROOT', default=str(BASE_DIR / 'private'))
+
 # ==============================================================================
 # CACHING
 # ==============================================================================